@@ -0,0 +1,28 @@
+import os
+import secrets
+from typing import Annotated
+
+from fastapi import Header, HTTPException, status
+
+
+def require_admin_token(
+    authorization: Annotated[str | None, Header()] = None,
+) -> None:
+    """Пускает к диагностике только с токеном из ADMIN_TOKEN.
+
+    Без ADMIN_TOKEN диагностика выключена и отвечает 404, как будто
+    эндпоинтов нет.
+    """
+    token = os.getenv("ADMIN_TOKEN")
+    if not token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    scheme, _, value = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        value.encode(),
+        token.encode(),
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -0,0 +1,137 @@
+import asyncio
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse, Response
+
+from app.api.admin.dependencies import require_admin_token
+from app.api.admin.memory import (DEFAULT_TOP_LIMIT,
+                                  DEFAULT_TRACEMALLOC_FRAMES, MAX_TOP_LIMIT,
+                                  MAX_TRACEMALLOC_FRAMES,
+                                  SnapshotNotFoundError,
+                                  TracemallocNotStartedError, diff_snapshots,
+                                  get_memory_stats, start_tracemalloc,
+                                  stop_tracemalloc, take_snapshot)
+from app.api.admin.profiler import (DEFAULT_PROFILE_SECONDS,
+                                    DEFAULT_SAMPLE_INTERVAL_MS,
+                                    MAX_PROFILE_SECONDS,
+                                    MAX_SAMPLE_INTERVAL_MS,
+                                    MIN_SAMPLE_INTERVAL_MS, ProfilerBusyError,
+                                    profile_event_loop, sample_stacks)
+from app.api.admin.schemas import (AllocationStat, MemorySnapshot, MemoryStats,
+                                   ProfileFormat, SnapshotGrouping,
+                                   TracemallocStatus)
+
+admin_router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin_token)],
+    include_in_schema=False,
+)
+
+
+@admin_router.post("/profile")
+async def profile(
+    seconds: Annotated[
+        float,
+        Query(gt=0, le=MAX_PROFILE_SECONDS),
+    ] = DEFAULT_PROFILE_SECONDS,
+    interval_ms: Annotated[
+        float,
+        Query(ge=MIN_SAMPLE_INTERVAL_MS, le=MAX_SAMPLE_INTERVAL_MS),
+    ] = DEFAULT_SAMPLE_INTERVAL_MS,
+    profile_format: Annotated[
+        ProfileFormat,
+        Query(alias="format"),
+    ] = ProfileFormat.COLLAPSED,
+) -> Response:
+    """Профилирует процесс в течение seconds секунд.
+
+    format=collapsed - сэмплы стеков всех потоков для flamegraph.pl
+    или speedscope, format=pstats - cProfile потока event loop.
+    Профилируется только тот воркер, который принял запрос.
+    """
+    try:
+        if profile_format is ProfileFormat.PSTATS:
+            content = await profile_event_loop(seconds)
+            return Response(
+                content,
+                media_type="application/octet-stream",
+                headers={
+                    "Content-Disposition": (
+                        'attachment; filename="profile.pstats"'
+                    ),
+                },
+            )
+        collapsed = await sample_stacks(seconds, interval_ms / 1000)
+    except ProfilerBusyError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(exc),
+        ) from exc
+    return PlainTextResponse(collapsed)
+
+
+@admin_router.get("/memory")
+async def memory_stats() -> MemoryStats:
+    """Возвращает RSS воркера, статистику gc и состояние tracemalloc."""
+    return get_memory_stats()
+
+
+@admin_router.post("/tracemalloc/start")
+async def tracemalloc_start(
+    frames: Annotated[
+        int,
+        Query(ge=1, le=MAX_TRACEMALLOC_FRAMES),
+    ] = DEFAULT_TRACEMALLOC_FRAMES,
+) -> TracemallocStatus:
+    """Включает tracemalloc в воркере.
+
+    Трассировка замедляет выделение памяти, поэтому после
+    исследования ее нужно остановить.
+    """
+    return start_tracemalloc(frames)
+
+
+@admin_router.post("/tracemalloc/stop")
+async def tracemalloc_stop() -> TracemallocStatus:
+    """Выключает tracemalloc и удаляет снимки."""
+    return stop_tracemalloc()
+
+
+@admin_router.post("/tracemalloc/snapshots")
+async def tracemalloc_snapshot(
+    group_by: SnapshotGrouping = SnapshotGrouping.LINENO,
+    limit: Annotated[int, Query(ge=1, le=MAX_TOP_LIMIT)] = DEFAULT_TOP_LIMIT,
+) -> MemorySnapshot:
+    """Снимает снимок tracemalloc и возвращает крупнейшие аллокации."""
+    try:
+        return await asyncio.to_thread(take_snapshot, group_by, limit)
+    except TracemallocNotStartedError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(exc),
+        ) from exc
+
+
+@admin_router.get("/tracemalloc/snapshots/{first_id}/diff/{second_id}")
+async def tracemalloc_diff(
+    first_id: int,
+    second_id: int,
+    group_by: SnapshotGrouping = SnapshotGrouping.LINENO,
+    limit: Annotated[int, Query(ge=1, le=MAX_TOP_LIMIT)] = DEFAULT_TOP_LIMIT,
+) -> list[AllocationStat]:
+    """Показывает, где память выросла между двумя снимками."""
+    try:
+        return await asyncio.to_thread(
+            diff_snapshots,
+            first_id,
+            second_id,
+            group_by,
+            limit,
+        )
+    except SnapshotNotFoundError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Snapshot not found",
+        ) from exc
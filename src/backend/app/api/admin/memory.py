@@ -0,0 +1,198 @@
+import asyncio
+import gc
+import itertools
+import os
+import resource
+import tracemalloc
+from collections import OrderedDict
+
+from prometheus_client import REGISTRY, Gauge
+
+from app.api.admin.schemas import (AllocationStat, GcGeneration,
+                                   MemorySnapshot, MemoryStats,
+                                   SnapshotGrouping, TracemallocStatus)
+from app.metrics import is_multiprocess
+
+DEFAULT_TRACEMALLOC_FRAMES = 25
+MAX_TRACEMALLOC_FRAMES = 100
+DEFAULT_TOP_LIMIT = 20
+MAX_TOP_LIMIT = 200
+MAX_SNAPSHOTS = 4
+RSS_REFRESH_SECONDS = 15.0
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class TracemallocNotStartedError(RuntimeError):
+    """Снимок нельзя снять: tracemalloc не запущен."""
+
+
+class SnapshotNotFoundError(KeyError):
+    """Снимок с таким id не найден или уже вытеснен."""
+
+
+def read_rss_bytes() -> int:
+    """Возвращает текущий RSS процесса в байтах.
+
+    Читается /proc/self/statm; там, где его нет, берется пиковый RSS
+    из getrusage.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * PAGE_SIZE
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# В одном процессе RSS уже отдает process_resident_memory_bytes
+# стандартного ProcessCollector, поэтому gauge регистрируется только в
+# режиме multiprocess, где ProcessCollector воркеров не виден.
+PROCESS_RSS_BYTES = Gauge(
+    "process_rss_bytes",
+    "Resident set size of the worker process.",
+    multiprocess_mode="liveall",
+    registry=REGISTRY if is_multiprocess() else None,
+)
+
+
+async def refresh_process_rss(
+    interval: float = RSS_REFRESH_SECONDS,
+) -> None:
+    """Периодически записывает RSS воркера в gauge.
+
+    В режиме multiprocess /metrics читает только файлы воркеров, и
+    set_function не вызывается, поэтому значение обновляется фоново.
+    """
+    while True:
+        PROCESS_RSS_BYTES.set(read_rss_bytes())
+        await asyncio.sleep(interval)
+
+
+_snapshots: OrderedDict[int, tracemalloc.Snapshot] = OrderedDict()
+_snapshot_ids = itertools.count(1)
+
+
+def get_tracemalloc_status() -> TracemallocStatus:
+    """Возвращает состояние tracemalloc."""
+    current, peak = tracemalloc.get_traced_memory()
+    return TracemallocStatus(
+        tracing=tracemalloc.is_tracing(),
+        frames=tracemalloc.get_traceback_limit(),
+        traced_bytes=current,
+        peak_bytes=peak,
+        snapshots=list(_snapshots),
+    )
+
+
+def get_memory_stats() -> MemoryStats:
+    """Возвращает RSS, статистику поколений gc и состояние tracemalloc.
+
+    Число объектов gc не считается: gc.get_objects() обходит всю кучу,
+    держа GIL, и останавливает event loop вместе со всеми запросами.
+    """
+    counts = gc.get_count()
+    thresholds = gc.get_threshold()
+    generations = [
+        GcGeneration(
+            generation=index,
+            count=counts[index],
+            threshold=thresholds[index],
+            collections=stats["collections"],
+            collected=stats["collected"],
+            uncollectable=stats["uncollectable"],
+        )
+        for index, stats in enumerate(gc.get_stats())
+    ]
+    return MemoryStats(
+        pid=os.getpid(),
+        rss_bytes=read_rss_bytes(),
+        gc=generations,
+        tracemalloc=get_tracemalloc_status(),
+    )
+
+
+def start_tracemalloc(frames: int) -> TracemallocStatus:
+    """Запускает tracemalloc с глубиной стека frames.
+
+    Если трассировка уже идет с другой глубиной, она перезапускается.
+    """
+    if tracemalloc.is_tracing() and (
+        tracemalloc.get_traceback_limit() != frames
+    ):
+        tracemalloc.stop()
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+    return get_tracemalloc_status()
+
+
+def stop_tracemalloc() -> TracemallocStatus:
+    """Останавливает tracemalloc и удаляет сохраненные снимки."""
+    tracemalloc.stop()
+    _snapshots.clear()
+    return get_tracemalloc_status()
+
+
+def _allocation_stats(
+    stats: list[tracemalloc.StatisticDiff] | list[tracemalloc.Statistic],
+    limit: int,
+) -> list[AllocationStat]:
+    """Переводит статистику tracemalloc в схемы ответа."""
+    return [
+        AllocationStat(
+            traceback=[
+                f"{frame.filename}:{frame.lineno}"
+                for frame in stat.traceback
+            ],
+            size_bytes=stat.size,
+            count=stat.count,
+            size_diff_bytes=getattr(stat, "size_diff", None),
+            count_diff=getattr(stat, "count_diff", None),
+        )
+        for stat in stats[:limit]
+    ]
+
+
+def take_snapshot(
+    group_by: SnapshotGrouping,
+    limit: int,
+) -> MemorySnapshot:
+    """Снимает снимок и возвращает крупнейшие места выделения памяти.
+
+    Хранится не больше MAX_SNAPSHOTS последних снимков.
+    """
+    if not tracemalloc.is_tracing():
+        raise TracemallocNotStartedError("tracemalloc is not started")
+    snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+    snapshot_id = next(_snapshot_ids)
+    _snapshots[snapshot_id] = snapshot
+    while len(_snapshots) > MAX_SNAPSHOTS:
+        _snapshots.popitem(last=False)
+    stats = snapshot.statistics(group_by.value)
+    return MemorySnapshot(
+        id=snapshot_id,
+        traced_bytes=sum(stat.size for stat in stats),
+        top=_allocation_stats(stats, limit),
+    )
+
+
+def diff_snapshots(
+    first_id: int,
+    second_id: int,
+    group_by: SnapshotGrouping,
+    limit: int,
+) -> list[AllocationStat]:
+    """Сравнивает два снимка: где память выросла сильнее всего."""
+    try:
+        first = _snapshots[first_id]
+        second = _snapshots[second_id]
+    except KeyError as exc:
+        raise SnapshotNotFoundError(exc.args[0]) from exc
+    return _allocation_stats(
+        second.compare_to(first, group_by.value),
+        limit,
+    )
@@ -0,0 +1,119 @@
+import asyncio
+import cProfile
+import marshal
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+
+DEFAULT_PROFILE_SECONDS = 10.0
+MAX_PROFILE_SECONDS = 60.0
+DEFAULT_SAMPLE_INTERVAL_MS = 5.0
+MIN_SAMPLE_INTERVAL_MS = 1.0
+MAX_SAMPLE_INTERVAL_MS = 100.0
+
+
+class ProfilerBusyError(RuntimeError):
+    """В процессе уже идет профилирование."""
+
+
+def _frame_name(frame: FrameType) -> str:
+    """Имя кадра для collapsed-стека: функция и место в файле."""
+    code = frame.f_code
+    return f"{code.co_qualname} ({code.co_filename}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Сэмплирующий профайлер на sys._current_frames().
+
+    Отдельный поток раз в interval секунд снимает стеки всех потоков
+    процесса и считает одинаковые стеки. Профилируемый код не
+    инструментируется, поэтому накладные расходы не зависят от числа
+    вызовов функций.
+    """
+
+    def __init__(self, interval: float) -> None:
+        """Создает сэмплер с заданным интервалом в секундах."""
+        self._interval = interval
+        self._stacks: Counter[str] = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="stack-sampler",
+            daemon=True,
+        )
+
+    def start(self) -> None:
+        """Запускает поток сэмплирования."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Останавливает сэмплирование и дожидается потока."""
+        self._stopped.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        """Возвращает стеки в формате collapsed для flamegraph.pl."""
+        return "".join(
+            f"{stack} {count}\n"
+            for stack, count in self._stacks.most_common()
+        )
+
+    def _run(self) -> None:
+        """Снимает стеки, пока не вызван stop()."""
+        own_id = threading.get_ident()
+        while not self._stopped.wait(self._interval):
+            names = {
+                thread.ident: thread.name
+                for thread in threading.enumerate()
+            }
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                current: FrameType | None = frame
+                while current is not None:
+                    stack.append(_frame_name(current))
+                    current = current.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self._stacks[";".join(reversed(stack))] += 1
+
+
+_profile_lock = asyncio.Lock()
+
+
+async def sample_stacks(seconds: float, interval: float) -> str:
+    """Сэмплирует стеки всех потоков seconds секунд.
+
+    Запросы, которые обрабатываются в это время, попадают в профиль.
+    """
+    if _profile_lock.locked():
+        raise ProfilerBusyError("Profiling is already running")
+    async with _profile_lock:
+        sampler = StackSampler(interval)
+        sampler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            await asyncio.to_thread(sampler.stop)
+        return sampler.collapsed()
+
+
+async def profile_event_loop(seconds: float) -> bytes:
+    """Профилирует поток event loop через cProfile seconds секунд.
+
+    Результат - файл pstats (marshal), его открывают pstats, snakeviz
+    или gprof2dot.
+    """
+    if _profile_lock.locked():
+        raise ProfilerBusyError("Profiling is already running")
+    async with _profile_lock:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.disable()
+        # То же, что делает Profile.dump_stats, но без временного файла.
+        profiler.create_stats()
+        return marshal.dumps(profiler.stats)
@@ -0,0 +1,61 @@
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class ProfileFormat(str, Enum):
+    """Форматы результата профилирования."""
+
+    COLLAPSED = "collapsed"
+    PSTATS = "pstats"
+
+
+class SnapshotGrouping(str, Enum):
+    """Группировка статистики tracemalloc."""
+
+    LINENO = "lineno"
+    FILENAME = "filename"
+    TRACEBACK = "traceback"
+
+
+class TracemallocStatus(BaseModel):
+    """Состояние tracemalloc в воркере."""
+    tracing: bool
+    frames: int
+    traced_bytes: int
+    peak_bytes: int
+    snapshots: list[int]
+
+
+class GcGeneration(BaseModel):
+    """Статистика одного поколения сборщика мусора."""
+    generation: int
+    count: int
+    threshold: int
+    collections: int
+    collected: int
+    uncollectable: int
+
+
+class MemoryStats(BaseModel):
+    """Память воркера: RSS, gc и tracemalloc."""
+    pid: int
+    rss_bytes: int
+    gc: list[GcGeneration]
+    tracemalloc: TracemallocStatus
+
+
+class AllocationStat(BaseModel):
+    """Память, выделенная в одном месте кода."""
+    traceback: list[str]
+    size_bytes: int
+    count: int
+    size_diff_bytes: int | None = None
+    count_diff: int | None = None
+
+
+class MemorySnapshot(BaseModel):
+    """Снимок tracemalloc с крупнейшими местами выделения."""
+    id: int
+    traced_bytes: int
+    top: list[AllocationStat]
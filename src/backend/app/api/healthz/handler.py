@@ -1,6 +1,9 @@
-from fastapi import APIRouter
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Response, status
 
 from app.api.healthz.schemas import HealthResponse
+from app.db.warmup import READY, DatabaseReadiness, get_database_readiness
 
 health_router = APIRouter(tags=["healthz"])
 
@@ -11,3 +14,25 @@ async def health_check() -> HealthResponse:
     return HealthResponse(
         status="ok",
     )
+
+
+@health_router.get(
+    "/readyz",
+    responses={
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"model": HealthResponse},
+    },
+)
+async def readiness_check(
+    response: Response,
+    readiness: Annotated[DatabaseReadiness, Depends(get_database_readiness)],
+) -> HealthResponse:
+    """Готовность принимать трафик.
+
+    503 со статусом warming_up, пока не прогрет пул соединений, и
+    db_unavailable, если БД не отвечает. Результат проверки БД
+    кэшируется на READINESS_CHECK_INTERVAL_SECONDS.
+    """
+    state = await readiness.state()
+    if state != READY:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return HealthResponse(status=state)
@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+
+import asyncpg
+from prometheus_client import Counter, Gauge
+
+from app.api.tickets.schemas import Ticket
+
+logger = logging.getLogger(__name__)
+
+TICKET_CHANGES_CHANNEL = "ticket_changes"
+INVALIDATE_ALL_PAYLOAD = "*"
+DEFAULT_CACHE_MAX_SIZE = 1024
+DEFAULT_CACHE_TTL_SECONDS = 30.0
+LISTENER_RETRY_SECONDS = 5.0
+
+TICKET_CACHE_REQUESTS = Counter(
+    "ticket_cache_requests_total",
+    "Ticket cache lookups by result.",
+    labelnames=("result",),
+)
+TICKET_CACHE_EVICTIONS = Counter(
+    "ticket_cache_evictions_total",
+    "Entries removed from the ticket cache by reason.",
+    labelnames=("reason",),
+)
+TICKET_CACHE_ENTRIES = Gauge(
+    "ticket_cache_entries",
+    "Number of entries currently held in the ticket cache.",
+    multiprocess_mode="livesum",
+)
+
+
+class TicketCache:
+    """Ограниченный LRU-кэш тикетов с TTL.
+
+    Кэш живет в процессе и не разделяется между репликами, поэтому
+    изменения из других подов приходят через LISTEN/NOTIFY. Пока
+    LISTEN-соединение не установлено, кэш не читается и не пополняется:
+    уведомления о чужих изменениях в это время теряются.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_CACHE_MAX_SIZE,
+        ttl: float = DEFAULT_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Создает кэш заданного размера и времени жизни записей."""
+        self._max_size = max_size
+        self._ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[int, tuple[float, Ticket]] = OrderedDict()
+        self._generation = 0
+        self._listening = False
+
+    def __len__(self) -> int:
+        """Возвращает число записей в кэше."""
+        return len(self._entries)
+
+    @property
+    def generation(self) -> int:
+        """Номер поколения, растет при каждой инвалидации."""
+        return self._generation
+
+    @property
+    def listening(self) -> bool:
+        """Подключен ли слушатель канала ticket_changes."""
+        return self._listening
+
+    def set_listening(self, listening: bool) -> None:
+        """Отмечает подключение или обрыв слушателя и очищает кэш."""
+        self._listening = listening
+        self.clear()
+
+    def get(self, ticket_id: int) -> Ticket | None:
+        """Возвращает тикет из кэша или None."""
+        if not self._listening:
+            TICKET_CACHE_REQUESTS.labels(result="bypass").inc()
+            return None
+        entry = self._entries.get(ticket_id)
+        if entry is None:
+            TICKET_CACHE_REQUESTS.labels(result="miss").inc()
+            return None
+        expires_at, ticket = entry
+        if expires_at <= self._clock():
+            self._remove(ticket_id, reason="expired")
+            TICKET_CACHE_REQUESTS.labels(result="miss").inc()
+            return None
+        self._entries.move_to_end(ticket_id)
+        TICKET_CACHE_REQUESTS.labels(result="hit").inc()
+        return ticket
+
+    def set(
+        self,
+        ticket: Ticket,
+        generation: int | None = None,
+    ) -> None:
+        """Кладет тикет в кэш.
+
+        Если передан generation и с тех пор была инвалидация, запись
+        пропускается: значение могло быть прочитано до изменения.
+        Без подключенного слушателя запись тоже пропускается.
+        """
+        if not self._listening:
+            return
+        if generation is not None and generation != self._generation:
+            return
+        self._entries[ticket.id] = (self._clock() + self._ttl, ticket)
+        self._entries.move_to_end(ticket.id)
+        while len(self._entries) > self._max_size:
+            oldest_id = next(iter(self._entries))
+            self._remove(oldest_id, reason="capacity")
+        TICKET_CACHE_ENTRIES.set(len(self._entries))
+
+    def invalidate(self, ticket_ids: Iterable[int]) -> None:
+        """Удаляет тикеты из кэша."""
+        self._generation += 1
+        for ticket_id in ticket_ids:
+            if ticket_id in self._entries:
+                self._remove(ticket_id, reason="invalidated")
+
+    def clear(self) -> None:
+        """Очищает кэш целиком."""
+        self._generation += 1
+        if self._entries:
+            TICKET_CACHE_EVICTIONS.labels(reason="invalidated").inc(
+                len(self._entries)
+            )
+        self._entries.clear()
+        TICKET_CACHE_ENTRIES.set(0)
+
+    def handle_notification(self, payload: str) -> None:
+        """Применяет уведомление канала ticket_changes."""
+        if payload == INVALIDATE_ALL_PAYLOAD:
+            self.clear()
+            return
+        try:
+            ticket_ids = [int(item) for item in payload.split(",") if item]
+        except ValueError:
+            logger.warning("Malformed ticket change payload: %r", payload)
+            self.clear()
+            return
+        self.invalidate(ticket_ids)
+
+    def _remove(self, ticket_id: int, reason: str) -> None:
+        """Удаляет запись и учитывает причину вытеснения."""
+        del self._entries[ticket_id]
+        TICKET_CACHE_EVICTIONS.labels(reason=reason).inc()
+        TICKET_CACHE_ENTRIES.set(len(self._entries))
+
+
+_ticket_cache: TicketCache | None = None
+
+
+def get_ticket_cache() -> TicketCache | None:
+    """Возвращает singleton-кэш тикетов или None, если он выключен."""
+    global _ticket_cache
+    max_size = int(
+        os.getenv("TICKET_CACHE_MAX_SIZE", DEFAULT_CACHE_MAX_SIZE)
+    )
+    if max_size <= 0:
+        return None
+    if _ticket_cache is None:
+        _ticket_cache = TicketCache(
+            max_size=max_size,
+            ttl=float(
+                os.getenv(
+                    "TICKET_CACHE_TTL_SECONDS",
+                    DEFAULT_CACHE_TTL_SECONDS,
+                )
+            ),
+        )
+    return _ticket_cache
+
+
+async def _listen_once(cache: TicketCache, dsn: str) -> None:
+    """Держит одно LISTEN-соединение, пока оно не оборвется."""
+    def _on_notification(
+        _connection: object,
+        _pid: int,
+        _channel: str,
+        payload: str,
+    ) -> None:
+        cache.handle_notification(payload)
+
+    connection = await asyncpg.connect(dsn)
+    closed = asyncio.Event()
+    connection.add_termination_listener(lambda _: closed.set())
+    try:
+        await connection.add_listener(TICKET_CHANGES_CHANNEL, _on_notification)
+        cache.set_listening(True)
+        await closed.wait()
+    finally:
+        cache.set_listening(False)
+        connection.terminate()
+
+
+async def listen_ticket_changes(
+    cache: TicketCache,
+    dsn: str,
+    retry_delay: float = LISTENER_RETRY_SECONDS,
+) -> None:
+    """Слушает канал ticket_changes и инвалидирует кэш.
+
+    Работает до отмены задачи. После потери соединения кэш очищается
+    целиком и не используется до переподключения: уведомления за время
+    разрыва потеряны.
+    """
+    while True:
+        try:
+            await _listen_once(cache, dsn)
+            logger.warning("Ticket cache listener connection lost")
+        except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as exc:
+            logger.warning("Ticket cache listener failed: %s", exc)
+        await asyncio.sleep(retry_delay)
@@ -1,12 +1,105 @@
-from fastapi import Depends
+import os
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.tickets.cache import get_ticket_cache
+from app.api.tickets.fields import InvalidFieldsError, parse_fields
+from app.api.tickets.schemas import TicketFilters
+from app.api.tickets.search import MAX_QUERY_LENGTH
 from app.api.tickets.service import ServiceDesk
-from app.db.session import get_session
+from app.db.replica import READ_PRIMARY_COOKIE, get_sticky_seconds
+from app.db.session import (REPLICA_SESSION_INFO_KEY, get_read_engine,
+                            get_read_session, get_session)
+from app.db.types import TicketPriority, TicketStatus
+
+DEFAULT_BULK_MAX_SIZE = 1000
 
 
 def get_service_desk(
     session: AsyncSession = Depends(get_session),
 ) -> ServiceDesk:
     """Создает сервисный слой для тикетов."""
-    return ServiceDesk(session)
+    return ServiceDesk(session, cache=get_ticket_cache())
+
+
+def get_read_service_desk(
+    session: AsyncSession = Depends(get_read_session),
+) -> ServiceDesk:
+    """Создает сервисный слой для чтения тикетов.
+
+    Прочитанное с реплики не кладется в кэш: реплика может еще не
+    получить изменение, об инвалидации которого кэш уже узнал.
+    """
+    return ServiceDesk(
+        session,
+        cache=get_ticket_cache(),
+        fill_cache=not session.info.get(REPLICA_SESSION_INFO_KEY, False),
+    )
+
+
+def stick_to_primary(response: Response) -> None:
+    """Направляет чтения клиента на primary сразу после записи.
+
+    Cookie живет DATABASE_READ_STICKY_SECONDS секунд, этого должно
+    хватать, чтобы реплика догнала запись (read-your-writes).
+    """
+    if get_read_engine() is None:
+        return
+    response.set_cookie(
+        READ_PRIMARY_COOKIE,
+        "1",
+        max_age=get_sticky_seconds(),
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def get_ticket_filters(
+    status: Annotated[list[TicketStatus] | None, Query()] = None,
+    priority: Annotated[list[TicketPriority] | None, Query()] = None,
+    q: Annotated[
+        str | None,
+        Query(min_length=1, max_length=MAX_QUERY_LENGTH),
+    ] = None,
+) -> TicketFilters:
+    """Собирает фильтры тикетов из query-параметров."""
+    return TicketFilters(
+        statuses=status or [],
+        priorities=priority or [],
+        query=q,
+    )
+
+
+def get_ticket_search_filters(
+    q: Annotated[str, Query(min_length=1, max_length=MAX_QUERY_LENGTH)],
+    status: Annotated[list[TicketStatus] | None, Query()] = None,
+    priority: Annotated[list[TicketPriority] | None, Query()] = None,
+) -> TicketFilters:
+    """Собирает фильтры поиска тикетов, строка поиска q обязательна."""
+    return TicketFilters(
+        statuses=status or [],
+        priorities=priority or [],
+        query=q,
+    )
+
+
+def get_bulk_max_size() -> int:
+    """Возвращает максимальный размер пачки массовых операций."""
+    return int(os.getenv("TICKETS_BULK_MAX_SIZE", DEFAULT_BULK_MAX_SIZE))
+
+
+def get_ticket_fields(
+    fields: Annotated[list[str] | None, Query()] = None,
+) -> tuple[str, ...] | None:
+    """Разбирает параметр fields; None означает все поля тикета."""
+    if not fields:
+        return None
+    try:
+        return parse_fields(fields)
+    except InvalidFieldsError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
@@ -0,0 +1,37 @@
+import hashlib
+
+from app.api.tickets.schemas import Ticket
+
+IF_NONE_MATCH_HEADER = "if-none-match"
+
+
+def ticket_etag(ticket: Ticket) -> str:
+    """Строгий ETag тикета из id и updated_at.
+
+    updated_at выставляет триггер БД на каждый UPDATE, поэтому ETag
+    меняется и при изменениях в обход API.
+    """
+    updated_at = ticket.updated_at.timestamp() if ticket.updated_at else 0
+    return f'"t{ticket.id}-{int(updated_at * 1_000_000)}"'
+
+
+def list_etag(table_version: str, query_string: str) -> str:
+    """Строгий ETag страницы списка из версии данных и параметров."""
+    digest = hashlib.blake2b(
+        f"{table_version}\n{query_string}".encode(),
+        digest_size=12,
+    ).hexdigest()
+    return f'"l{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Проверяет If-None-Match по правилам слабого сравнения RFC 9110."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (
+        candidate.strip().removeprefix("W/")
+        for candidate in if_none_match.split(",")
+    )
+    return etag.removeprefix("W/") in candidates
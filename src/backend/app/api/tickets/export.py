@@ -0,0 +1,52 @@
+import csv
+import io
+from collections.abc import AsyncIterator, Sequence
+
+from sqlalchemy import Row
+
+from app.api.tickets.schemas import ExportFormat, Ticket
+
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_COLUMNS = tuple(Ticket.model_fields)
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+async def encode_ndjson(
+    partitions: AsyncIterator[Sequence[Row]],
+) -> AsyncIterator[bytes]:
+    """Кодирует пачки строк в NDJSON, один тикет на строку."""
+    async for rows in partitions:
+        yield b"".join(
+            Ticket.model_validate(row, from_attributes=True)
+            .model_dump_json()
+            .encode()
+            + b"\n"
+            for row in rows
+        )
+
+
+async def encode_csv(
+    partitions: AsyncIterator[Sequence[Row]],
+) -> AsyncIterator[bytes]:
+    """Кодирует пачки строк в CSV с заголовком."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    async for rows in partitions:
+        for row in rows:
+            ticket = Ticket.model_validate(row, from_attributes=True)
+            writer.writerow(ticket.model_dump(mode="json").values())
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+EXPORT_ENCODERS = {
+    ExportFormat.NDJSON: encode_ndjson,
+    ExportFormat.CSV: encode_csv,
+}
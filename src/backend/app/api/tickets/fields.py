@@ -0,0 +1,33 @@
+from collections.abc import Iterable
+
+from app.api.tickets.schemas import Ticket
+
+TICKET_FIELDS = tuple(Ticket.model_fields)
+REQUIRED_FIELDS = ("id",)
+FIELDS_SEPARATOR = ","
+
+
+class InvalidFieldsError(ValueError):
+    """В параметре fields указаны неизвестные поля тикета."""
+
+
+def parse_fields(values: Iterable[str]) -> tuple[str, ...]:
+    """Разбирает значения параметра fields в список полей тикета.
+
+    Значения можно перечислять через запятую и повторять параметр.
+    Поле id добавляется всегда, порядок полей совпадает со схемой
+    Ticket, чтобы ответ не зависел от порядка в запросе.
+    """
+    requested = {
+        name.strip()
+        for value in values
+        for name in value.split(FIELDS_SEPARATOR)
+        if name.strip()
+    }
+    unknown = sorted(requested.difference(TICKET_FIELDS))
+    if unknown:
+        raise InvalidFieldsError(
+            f"Unknown ticket fields: {', '.join(unknown)}"
+        )
+    requested.update(REQUIRED_FIELDS)
+    return tuple(name for name in TICKET_FIELDS if name in requested)
@@ -1,17 +1,42 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (APIRouter, Depends, Header, HTTPException, Query, Request,
+                     Response, status)
+from fastapi.responses import StreamingResponse
 
-from app.api.tickets.dependencies import get_service_desk
-from app.api.tickets.schemas import (Ticket, TicketCreate, TicketDeleted,
+from app.api.tickets.dependencies import (get_bulk_max_size,
+                                          get_read_service_desk,
+                                          get_service_desk, get_ticket_fields,
+                                          get_ticket_filters,
+                                          get_ticket_search_filters,
+                                          stick_to_primary)
+from app.api.tickets.etag import etag_matches, list_etag, ticket_etag
+from app.api.tickets.export import EXPORT_ENCODERS, EXPORT_MEDIA_TYPES
+from app.api.tickets.pagination import (DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE,
+                                        NEXT_CURSOR_HEADER, InvalidCursorError,
+                                        decode_cursor)
+from app.api.tickets.schemas import (ExportFormat, Ticket, TicketBulkUpdate,
+                                     TicketBulkUpdated, TicketCreate,
+                                     TicketDeleted, TicketFilters, TicketStats,
                                      TicketUpdate)
+from app.api.tickets.serialization import (TicketFieldsResponse,
+                                           TicketListResponse)
 from app.api.tickets.service import ServiceDesk
 
 tickets_router = APIRouter(tags=["tickets"])
 TICKET_NOT_FOUND_DETAIL = "Ticket not found"
+REVALIDATE_CACHE_CONTROL = "no-cache"
 
 
-@tickets_router.post("/ticket")
+def not_modified(etag: str) -> Response:
+    """Ответ 304 без тела для совпавшего ETag."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL},
+    )
+
+
+@tickets_router.post("/ticket", dependencies=[Depends(stick_to_primary)])
 async def create_ticket(
     payload: TicketCreate,
     service_desk: Annotated[ServiceDesk, Depends(get_service_desk)],
@@ -25,22 +50,94 @@ async def create_ticket(
     )
 
 
-@tickets_router.get("/tickets/{ticket_id}")
+@tickets_router.post("/tickets/bulk", dependencies=[Depends(stick_to_primary)])
+async def create_tickets(
+    payloads: list[TicketCreate],
+    service_desk: Annotated[ServiceDesk, Depends(get_service_desk)],
+    max_size: Annotated[int, Depends(get_bulk_max_size)],
+) -> list[Ticket]:
+    """Создает пачку тикетов в одной транзакции.
+
+    Ошибки валидации возвращаются стандартным ответом 422, где loc
+    содержит индекс тикета в пачке: ["body", 3, "title"].
+    """
+    if len(payloads) > max_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"Batch size exceeds limit of {max_size} tickets",
+        )
+    return await service_desk.create_tickets(payloads)
+
+
+@tickets_router.get("/tickets/export")
+async def export_tickets(
+    service_desk: Annotated[ServiceDesk, Depends(get_read_service_desk)],
+    filters: Annotated[TicketFilters, Depends(get_ticket_filters)],
+    export_format: Annotated[
+        ExportFormat,
+        Query(alias="format"),
+    ] = ExportFormat.NDJSON,
+) -> StreamingResponse:
+    """Потоково выгружает тикеты в NDJSON или CSV."""
+    encode = EXPORT_ENCODERS[export_format]
+    return StreamingResponse(
+        encode(service_desk.stream_tickets(filters=filters)),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="tickets.{export_format.value}"'
+            ),
+        },
+    )
+
+
+@tickets_router.get("/tickets/search")
+async def search_tickets(
+    service_desk: Annotated[ServiceDesk, Depends(get_read_service_desk)],
+    filters: Annotated[TicketFilters, Depends(get_ticket_search_filters)],
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+) -> list[Ticket]:
+    """Ищет тикеты по заголовку и описанию, лучшие совпадения первыми."""
+    return await service_desk.search_tickets(filters=filters, limit=limit)
+
+
+@tickets_router.get("/tickets/stats")
+async def get_ticket_stats(
+    service_desk: Annotated[ServiceDesk, Depends(get_read_service_desk)],
+) -> TicketStats:
+    """Возвращает число тикетов по статусам и приоритетам."""
+    return await service_desk.get_ticket_stats()
+
+
+@tickets_router.get("/tickets/{ticket_id}", response_model=Ticket)
 async def get_ticket(
     ticket_id: int,
-    service_desk: Annotated[ServiceDesk, Depends(get_service_desk)],
-) -> Ticket:
-    """Возвращает тикет по идентификатору."""
+    response: Response,
+    service_desk: Annotated[ServiceDesk, Depends(get_read_service_desk)],
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Ticket | Response:
+    """Возвращает тикет по идентификатору.
+
+    При совпадении If-None-Match отвечает 304 без тела.
+    """
     ticket = await service_desk.get_ticket(ticket_id)
     if ticket is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=TICKET_NOT_FOUND_DETAIL,
         )
+    etag = ticket_etag(ticket)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
     return ticket
 
 
-@tickets_router.put("/tickets/{ticket_id}")
+@tickets_router.put(
+    "/tickets/{ticket_id}",
+    dependencies=[Depends(stick_to_primary)],
+)
 async def update_ticket(
     ticket_id: int,
     payload: TicketUpdate,
@@ -68,15 +165,89 @@ async def update_ticket(
     return ticket
 
 
-@tickets_router.get("/tickets")
-async def list_tickets(
+@tickets_router.patch("/tickets", dependencies=[Depends(stick_to_primary)])
+async def update_tickets(
+    payload: TicketBulkUpdate,
     service_desk: Annotated[ServiceDesk, Depends(get_service_desk)],
-) -> list[Ticket]:
-    """Возвращает список тикетов."""
-    return await service_desk.list_tickets()
+    max_size: Annotated[int, Depends(get_bulk_max_size)],
+) -> TicketBulkUpdated:
+    """Массово меняет тикеты, выбранные по списку id или фильтрам."""
+    changes = payload.changes.model_dump(exclude_none=True)
+    if not changes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No fields to update",
+        )
+    if payload.ids is not None and len(payload.ids) > max_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"Batch size exceeds limit of {max_size} tickets",
+        )
+    return await service_desk.update_tickets(
+        changes,
+        ids=payload.ids,
+        filters=payload.filters,
+    )
+
+
+@tickets_router.get("/tickets", response_model=list[Ticket])
+async def list_tickets(
+    request: Request,
+    service_desk: Annotated[ServiceDesk, Depends(get_read_service_desk)],
+    filters: Annotated[TicketFilters, Depends(get_ticket_filters)],
+    fields: Annotated[tuple[str, ...] | None, Depends(get_ticket_fields)],
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """Возвращает страницу тикетов с фильтрами по статусу и приоритету.
+
+    Курсор следующей страницы передается в заголовке X-Next-Cursor,
+    чтобы тело ответа оставалось списком тикетов. ETag строится по
+    версии данных: при совпадении If-None-Match ответ 304 отдается
+    без чтения тикетов. Тело сериализуется TicketListResponse без
+    повторной валидации списка на стороне FastAPI. Параметр fields
+    (например, fields=id,title,status) ограничивает поля тикетов и
+    колонки, читаемые из БД; id возвращается всегда.
+    """
+    version = await service_desk.get_tickets_version()
+    etag = list_etag(version, request.url.query)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except InvalidCursorError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc),
+            ) from exc
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+    if fields is not None:
+        fields_page = await service_desk.list_ticket_fields(
+            fields,
+            limit=limit,
+            after=after,
+            filters=filters,
+        )
+        if fields_page.next_cursor is not None:
+            headers[NEXT_CURSOR_HEADER] = fields_page.next_cursor
+        return TicketFieldsResponse(fields_page.items, headers=headers)
+    page = await service_desk.list_tickets(
+        limit=limit,
+        after=after,
+        filters=filters,
+    )
+    if page.next_cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return TicketListResponse(page.items, headers=headers)
 
 
-@tickets_router.delete("/tickets/{ticket_id}")
+@tickets_router.delete(
+    "/tickets/{ticket_id}",
+    dependencies=[Depends(stick_to_primary)],
+)
 async def delete_ticket(
     ticket_id: int,
     service_desk: Annotated[ServiceDesk, Depends(get_service_desk)],
@@ -0,0 +1,35 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    """Курсор пагинации поврежден или подделан."""
+
+
+def encode_cursor(created_at: datetime, ticket_id: int) -> str:
+    """Кодирует позицию (created_at, id) в непрозрачный курсор."""
+    payload = json.dumps(
+        [created_at.isoformat(), ticket_id],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Декодирует курсор в позицию (created_at, id)."""
+    padding = "=" * (-len(cursor) % 4)
+    try:
+        raw = base64.urlsafe_b64decode(cursor + padding)
+        created_at_raw, ticket_id = json.loads(raw)
+        created_at = datetime.fromisoformat(created_at_raw)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+    if not isinstance(ticket_id, int) or created_at.tzinfo is None:
+        raise InvalidCursorError("Invalid cursor")
+    return created_at, ticket_id
@@ -1,9 +1,13 @@
 from datetime import datetime
+from enum import Enum
+from typing import Any
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from app.db.types import TicketPriority, TicketStatus
 
+TITLE_MAX_LENGTH = 255
+
 
 class Ticket(BaseModel):
     """Схема тикета."""
@@ -26,7 +30,7 @@ class TicketDeleted(BaseModel):
 
 class TicketCreate(BaseModel):
     """Входные данные для создания тикета."""
-    title: str
+    title: str = Field(max_length=TITLE_MAX_LENGTH)
     description: str = Field(default="")
     status: TicketStatus = Field(default=TicketStatus.NEW)
     priority: TicketPriority = Field(default=TicketPriority.MEDIUM)
@@ -34,7 +38,74 @@ class TicketCreate(BaseModel):
 
 class TicketUpdate(BaseModel):
     """Входные данные для обновления тикета."""
-    title: str | None = None
+    title: str | None = Field(default=None, max_length=TITLE_MAX_LENGTH)
     description: str | None = None
     status: TicketStatus | None = None
     priority: TicketPriority | None = None
+
+
+class TicketFilters(BaseModel):
+    """Фильтры списка тикетов.
+
+    Пустой список означает отсутствие фильтра по полю, query - строка
+    полнотекстового поиска по заголовку и описанию.
+    """
+    statuses: list[TicketStatus] = Field(default_factory=list)
+    priorities: list[TicketPriority] = Field(default_factory=list)
+    query: str | None = None
+
+
+class TicketPage(BaseModel):
+    """Страница тикетов с курсором на следующую страницу."""
+    items: list[Ticket]
+    next_cursor: str | None = None
+
+
+class TicketFieldsPage(BaseModel):
+    """Страница тикетов, в которой у каждого тикета только выбранные поля."""
+    items: list[dict[str, Any]]
+    next_cursor: str | None = None
+
+
+class ExportFormat(str, Enum):
+    """Форматы выгрузки тикетов."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class TicketBulkUpdate(BaseModel):
+    """Массовое обновление тикетов по списку id или по фильтрам."""
+    ids: list[int] | None = Field(default=None, min_length=1)
+    filters: TicketFilters | None = None
+    changes: TicketUpdate
+
+    @model_validator(mode="after")
+    def check_target(self) -> "TicketBulkUpdate":
+        """Проверяет, что задан ровно один непустой способ выбора."""
+        if (self.ids is None) == (self.filters is None):
+            raise ValueError("Exactly one of ids or filters is required")
+        if self.filters is not None and self.filters == TicketFilters():
+            raise ValueError("Filters must not be empty")
+        return self
+
+
+class TicketBulkUpdated(BaseModel):
+    """Результат массового обновления тикетов."""
+    updated: list[int]
+    not_found: list[int] = Field(default_factory=list)
+
+
+class TicketCount(BaseModel):
+    """Число тикетов для пары статус/приоритет."""
+    status: TicketStatus
+    priority: TicketPriority
+    count: int
+
+
+class TicketStats(BaseModel):
+    """Статистика тикетов по статусам и приоритетам."""
+    total: int
+    by_status: dict[TicketStatus, int]
+    by_priority: dict[TicketPriority, int]
+    counts: list[TicketCount]
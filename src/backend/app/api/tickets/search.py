@@ -0,0 +1,48 @@
+from typing import Any
+
+from sqlalchemy import ColumnClause, ColumnElement, func, literal_column
+
+from app.db.models import SEARCH_CONFIG, TICKET_SEARCH_VECTOR
+from app.db.models import Ticket as TicketModel
+
+SHORT_QUERY_LENGTH = 3
+MAX_QUERY_LENGTH = 200
+_LIKE_ESCAPE = "\\"
+
+
+def ts_query(query: str) -> ColumnElement:
+    """Строит tsquery из пользовательской строки поиска."""
+    config: ColumnClause[Any] = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+    return func.websearch_to_tsquery(config, query)
+
+
+def matches_text(query: str) -> ColumnElement[bool]:
+    """Условие полнотекстового совпадения по GIN-индексу."""
+    return TICKET_SEARCH_VECTOR.op("@@")(ts_query(query))
+
+
+def text_rank(query: str) -> ColumnElement[float]:
+    """Релевантность тикета для полнотекстового запроса."""
+    return func.ts_rank(TICKET_SEARCH_VECTOR, ts_query(query))
+
+
+def matches_title_fuzzy(query: str) -> ColumnElement[bool]:
+    """Нечеткое совпадение заголовка через pg_trgm.
+
+    Подстрока ищется через ILIKE, опечатки - через оператор сходства %,
+    оба условия обслуживает триграммный GIN-индекс по title.
+    """
+    escaped = (
+        query.replace(_LIKE_ESCAPE, _LIKE_ESCAPE * 2)
+        .replace("%", f"{_LIKE_ESCAPE}%")
+        .replace("_", f"{_LIKE_ESCAPE}_")
+    )
+    return TicketModel.title.ilike(
+        f"%{escaped}%",
+        escape=_LIKE_ESCAPE,
+    ) | TicketModel.title.op("%")(query)
+
+
+def title_similarity(query: str) -> ColumnElement[float]:
+    """Триграммное сходство заголовка с запросом."""
+    return func.similarity(TicketModel.title, query)
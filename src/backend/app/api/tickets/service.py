@@ -1,18 +1,101 @@
-from datetime import datetime, timezone
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from typing import Any, TypeVar, cast
 
-from sqlalchemy import select
+from sqlalchemy import (ARRAY, Integer, Row, Select, Table, Update, any_,
+                        bindparam, delete, func, insert, literal, select,
+                        tuple_, update)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.tickets.schemas import Ticket
+from app.api.tickets.cache import TicketCache
+from app.api.tickets.export import EXPORT_CHUNK_SIZE
+from app.api.tickets.pagination import DEFAULT_PAGE_SIZE, encode_cursor
+from app.api.tickets.schemas import (Ticket, TicketBulkUpdated, TicketCount,
+                                     TicketCreate, TicketFieldsPage,
+                                     TicketFilters, TicketPage, TicketStats)
+from app.api.tickets.search import (SHORT_QUERY_LENGTH, matches_text,
+                                    matches_title_fuzzy, text_rank,
+                                    title_similarity)
+from app.api.tickets.serialization import tickets_from_rows
 from app.db.models import Ticket as TicketModel
+from app.db.models import TicketCounter
 from app.db.types import TicketPriority, TicketStatus
 
+QueryT = TypeVar("QueryT", Select, Update)
+# Вставки идут через Core-таблицу, минуя ORM bulk insert.
+TICKETS_TABLE = cast(Table, TicketModel.__table__)
+TICKET_COLUMNS = tuple(
+    TicketModel.__table__.c[name] for name in Ticket.model_fields
+)
+CURSOR_FIELDS = ("created_at", "id")
+
+
+def apply_ticket_filters(
+    query: QueryT,
+    filters: TicketFilters | None,
+    include_text: bool = True,
+) -> QueryT:
+    """Добавляет к запросу условия фильтров тикетов.
+
+    include_text=False пропускает полнотекстовое условие, когда
+    запрос строится поиском с ранжированием.
+    Значения перечислений подставляются литералами, иначе планировщик
+    не сможет доказать условие частичного индекса для generic-плана
+    подготовленного выражения.
+    """
+    if filters is None:
+        return query
+    if filters.statuses:
+        query = query.where(
+            TicketModel.status.in_(
+                bindparam(
+                    "statuses",
+                    filters.statuses,
+                    expanding=True,
+                    literal_execute=True,
+                )
+            )
+        )
+    if filters.priorities:
+        query = query.where(
+            TicketModel.priority.in_(
+                bindparam(
+                    "priorities",
+                    filters.priorities,
+                    expanding=True,
+                    literal_execute=True,
+                )
+            )
+        )
+    if include_text and filters.query:
+        query = query.where(matches_text(filters.query))
+    return query
+
 
 class ServiceDesk:
     """Сервисный слой работы с тикетами."""
-    def __init__(self, session: AsyncSession) -> None:
-        """Создает сервис с сессией БД."""
+    def __init__(
+        self,
+        session: AsyncSession,
+        cache: TicketCache | None = None,
+        fill_cache: bool = True,
+    ) -> None:
+        """Создает сервис с сессией БД и необязательным кэшем тикетов.
+
+        fill_cache=False оставляет кэш только для чтения: так работает
+        сервис поверх сессии реплики.
+        """
         self._session = session
+        self._cache = cache
+        self._fill_cache = fill_cache
+
+    def _invalidate(self, ticket_ids: Sequence[int]) -> None:
+        """Сбрасывает измененные тикеты в локальном кэше.
+
+        Остальные реплики получают изменения через NOTIFY из триггера.
+        """
+        if self._cache is not None and ticket_ids:
+            self._cache.invalidate(ticket_ids)
 
     async def create_ticket(
         self,
@@ -21,39 +104,74 @@ class ServiceDesk:
         status: TicketStatus = TicketStatus.NEW,
         priority: TicketPriority = TicketPriority.MEDIUM,
     ) -> Ticket:
-        """Создает тикет с описанием."""
-        ticket = TicketModel(
-            title=title,
-            description=description,
-            status=status,
-            priority=priority,
-        )
-        self._session.add(ticket)
+        """Создает тикет одним INSERT ... RETURNING."""
+        result = await self._session.execute(
+            insert(TICKETS_TABLE)
+            .values(
+                title=title,
+                description=description,
+                status=status,
+                priority=priority,
+            )
+            .returning(*TICKET_COLUMNS)
+        )
+        row = result.one()
         await self._session.commit()
-        await self._session.refresh(ticket)
-        return Ticket.model_validate(ticket)
+        return Ticket.model_validate(row, from_attributes=True)
+
+    async def create_tickets(
+        self,
+        payloads: Sequence[TicketCreate],
+    ) -> list[Ticket]:
+        """Создает пачку тикетов одним INSERT ... RETURNING.
+
+        Все тикеты вставляются в одной транзакции: либо создаются все,
+        либо ни один. Порядок результата совпадает с порядком payloads.
+        """
+        if not payloads:
+            return []
+        query = insert(TICKETS_TABLE).returning(
+            *TICKET_COLUMNS,
+            sort_by_parameter_order=True,
+        )
+        result = await self._session.execute(
+            query,
+            [payload.model_dump() for payload in payloads],
+        )
+        rows = result.all()
+        await self._session.commit()
+        return tickets_from_rows(rows)
 
     async def get_ticket(self, ticket_id: int) -> Ticket | None:
-        """Возвращает тикет по идентификатору."""
+        """Возвращает тикет по идентификатору, сначала из кэша."""
+        generation = None
+        if self._cache is not None:
+            cached = self._cache.get(ticket_id)
+            if cached is not None:
+                return cached
+            generation = self._cache.generation
         result = await self._session.execute(
             select(TicketModel).where(TicketModel.id == ticket_id)
         )
-        ticket = result.scalar_one_or_none()
-        if ticket is None:
+        ticket_model = result.scalar_one_or_none()
+        if ticket_model is None:
             return None
-        return Ticket.model_validate(ticket)
+        ticket = Ticket.model_validate(ticket_model)
+        if self._cache is not None and self._fill_cache:
+            self._cache.set(ticket, generation=generation)
+        return ticket
 
     async def delete_ticket(self, ticket_id: int) -> bool:
-        """Удаляет тикет по идентификатору."""
+        """Удаляет тикет одним DELETE ... RETURNING."""
         result = await self._session.execute(
-            select(TicketModel).where(TicketModel.id == ticket_id)
+            delete(TicketModel)
+            .where(TicketModel.id == ticket_id)
+            .returning(TicketModel.id)
         )
-        ticket = result.scalar_one_or_none()
-        if ticket is None:
-            return False
-        await self._session.delete(ticket)
+        deleted = result.scalar_one_or_none() is not None
         await self._session.commit()
-        return True
+        self._invalidate([ticket_id])
+        return deleted
 
     async def update_ticket(
         self,
@@ -63,30 +181,289 @@ class ServiceDesk:
         status: TicketStatus | None = None,
         priority: TicketPriority | None = None,
     ) -> Ticket | None:
-        """Обновляет описание тикета."""
+        """Обновляет тикет одним UPDATE ... RETURNING.
+
+        Поля со значением None не меняются, updated_at выставляет
+        триггер set_ticket_updated_at.
+        """
+        changes = {
+            name: value
+            for name, value in (
+                ("title", title),
+                ("description", description),
+                ("status", status),
+                ("priority", priority),
+            )
+            if value is not None
+        }
+        if not changes:
+            return await self.get_ticket(ticket_id)
         result = await self._session.execute(
-            select(TicketModel).where(TicketModel.id == ticket_id)
+            update(TicketModel)
+            .where(TicketModel.id == ticket_id)
+            .values(**changes)
+            .returning(*TICKET_COLUMNS)
+            .execution_options(synchronize_session=False)
         )
-        ticket = result.scalar_one_or_none()
-        if ticket is None:
+        row = result.one_or_none()
+        await self._session.commit()
+        self._invalidate([ticket_id])
+        if row is None:
             return None
-        if title is not None:
-            ticket.title = title
-        if description is not None:
-            ticket.description = description
-        if status is not None:
-            ticket.status = status
-        if priority is not None:
-            ticket.priority = priority
-        ticket.updated_at = datetime.now(timezone.utc)
+        return Ticket.model_validate(row, from_attributes=True)
+
+    async def update_tickets(
+        self,
+        changes: dict[str, Any],
+        ids: Sequence[int] | None = None,
+        filters: TicketFilters | None = None,
+    ) -> TicketBulkUpdated:
+        """Обновляет набор тикетов одним UPDATE ... RETURNING.
+
+        Тикеты выбираются по списку id (одним параметром-массивом для
+        = ANY) либо по фильтрам. Для списка id в ответе перечисляются
+        идентификаторы, которых не нашлось.
+        """
+        if (ids is None) == (filters is None):
+            raise ValueError("Exactly one of ids or filters is required")
+        query: Update = (
+            update(TicketModel)
+            .values(**changes)
+            .returning(TicketModel.id)
+            .execution_options(synchronize_session=False)
+        )
+        if ids is not None:
+            query = query.where(
+                TicketModel.id == any_(
+                    bindparam("ids", list(ids), type_=ARRAY(Integer))
+                )
+            )
+        else:
+            query = apply_ticket_filters(query, filters)
+        result = await self._session.execute(query)
+        updated = list(result.scalars().all())
         await self._session.commit()
-        await self._session.refresh(ticket)
-        return Ticket.model_validate(ticket)
+        self._invalidate(updated)
+        not_found: list[int] = []
+        if ids is not None:
+            found = set(updated)
+            not_found = [
+                ticket_id for ticket_id in dict.fromkeys(ids)
+                if ticket_id not in found
+            ]
+        return TicketBulkUpdated(updated=updated, not_found=not_found)
+
+    async def get_tickets_version(self) -> str:
+        """Возвращает версию данных для ETag списков.
 
-    async def list_tickets(self) -> list[Ticket]:
-        """Возвращает список тикетов."""
+        Версия - max(updated_at) тикетов и сумма ticket_counters: вставка
+        и удаление меняют сумму, UPDATE - max(updated_at) через триггер
+        set_ticket_updated_at. Обе части читаются по индексу и из
+        маленькой таблицы, зависят только от данных tickets и поэтому
+        совпадают на всех репликах. Версию нужно читать до самих тикетов.
+        """
         result = await self._session.execute(
-            select(TicketModel).order_by(TicketModel.created_at.desc())
+            select(
+                select(func.max(TicketModel.updated_at)).scalar_subquery(),
+                select(
+                    func.coalesce(func.sum(TicketCounter.count), 0)
+                ).scalar_subquery(),
+            )
+        )
+        updated_at, total = result.one()
+        micros = int(updated_at.timestamp() * 1_000_000) if updated_at else 0
+        return f"{micros}-{total}"
+
+    async def get_ticket_stats(self) -> TicketStats:
+        """Возвращает число тикетов по статусам и приоритетам.
+
+        Читаются только строки ticket_counters (не больше
+        #статусов x #приоритетов), сами тикеты не сканируются.
+        """
+        result = await self._session.execute(
+            select(
+                TicketCounter.status,
+                TicketCounter.priority,
+                TicketCounter.count.label("n"),
+            )
+        )
+        # Row.count - метод кортежа, поэтому колонка читается как n.
+        stored = {
+            (row.status, row.priority): row.n for row in result.all()
+        }
+        counts = [
+            TicketCount(
+                status=status,
+                priority=priority,
+                count=stored.get((status, priority), 0),
+            )
+            for status in TicketStatus
+            for priority in TicketPriority
+        ]
+        by_status = dict.fromkeys(TicketStatus, 0)
+        by_priority = dict.fromkeys(TicketPriority, 0)
+        for item in counts:
+            by_status[item.status] += item.count
+            by_priority[item.priority] += item.count
+        return TicketStats(
+            total=sum(by_status.values()),
+            by_status=by_status,
+            by_priority=by_priority,
+            counts=counts,
+        )
+
+    async def warm_up(self) -> None:
+        """Выполняет горячие запросы на чтение.
+
+        На соединении, где выполнен прогрев, asyncpg уже знает типы
+        колонок и держит подготовленные выражения, а SQLAlchemy - их
+        скомпилированный SQL.
+        """
+        await self.get_tickets_version()
+        await self.list_tickets(limit=1)
+        await self.get_ticket(0)
+        await self.get_ticket_stats()
+
+    async def _fetch_page(
+        self,
+        columns: Sequence[Any],
+        limit: int,
+        after: tuple[datetime, int] | None,
+        filters: TicketFilters | None,
+    ) -> tuple[Sequence[Row], str | None]:
+        """Читает страницу строк с заданными колонками и курсор дальше.
+
+        Пагинация курсорная по (created_at, id): позиция страницы
+        ищется по индексу, поэтому стоимость не растет с номером страницы.
+        """
+        query = select(*columns).order_by(
+            TicketModel.created_at.desc(),
+            TicketModel.id.desc(),
+        )
+        query = apply_ticket_filters(query, filters)
+        if after is not None:
+            created_at, ticket_id = after
+            query = query.where(
+                tuple_(TicketModel.created_at, TicketModel.id)
+                < tuple_(
+                    literal(created_at, TicketModel.created_at.type),
+                    literal(ticket_id, TicketModel.id.type),
+                )
+            )
+        result = await self._session.execute(query.limit(limit + 1))
+        rows = result.all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+        return rows, next_cursor
+
+    async def list_tickets(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: tuple[datetime, int] | None = None,
+        filters: TicketFilters | None = None,
+    ) -> TicketPage:
+        """Возвращает страницу тикетов от новых к старым.
+
+        Выбираются кортежи колонок без ORM-объектов.
+        """
+        rows, next_cursor = await self._fetch_page(
+            TICKET_COLUMNS,
+            limit,
+            after,
+            filters,
+        )
+        return TicketPage.model_construct(
+            items=tickets_from_rows(rows),
+            next_cursor=next_cursor,
+        )
+
+    async def list_ticket_fields(
+        self,
+        fields: Sequence[str],
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: tuple[datetime, int] | None = None,
+        filters: TicketFilters | None = None,
+    ) -> TicketFieldsPage:
+        """Возвращает страницу тикетов только с выбранными полями.
+
+        Из БД читаются лишь нужные колонки (плюс ключ курсора), поэтому
+        невыбранный description не вытаскивается из TOAST и не идет
+        по сети.
+        """
+        names = dict.fromkeys([*fields, *CURSOR_FIELDS])
+        columns = [TicketModel.__table__.c[name] for name in names]
+        rows, next_cursor = await self._fetch_page(
+            columns,
+            limit,
+            after,
+            filters,
+        )
+        return TicketFieldsPage.model_construct(
+            items=[
+                {name: row._mapping[name] for name in fields}
+                for row in rows
+            ],
+            next_cursor=next_cursor,
+        )
+
+    async def search_tickets(
+        self,
+        filters: TicketFilters,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> list[Ticket]:
+        """Ищет тикеты по заголовку и описанию.
+
+        Запросы от SHORT_QUERY_LENGTH символов идут через tsvector с
+        ранжированием ts_rank. Короткие запросы и запросы без
+        полнотекстовых совпадений ищутся по заголовку через pg_trgm.
+        """
+        if not filters.query:
+            raise ValueError("Search query is required")
+        text_query = filters.query
+        if len(text_query) >= SHORT_QUERY_LENGTH:
+            query = apply_ticket_filters(
+                select(*TICKET_COLUMNS)
+                .where(matches_text(text_query))
+                .order_by(text_rank(text_query).desc(), TicketModel.id.desc())
+                .limit(limit),
+                filters,
+                include_text=False,
+            )
+            result = await self._session.execute(query)
+            rows = result.all()
+            if rows:
+                return tickets_from_rows(rows)
+        query = apply_ticket_filters(
+            select(*TICKET_COLUMNS)
+            .where(matches_title_fuzzy(text_query))
+            .order_by(
+                title_similarity(text_query).desc(),
+                TicketModel.id.desc(),
+            )
+            .limit(limit),
+            filters,
+            include_text=False,
+        )
+        result = await self._session.execute(query)
+        return tickets_from_rows(result.all())
+
+    async def stream_tickets(
+        self,
+        filters: TicketFilters | None = None,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Отдает тикеты пачками через серверный курсор.
+
+        Выбираются кортежи колонок без ORM-объектов, а в памяти
+        одновременно держится не больше одной пачки строк.
+        """
+        query = select(*TICKET_COLUMNS).order_by(TicketModel.id)
+        query = apply_ticket_filters(query, filters)
+        result = await self._session.stream(
+            query.execution_options(yield_per=chunk_size)
         )
-        tickets = result.scalars().all()
-        return [Ticket.model_validate(ticket) for ticket in tickets]
+        async for rows in result.partitions():
+            yield rows
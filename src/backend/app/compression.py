@@ -0,0 +1,519 @@
+"""Сжатие ответов по Accept-Encoding.
+
+gzip доступен всегда, br и zstd - если в образ установлены пакеты
+brotli и zstandard. Ответ сжимается, если его тип текстовый (JSON,
+NDJSON, CSV, text/*) и тело не меньше COMPRESSION_MIN_SIZE байт;
+потоковые ответы сжимаются по частям без накопления тела.
+
+Сжатые тела ответов с ETag хранятся в ограниченном LRU-кэше: ETag
+списка меняется вместе с версией таблицы, поэтому повторный запрос той
+же страницы отдает уже сжатые байты.
+"""
+import gzip
+import importlib
+import os
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from types import ModuleType
+from typing import Any, Protocol
+
+from prometheus_client import Counter, Histogram
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.timing import record_phase
+
+DEFAULT_ENCODINGS = "zstd,br,gzip"
+DEFAULT_MIN_SIZE = 1024
+DEFAULT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+COMPRESS_PHASE = "compress"
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/problem+json",
+    "text/",
+)
+NOT_COMPRESSIBLE_STATUSES = frozenset({204, 206, 304})
+
+HTTP_RESPONSE_COMPRESSION_RATIO = Histogram(
+    "http_response_compression_ratio",
+    "Compressed to original response body size.",
+    labelnames=("encoding",),
+    buckets=(0.05, 0.1, 0.15, 0.2, 0.25, 0.3, 0.4, 0.5, 0.6, 0.8, 1.0),
+)
+HTTP_RESPONSE_COMPRESSION_CPU_SECONDS = Histogram(
+    "http_response_compression_cpu_seconds",
+    "CPU time spent compressing a response body.",
+    labelnames=("encoding",),
+    buckets=(
+        0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+        0.1, 0.25, 1.0,
+    ),
+)
+HTTP_RESPONSE_COMPRESSION_BYTES = Counter(
+    "http_response_compression_bytes_total",
+    "Response body bytes before and after compression.",
+    labelnames=("encoding", "stage"),
+)
+HTTP_RESPONSE_COMPRESSION_CACHE = Counter(
+    "http_response_compression_cache_total",
+    "Precompressed response cache lookups by result.",
+    labelnames=("result",),
+)
+
+
+class StreamCompressor(Protocol):
+    """Сжатие потока частями."""
+
+    def compress(self, chunk: bytes) -> bytes:
+        """Сжимает часть и возвращает все, что можно отправить сейчас."""
+
+    def finish(self) -> bytes:
+        """Завершает поток."""
+
+
+class _GzipStream:
+    """Потоковый gzip с отправкой каждой части сразу (Z_SYNC_FLUSH)."""
+
+    def __init__(self) -> None:
+        """Создает компрессор с заголовком gzip."""
+        self._compressor = zlib.compressobj(
+            GZIP_LEVEL,
+            zlib.DEFLATED,
+            zlib.MAX_WBITS | 16,
+        )
+
+    def compress(self, chunk: bytes) -> bytes:
+        """Сжимает часть и сбрасывает буфер компрессора."""
+        return (
+            self._compressor.compress(chunk)
+            + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        )
+
+    def finish(self) -> bytes:
+        """Дописывает конец потока и контрольную сумму."""
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    """Потоковый brotli."""
+
+    def __init__(self, brotli: Any) -> None:
+        """Создает компрессор."""
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, chunk: bytes) -> bytes:
+        """Сжимает часть и сбрасывает буфер компрессора."""
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        """Завершает поток."""
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    """Потоковый zstd."""
+
+    def __init__(self, zstandard: Any) -> None:
+        """Создает компрессор."""
+        self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        self._compressor = zstandard.ZstdCompressor(
+            level=ZSTD_LEVEL,
+        ).compressobj()
+
+    def compress(self, chunk: bytes) -> bytes:
+        """Сжимает часть и сбрасывает текущий блок."""
+        return (
+            self._compressor.compress(chunk)
+            + self._compressor.flush(self._flush_block)
+        )
+
+    def finish(self) -> bytes:
+        """Завершает кадр."""
+        return self._compressor.flush()
+
+
+class Codec:
+    """Кодировка Content-Encoding: сжатие тела целиком и по частям."""
+
+    __slots__ = ("name", "compress", "stream")
+
+    def __init__(
+        self,
+        name: str,
+        compress: Callable[[bytes], bytes],
+        stream: Callable[[], StreamCompressor],
+    ) -> None:
+        """Создает кодировку из функций сжатия."""
+        self.name = name
+        self.compress = compress
+        self.stream = stream
+
+
+def _import_optional(name: str) -> ModuleType | None:
+    """Импортирует необязательный пакет сжатия, если он установлен."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def _load_codecs() -> dict[str, Codec]:
+    """Кодировки, доступные в этом окружении."""
+    codecs = {
+        "gzip": Codec(
+            "gzip",
+            lambda data: gzip.compress(data, GZIP_LEVEL, mtime=0),
+            _GzipStream,
+        ),
+    }
+    brotli: Any = _import_optional("brotli")
+    if brotli is not None:
+        codecs["br"] = Codec(
+            "br",
+            lambda data: brotli.compress(data, quality=BROTLI_QUALITY),
+            lambda: _BrotliStream(brotli),
+        )
+    zstandard: Any = _import_optional("zstandard")
+    if zstandard is not None:
+        codecs["zstd"] = Codec(
+            "zstd",
+            lambda data: zstandard.ZstdCompressor(
+                level=ZSTD_LEVEL,
+            ).compress(data),
+            lambda: _ZstdStream(zstandard),
+        )
+    return codecs
+
+
+CODECS = _load_codecs()
+
+
+def negotiate_encoding(
+    accept_encoding: str | None,
+    encodings: Sequence[str],
+) -> str | None:
+    """Выбирает кодировку по Accept-Encoding; None - без сжатия.
+
+    Побеждает наибольший q, при равных q - кодировка, стоящая в
+    encodings раньше. q=0 запрещает кодировку, * задает q для
+    неперечисленных.
+    """
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+    default = weights.get("*", 0.0)
+    best = None
+    best_weight = 0.0
+    for name in encodings:
+        weight = weights.get(name, default)
+        if weight > best_weight:
+            best = name
+            best_weight = weight
+    return best
+
+
+class CompressedBodyCache:
+    """LRU-кэш сжатых тел, ограниченный суммарным размером в байтах."""
+
+    def __init__(self, max_bytes: int) -> None:
+        """Создает пустой кэш."""
+        self._max_bytes = max_bytes
+        self._size = 0
+        self._entries: OrderedDict[tuple[str, str, str], bytes] = (
+            OrderedDict()
+        )
+
+    def get(self, key: tuple[str, str, str]) -> bytes | None:
+        """Возвращает тело по (путь, ETag, кодировка) или None."""
+        body = self._entries.get(key)
+        if body is None:
+            HTTP_RESPONSE_COMPRESSION_CACHE.labels(result="miss").inc()
+            return None
+        self._entries.move_to_end(key)
+        HTTP_RESPONSE_COMPRESSION_CACHE.labels(result="hit").inc()
+        return body
+
+    def set(self, key: tuple[str, str, str], body: bytes) -> None:
+        """Сохраняет тело, вытесняя самые старые записи."""
+        if len(body) > self._max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._entries[key] = body
+        self._size += len(body)
+        while self._size > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def __len__(self) -> int:
+        """Число записей в кэше."""
+        return len(self._entries)
+
+
+def _observe(
+    encoding: str,
+    original: int,
+    compressed: int,
+    cpu_seconds: float,
+) -> None:
+    """Пишет метрики одного сжатого ответа."""
+    HTTP_RESPONSE_COMPRESSION_BYTES.labels(
+        encoding=encoding,
+        stage="original",
+    ).inc(original)
+    HTTP_RESPONSE_COMPRESSION_BYTES.labels(
+        encoding=encoding,
+        stage="compressed",
+    ).inc(compressed)
+    if original:
+        HTTP_RESPONSE_COMPRESSION_RATIO.labels(encoding=encoding).observe(
+            compressed / original
+        )
+    HTTP_RESPONSE_COMPRESSION_CPU_SECONDS.labels(
+        encoding=encoding,
+    ).observe(cpu_seconds)
+
+
+def _is_compressible(headers: Headers, status: int) -> bool:
+    """Проверяет, можно ли сжимать ответ с такими заголовками."""
+    if status in NOT_COMPRESSIBLE_STATUSES or "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "").lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def _set_encoded_headers(headers: MutableHeaders, encoding: str) -> None:
+    """Заголовки сжатого ответа.
+
+    ETag становится слабым: байты сжатого и несжатого ответа разные, а
+    If-None-Match и так сравнивается по слабым правилам.
+    """
+    headers["Content-Encoding"] = encoding
+    etag = headers.get("etag")
+    if etag is not None and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+class _CompressionResponder:
+    """Обертка send одного запроса для CompressionMiddleware."""
+
+    def __init__(
+        self,
+        middleware: "CompressionMiddleware",
+        scope: Scope,
+        encoding: str | None,
+        send: Send,
+    ) -> None:
+        """Готовит обработку ответа в выбранной кодировке."""
+        self._middleware = middleware
+        self._scope = scope
+        self._encoding = encoding
+        self._send = send
+        self._start: Message | None = None
+        self._stream: StreamCompressor | None = None
+        self._original = 0
+        self._compressed = 0
+        self._cpu_seconds = 0.0
+
+    async def send(self, message: Message) -> None:
+        """Откладывает заголовки до первой части тела и сжимает ее."""
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+        if self._stream is not None:
+            await self._send_stream_chunk(message)
+            return
+        start = self._start
+        if start is None:
+            await self._send(message)
+            return
+        self._start = None
+        headers = MutableHeaders(scope=start)
+        if not _is_compressible(headers, start["status"]):
+            await self._send(start)
+            await self._send(message)
+            return
+        headers.add_vary_header("Accept-Encoding")
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self._encoding is None or self._is_small(headers, body, more_body):
+            await self._send(start)
+            await self._send(message)
+            return
+        codec = CODECS[self._encoding]
+        _set_encoded_headers(headers, codec.name)
+        if more_body:
+            del headers["content-length"]
+            self._stream = codec.stream()
+            await self._send(start)
+            await self._send_stream_chunk(message)
+            return
+        compressed = self._compress_body(
+            codec,
+            body,
+            start["status"],
+            headers.get("etag"),
+        )
+        headers["Content-Length"] = str(len(compressed))
+        await self._send(start)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    def _is_small(
+        self,
+        headers: Headers,
+        body: bytes,
+        more_body: bool,
+    ) -> bool:
+        """Тело меньше порога; у потока порог сверяется с Content-Length."""
+        min_size = self._middleware.min_size
+        if not more_body:
+            return len(body) < min_size
+        length = headers.get("content-length")
+        return length is not None and int(length) < min_size
+
+    def _compress_body(
+        self,
+        codec: Codec,
+        body: bytes,
+        status: int,
+        etag: str | None,
+    ) -> bytes:
+        """Сжимает тело целиком или берет его из кэша по ETag."""
+        cache = self._middleware.cache
+        key = None
+        if cache is not None and etag is not None and status == 200:
+            # ETag здесь уже слабый, в ключ идет исходное значение.
+            key = (self._scope["path"], etag.removeprefix("W/"), codec.name)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        started = time.perf_counter()
+        cpu_started = time.thread_time()
+        compressed = codec.compress(body)
+        cpu_seconds = time.thread_time() - cpu_started
+        record_phase(COMPRESS_PHASE, time.perf_counter() - started)
+        _observe(codec.name, len(body), len(compressed), cpu_seconds)
+        if key is not None and cache is not None:
+            cache.set(key, compressed)
+        return compressed
+
+    async def _send_stream_chunk(self, message: Message) -> None:
+        """Сжимает очередную часть потокового ответа."""
+        stream = self._stream
+        assert stream is not None
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        started = time.perf_counter()
+        cpu_started = time.thread_time()
+        compressed = stream.compress(body) if body else b""
+        if not more_body:
+            compressed += stream.finish()
+        self._cpu_seconds += time.thread_time() - cpu_started
+        record_phase(COMPRESS_PHASE, time.perf_counter() - started)
+        self._original += len(body)
+        self._compressed += len(compressed)
+        if not more_body:
+            assert self._encoding is not None
+            _observe(
+                self._encoding,
+                self._original,
+                self._compressed,
+                self._cpu_seconds,
+            )
+        await self._send(
+            {
+                "type": "http.response.body",
+                "body": compressed,
+                "more_body": more_body,
+            }
+        )
+
+
+class CompressionMiddleware:
+    """Сжимает ответы в кодировке, которую принимает клиент."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: Sequence[str] = ("gzip",),
+        min_size: int = DEFAULT_MIN_SIZE,
+        cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ) -> None:
+        """Оборачивает app; cache_max_bytes=0 выключает кэш."""
+        self.app = app
+        self.encodings = tuple(name for name in encodings if name in CODECS)
+        self.min_size = min_size
+        self.cache = (
+            CompressedBodyCache(cache_max_bytes)
+            if cache_max_bytes > 0
+            else None
+        )
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """Передает запрос дальше со сжимающей оберткой send."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding"),
+            self.encodings,
+        )
+        responder = _CompressionResponder(self, scope, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+def get_compression_options() -> dict[str, Any] | None:
+    """Параметры CompressionMiddleware из окружения; None - без сжатия.
+
+    COMPRESSION_ENCODINGS - кодировки в порядке предпочтения (пустая
+    строка выключает сжатие), недоступные в окружении пропускаются.
+    """
+    names = os.getenv("COMPRESSION_ENCODINGS", DEFAULT_ENCODINGS)
+    encodings = tuple(
+        name
+        for name in (item.strip().lower() for item in names.split(","))
+        if name in CODECS
+    )
+    if not encodings:
+        return None
+    return {
+        "encodings": encodings,
+        "min_size": int(
+            os.getenv("COMPRESSION_MIN_SIZE", DEFAULT_MIN_SIZE)
+        ),
+        "cache_max_bytes": int(
+            os.getenv(
+                "COMPRESSION_CACHE_MAX_BYTES",
+                DEFAULT_CACHE_MAX_BYTES,
+            )
+        ),
+    }
@@ -0,0 +1,22 @@
+"""Контекст текущего запроса, доступный всем слоям сервиса."""
+from contextvars import ContextVar, Token
+
+_current_request_id: ContextVar[str | None] = ContextVar(
+    "request_id",
+    default=None,
+)
+
+
+def get_request_id() -> str | None:
+    """Возвращает идентификатор текущего запроса, если он есть."""
+    return _current_request_id.get()
+
+
+def set_request_id(request_id: str | None) -> Token[str | None]:
+    """Выставляет идентификатор запроса; возвращает токен для сброса."""
+    return _current_request_id.set(request_id)
+
+
+def reset_request_id(token: Token[str | None]) -> None:
+    """Возвращает идентификатор, бывший до set_request_id."""
+    _current_request_id.reset(token)
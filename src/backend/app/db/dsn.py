@@ -0,0 +1,46 @@
+"""Строки подключения к БД из окружения.
+
+Модуль не импортирует SQLAlchemy, чтобы проверка миграций при старте
+пода (app.db.migrate) не платила за импорт ORM.
+"""
+import os
+
+
+def get_database_url() -> str:
+    """Возвращает DSN для подключения к БД."""
+    dsn = os.getenv("DATABASE_URL")
+    if dsn:
+        return dsn
+
+    user = os.getenv("POSTGRES_USER")
+    password = os.getenv("POSTGRES_PASSWORD")
+    database = os.getenv("POSTGRES_DB")
+    host = os.getenv("POSTGRES_HOST", "localhost")
+    port = os.getenv("POSTGRES_PORT", "5432")
+
+    if user and password and database:
+        return (
+            f"postgresql+asyncpg://{user}:{password}@{host}:{port}/{database}"
+        )
+
+    raise RuntimeError("DATABASE_URL (or POSTGRES_* vars) is not set")
+
+
+def get_read_database_url() -> str | None:
+    """Возвращает DSN реплики для чтения или None, если она не задана."""
+    return os.getenv("DATABASE_READ_URL") or None
+
+
+def get_asyncpg_dsn() -> str:
+    """Возвращает DSN для прямого подключения через asyncpg.
+
+    DATABASE_DIRECT_URL задает подключение в обход PgBouncer: LISTEN
+    и advisory-блокировки не работают через пулер в
+    transaction-режиме. Драйвер из схемы (postgresql+asyncpg)
+    отбрасывается.
+    """
+    dsn = os.getenv("DATABASE_DIRECT_URL") or get_database_url()
+    scheme, separator, rest = dsn.partition("://")
+    if not separator:
+        raise RuntimeError(f"Invalid database URL scheme: {scheme!r}")
+    return f"postgresql://{rest}"
@@ -0,0 +1,148 @@
+"""Применяет миграции при старте пода, если схема отстает.
+
+Запуск: python -m app.db.migrate
+
+Быстрый путь - один запрос к alembic_version: если в БД уже head из
+образа, Alembic не импортируется и не запускается. Иначе под берет
+advisory-блокировку, чтобы миграции выполняла одна реплика, а
+остальные дождались ее и увидели актуальную версию.
+"""
+import ast
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+import asyncpg
+
+from app.db.dsn import get_asyncpg_dsn
+
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+VERSIONS_DIR = MIGRATIONS_DIR / "versions"
+ALEMBIC_INI = BACKEND_ROOT / "alembic.ini"
+# Ключ pg_advisory_lock, общий для всех реплик сервиса.
+MIGRATION_LOCK_KEY = 7_315_420_001
+DEFAULT_LOCK_TIMEOUT_SECONDS = 600.0
+CURRENT_VERSION_QUERY = "SELECT version_num FROM alembic_version"
+
+
+def _module_revisions(path: Path) -> tuple[str, tuple[str, ...]]:
+    """Читает revision и down_revision из файла миграции без импорта."""
+    values: dict[str, Any] = {}
+    for node in ast.parse(path.read_text()).body:
+        targets: list[ast.expr]
+        value: ast.expr
+        if isinstance(node, ast.Assign):
+            targets, value = node.targets, node.value
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets, value = [node.target], node.value
+        else:
+            continue
+        for target in targets:
+            if (
+                isinstance(target, ast.Name)
+                and target.id in ("revision", "down_revision")
+            ):
+                values[target.id] = ast.literal_eval(value)
+    revision = values.get("revision")
+    if not isinstance(revision, str):
+        raise RuntimeError(f"Migration {path.name} has no revision")
+    down = values.get("down_revision")
+    if down is None:
+        down_revisions: tuple[str, ...] = ()
+    elif isinstance(down, str):
+        down_revisions = (down,)
+    else:
+        down_revisions = tuple(down)
+    return revision, down_revisions
+
+
+def get_packaged_heads(versions_dir: Path = VERSIONS_DIR) -> frozenset[str]:
+    """Возвращает head-ревизии миграций, лежащих в образе.
+
+    Head - ревизия, на которую не ссылается ни один down_revision.
+    """
+    revisions: set[str] = set()
+    parents: set[str] = set()
+    for path in versions_dir.glob("*.py"):
+        revision, down_revisions = _module_revisions(path)
+        revisions.add(revision)
+        parents.update(down_revisions)
+    return frozenset(revisions - parents)
+
+
+async def get_current_revisions(
+    connection: asyncpg.Connection,
+) -> frozenset[str]:
+    """Возвращает ревизии из alembic_version; пусто для новой БД."""
+    try:
+        rows = await connection.fetch(CURRENT_VERSION_QUERY)
+    except asyncpg.UndefinedTableError:
+        return frozenset()
+    return frozenset(row["version_num"] for row in rows)
+
+
+def run_alembic_upgrade() -> None:
+    """Выполняет alembic upgrade head."""
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    command.upgrade(config, "head")
+
+
+async def migrate(dsn: str, heads: frozenset[str]) -> bool:
+    """Доводит схему до heads и возвращает True, если миграции шли.
+
+    Блокировка ждет не дольше MIGRATION_LOCK_TIMEOUT_SECONDS, после
+    этого старт пода падает и Kubernetes перезапустит его.
+    """
+    connection = await asyncpg.connect(dsn)
+    try:
+        if await get_current_revisions(connection) == heads:
+            return False
+        lock_timeout = float(
+            os.getenv(
+                "MIGRATION_LOCK_TIMEOUT_SECONDS",
+                DEFAULT_LOCK_TIMEOUT_SECONDS,
+            )
+        )
+        await connection.execute(
+            f"SET lock_timeout = {int(lock_timeout * 1000)}"
+        )
+        await connection.execute(
+            "SELECT pg_advisory_lock($1)",
+            MIGRATION_LOCK_KEY,
+        )
+        try:
+            if await get_current_revisions(connection) == heads:
+                return False
+            await asyncio.to_thread(run_alembic_upgrade)
+            return True
+        finally:
+            await connection.execute(
+                "SELECT pg_advisory_unlock($1)",
+                MIGRATION_LOCK_KEY,
+            )
+    finally:
+        await connection.close()
+
+
+async def main() -> None:
+    """Точка входа проверки миграций."""
+    started = time.perf_counter()
+    heads = get_packaged_heads()
+    migrated = await migrate(get_asyncpg_dsn(), heads)
+    elapsed = time.perf_counter() - started
+    state = "migrated to" if migrated else "already at"
+    print(
+        f"Database schema {state} {', '.join(sorted(heads))} "
+        f"in {elapsed:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
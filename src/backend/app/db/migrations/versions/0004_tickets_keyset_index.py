@@ -0,0 +1,39 @@
+"""add keyset pagination index
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Добавляет индекс для курсорной пагинации по (created_at, id).
+
+    Индекс строится CONCURRENTLY вне транзакции миграции, чтобы не
+    блокировать запись в tickets на время построения.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tickets_created_at_id",
+            "tickets",
+            [sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Удаляет индекс курсорной пагинации."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tickets_created_at_id",
+            table_name="tickets",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,67 @@
+"""add ticket filter indexes
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+OPEN_TICKETS_PREDICATE = sa.text("status IN ('new', 'in_progress')")
+
+
+INDEXES: tuple[
+    tuple[str, Sequence[str | sa.TextClause], sa.TextClause | None], ...
+] = (
+    (
+        "ix_tickets_open_created_at_id",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+        OPEN_TICKETS_PREDICATE,
+    ),
+    (
+        "ix_tickets_open_priority_created_at_id",
+        ["priority", sa.text("created_at DESC"), sa.text("id DESC")],
+        OPEN_TICKETS_PREDICATE,
+    ),
+    (
+        "ix_tickets_status_created_at_id",
+        ["status", sa.text("created_at DESC"), sa.text("id DESC")],
+        None,
+    ),
+)
+
+
+def upgrade() -> None:
+    """Добавляет индексы под фильтры списка тикетов.
+
+    Индексы строятся CONCURRENTLY вне транзакции миграции, чтобы запись
+    в tickets не ждала построения.
+    """
+    with op.get_context().autocommit_block():
+        for name, columns, predicate in INDEXES:
+            op.create_index(
+                name,
+                "tickets",
+                columns,
+                postgresql_where=predicate,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Удаляет индексы фильтров списка тикетов."""
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name="tickets",
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,56 @@
+"""add ticket full-text search
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('simple'::regconfig, title), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, description), 'B')"
+)
+
+
+def upgrade() -> None:
+    """Добавляет индексы полнотекстового и нечеткого поиска.
+
+    tsvector не хранится в таблице: GIN-индекс строится по выражению,
+    так что миграции не нужно переписывать все строки tickets. Индексы
+    строятся CONCURRENTLY вне транзакции миграции.
+    """
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tickets_search_vector",
+            "tickets",
+            [sa.text(f"({SEARCH_VECTOR_EXPRESSION})")],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tickets_title_trgm",
+            "tickets",
+            ["title"],
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Удаляет индексы поиска по тикетам."""
+    with op.get_context().autocommit_block():
+        for name in ("ix_tickets_title_trgm", "ix_tickets_search_vector"):
+            op.drop_index(
+                name,
+                table_name="tickets",
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,71 @@
+"""notify ticket changes
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+MAX_NOTIFIED_IDS = 500
+
+
+def upgrade() -> None:
+    """Добавляет NOTIFY ticket_changes на UPDATE и DELETE тикетов.
+
+    Триггер срабатывает один раз на выражение и отправляет id через
+    запятую. Если строк больше MAX_NOTIFIED_IDS, отправляется "*",
+    чтобы не упереться в лимит размера payload (8000 байт).
+    """
+    op.execute(
+        f"""
+        CREATE FUNCTION notify_ticket_changes() RETURNS trigger AS $$
+        DECLARE
+            changed_count bigint;
+            payload text;
+        BEGIN
+            SELECT count(*), string_agg(id::text, ',')
+            INTO changed_count, payload
+            FROM (
+                SELECT id FROM changed_rows LIMIT {MAX_NOTIFIED_IDS + 1}
+            ) AS limited;
+            IF changed_count = 0 THEN
+                RETURN NULL;
+            END IF;
+            IF changed_count > {MAX_NOTIFIED_IDS} THEN
+                payload := '*';
+            END IF;
+            PERFORM pg_notify('ticket_changes', payload);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tickets_notify_update
+        AFTER UPDATE ON tickets
+        REFERENCING OLD TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_ticket_changes()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tickets_notify_delete
+        AFTER DELETE ON tickets
+        REFERENCING OLD TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_ticket_changes()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Удаляет уведомления об изменениях тикетов."""
+    op.execute("DROP TRIGGER tickets_notify_delete ON tickets")
+    op.execute("DROP TRIGGER tickets_notify_update ON tickets")
+    op.execute("DROP FUNCTION notify_ticket_changes()")
@@ -0,0 +1,46 @@
+"""maintain ticket updated_at in the database
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Выставляет updated_at тикета триггером на каждый UPDATE.
+
+    ETag тикета и версия списков строятся по updated_at, поэтому он
+    должен меняться и при изменениях в обход API. clock_timestamp(), а
+    не now(): время начала долгой транзакции может оказаться меньше
+    уже записанного max(updated_at).
+    """
+    op.execute(
+        """
+        CREATE FUNCTION set_ticket_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at = clock_timestamp();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tickets_set_updated_at
+        BEFORE UPDATE ON tickets
+        FOR EACH ROW EXECUTE FUNCTION set_ticket_updated_at()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Удаляет триггер updated_at."""
+    op.execute("DROP TRIGGER tickets_set_updated_at ON tickets")
+    op.execute("DROP FUNCTION set_ticket_updated_at()")
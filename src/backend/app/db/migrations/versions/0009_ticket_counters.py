@@ -0,0 +1,130 @@
+"""add ticket counters
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+APPLY_DELTAS = """
+    INSERT INTO ticket_counters (status, priority, count)
+    SELECT status, priority, sum(delta)
+    FROM ({deltas}) AS deltas
+    GROUP BY status, priority
+    HAVING sum(delta) <> 0
+    ORDER BY status, priority
+    ON CONFLICT (status, priority)
+    DO UPDATE SET count = ticket_counters.count + EXCLUDED.count
+"""
+NEW_ROWS = "SELECT status, priority, 1 AS delta FROM new_rows"
+OLD_ROWS = "SELECT status, priority, -1 AS delta FROM old_rows"
+
+COUNTER_FUNCTIONS = {
+    "ticket_counters_on_insert": APPLY_DELTAS.format(deltas=NEW_ROWS),
+    "ticket_counters_on_update": APPLY_DELTAS.format(
+        deltas=f"{NEW_ROWS} UNION ALL {OLD_ROWS}"
+    ),
+    "ticket_counters_on_delete": APPLY_DELTAS.format(deltas=OLD_ROWS),
+}
+COUNTER_TRIGGERS = (
+    ("ticket_counters_insert", "INSERT", "NEW TABLE AS new_rows",
+     "ticket_counters_on_insert"),
+    ("ticket_counters_update", "UPDATE",
+     "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+     "ticket_counters_on_update"),
+    ("ticket_counters_delete", "DELETE", "OLD TABLE AS old_rows",
+     "ticket_counters_on_delete"),
+)
+
+
+def upgrade() -> None:
+    """Добавляет счетчики тикетов по статусу и приоритету.
+
+    Счетчики обновляются триггерами уровня выражения: одна пачка
+    изменений дает по одному UPSERT на каждую затронутую пару.
+    ORDER BY фиксирует порядок блокировок строк и исключает дедлоки
+    между параллельными транзакциями.
+    """
+    op.create_table(
+        "ticket_counters",
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="ticket_status", create_type=False),
+            primary_key=True,
+        ),
+        sa.Column(
+            "priority",
+            postgresql.ENUM(name="ticket_priority", create_type=False),
+            primary_key=True,
+        ),
+        sa.Column(
+            "count",
+            sa.BigInteger(),
+            nullable=False,
+            server_default="0",
+        ),
+    )
+    for name, body in COUNTER_FUNCTIONS.items():
+        op.execute(
+            f"""
+            CREATE FUNCTION {name}() RETURNS trigger AS $$
+            BEGIN
+                {body};
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        )
+    for trigger, event, referencing, function in COUNTER_TRIGGERS:
+        op.execute(
+            f"""
+            CREATE TRIGGER {trigger}
+            AFTER {event} ON tickets
+            REFERENCING {referencing}
+            FOR EACH STATEMENT EXECUTE FUNCTION {function}()
+            """
+        )
+    op.execute(
+        """
+        CREATE FUNCTION ticket_counters_on_truncate() RETURNS trigger AS $$
+        BEGIN
+            DELETE FROM ticket_counters;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER ticket_counters_truncate
+        AFTER TRUNCATE ON tickets
+        FOR EACH STATEMENT EXECUTE FUNCTION ticket_counters_on_truncate()
+        """
+    )
+    op.execute("LOCK TABLE tickets IN SHARE MODE")
+    op.execute(
+        """
+        INSERT INTO ticket_counters (status, priority, count)
+        SELECT status, priority, count(*)
+        FROM tickets
+        GROUP BY status, priority
+        """
+    )
+
+
+def downgrade() -> None:
+    """Удаляет счетчики тикетов."""
+    op.execute("DROP TRIGGER ticket_counters_truncate ON tickets")
+    op.execute("DROP FUNCTION ticket_counters_on_truncate()")
+    for trigger, _, _, function in COUNTER_TRIGGERS:
+        op.execute(f"DROP TRIGGER {trigger} ON tickets")
+        op.execute(f"DROP FUNCTION {function}()")
+    op.drop_table("ticket_counters")
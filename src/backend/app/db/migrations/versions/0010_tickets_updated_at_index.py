@@ -0,0 +1,38 @@
+"""add tickets updated_at index
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Добавляет индекс по updated_at для версии списков тикетов.
+
+    max(updated_at) читается по индексу одной строкой. Индекс строится
+    CONCURRENTLY вне транзакции миграции.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tickets_updated_at",
+            "tickets",
+            ["updated_at"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Удаляет индекс по updated_at."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tickets_updated_at",
+            table_name="tickets",
+            postgresql_concurrently=True,
+        )
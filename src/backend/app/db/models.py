@@ -1,10 +1,13 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, Enum, Integer, String, Text, func
+from sqlalchemy import (BigInteger, ColumnElement, DateTime, Enum, Index,
+                        Integer, String, Text, func, text)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
-from app.db.types import TicketPriority, TicketStatus
+from app.db.types import OPEN_TICKET_STATUSES, TicketPriority, TicketStatus
+
+SEARCH_CONFIG = "simple"
 
 
 class Ticket(Base):
@@ -31,7 +34,6 @@ class Ticket(Base):
         nullable=False,
         default=lambda: datetime.now(timezone.utc),
         server_default=func.now(),
-        onupdate=func.now(),
     )
     description: Mapped[str] = mapped_column(
         Text(),
@@ -59,3 +61,90 @@ class Ticket(Base):
         default=TicketPriority.MEDIUM,
         server_default=TicketPriority.MEDIUM.value,
     )
+
+
+class TicketCounter(Base):
+    """Число тикетов в разрезе статуса и приоритета.
+
+    Поддерживается триггерами на tickets, пересчитывается командой
+    app.db.reconcile_counters.
+    """
+    __tablename__ = "ticket_counters"
+
+    status: Mapped[TicketStatus] = mapped_column(
+        Ticket.__table__.c.status.type,
+        primary_key=True,
+    )
+    priority: Mapped[TicketPriority] = mapped_column(
+        Ticket.__table__.c.priority.type,
+        primary_key=True,
+    )
+    count: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        server_default="0",
+    )
+
+
+Index(
+    "ix_tickets_created_at_id",
+    Ticket.created_at.desc(),
+    Ticket.id.desc(),
+)
+
+_OPEN_STATUS_VALUES = ", ".join(
+    f"'{status.value}'" for status in OPEN_TICKET_STATUSES
+)
+_OPEN_TICKETS_PREDICATE = text(f"status IN ({_OPEN_STATUS_VALUES})")
+
+Index(
+    "ix_tickets_open_created_at_id",
+    Ticket.created_at.desc(),
+    Ticket.id.desc(),
+    postgresql_where=_OPEN_TICKETS_PREDICATE,
+)
+
+Index(
+    "ix_tickets_open_priority_created_at_id",
+    Ticket.priority,
+    Ticket.created_at.desc(),
+    Ticket.id.desc(),
+    postgresql_where=_OPEN_TICKETS_PREDICATE,
+)
+
+Index(
+    "ix_tickets_status_created_at_id",
+    Ticket.status,
+    Ticket.created_at.desc(),
+    Ticket.id.desc(),
+)
+
+Index("ix_tickets_updated_at", Ticket.updated_at)
+
+
+def _weighted_tsvector(column: Mapped[str], weight: str) -> ColumnElement:
+    """tsvector колонки с весом; конфигурация и вес - константы SQL."""
+    return func.setweight(
+        func.to_tsvector(text(f"'{SEARCH_CONFIG}'::regconfig"), column),
+        text(f"'{weight}'"),
+    )
+
+
+# Поисковый вектор не хранится в таблице: GIN-индекс построен по этому
+# выражению, и запросы используют его же, чтобы планировщик нашел индекс.
+TICKET_SEARCH_VECTOR = _weighted_tsvector(Ticket.title, "A").op("||")(
+    _weighted_tsvector(Ticket.description, "B")
+)
+
+Index(
+    "ix_tickets_search_vector",
+    TICKET_SEARCH_VECTOR,
+    postgresql_using="gin",
+)
+
+Index(
+    "ix_tickets_title_trgm",
+    Ticket.title,
+    postgresql_using="gin",
+    postgresql_ops={"title": "gin_trgm_ops"},
+)
@@ -0,0 +1,150 @@
+import os
+import time
+import uuid
+from typing import Any
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import exc
+from sqlalchemy.pool import (AsyncAdaptedQueuePool, ConnectionPoolEntry,
+                             PoolProxiedConnection)
+
+from app.timing import record_phase
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+DEFAULT_POOL_TIMEOUT_SECONDS = 30.0
+DEFAULT_POOL_RECYCLE_SECONDS = 1800
+DEFAULT_POOL_NAME = "primary"
+CHECKOUT_PHASE = "db_checkout"
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured number of persistent connections in the pool.",
+    labelnames=("pool",),
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the pool.",
+    labelnames=("pool",),
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Connections opened above the pool size.",
+    labelnames=("pool",),
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent acquiring a connection from the pool.",
+    labelnames=("pool",),
+    buckets=(
+        0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+        1.0, 2.5, 5.0, 10.0, 30.0,
+    ),
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that failed because the pool was exhausted.",
+    labelnames=("pool",),
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Пул соединений, который публикует свое состояние в Prometheus.
+
+    Метка pool берется из logging_name пула, оно же переживает
+    пересоздание пула после dispose().
+    """
+
+    @property
+    def metrics_name(self) -> str:
+        """Значение метки pool для метрик этого пула."""
+        return self._orig_logging_name or DEFAULT_POOL_NAME
+
+    def connect(self) -> PoolProxiedConnection:
+        """Выдает соединение и учитывает время ожидания.
+
+        Время включает ожидание свободного соединения, открытие
+        overflow-соединения и pre-ping, если он включен.
+        """
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.labels(pool=self.metrics_name).inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            DB_POOL_CHECKOUT_SECONDS.labels(pool=self.metrics_name).observe(
+                elapsed
+            )
+            record_phase(CHECKOUT_PHASE, elapsed)
+            self._publish_state()
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        """Возвращает соединение в пул и обновляет метрики."""
+        super()._do_return_conn(record)
+        self._publish_state()
+
+    def _publish_state(self) -> None:
+        """Обновляет гейджи размера, занятых и overflow-соединений."""
+        name = self.metrics_name
+        DB_POOL_SIZE.labels(pool=name).set(self.size())
+        DB_POOL_CHECKED_OUT.labels(pool=name).set(self.checkedout())
+        DB_POOL_OVERFLOW.labels(pool=name).set(max(self.overflow(), 0))
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    """Читает булев флаг из переменной окружения."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _unique_statement_name() -> str:
+    """Имя подготовленного выражения, уникальное для всех соединений.
+
+    За PgBouncer в transaction-режиме серверное соединение делят
+    клиенты, поэтому имена вида __asyncpg_stmt_1__ конфликтуют.
+    """
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def get_engine_options(pool_name: str) -> dict[str, Any]:
+    """Собирает параметры create_async_engine из окружения.
+
+    DATABASE_POOL_* задают размер, overflow, таймаут, recycle и
+    pre-ping пула. Pre-ping по умолчанию выключен: он добавляет запрос
+    к БД на каждую выдачу соединения, а устаревшие соединения закрывает
+    pool_recycle, оборванные пул отбрасывает при ошибке disconnect.
+    DATABASE_PGBOUNCER=1 включает режим для PgBouncer
+    в transaction-режиме: кэши подготовленных выражений asyncpg
+    выключаются.
+    """
+    options: dict[str, Any] = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_logging_name": pool_name,
+        "pool_size": int(
+            os.getenv("DATABASE_POOL_SIZE", DEFAULT_POOL_SIZE)
+        ),
+        "max_overflow": int(
+            os.getenv("DATABASE_MAX_OVERFLOW", DEFAULT_MAX_OVERFLOW)
+        ),
+        "pool_timeout": float(
+            os.getenv("DATABASE_POOL_TIMEOUT", DEFAULT_POOL_TIMEOUT_SECONDS)
+        ),
+        "pool_recycle": int(
+            os.getenv("DATABASE_POOL_RECYCLE", DEFAULT_POOL_RECYCLE_SECONDS)
+        ),
+        "pool_pre_ping": _env_flag("DATABASE_POOL_PRE_PING", False),
+    }
+    if _env_flag("DATABASE_PGBOUNCER", False):
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _unique_statement_name,
+        }
+    return options
@@ -0,0 +1,52 @@
+"""Пересчитывает ticket_counters по таблице tickets.
+
+Запуск: python -m app.db.reconcile_counters
+"""
+
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_engine, get_session_factory
+
+RECONCILE_STATEMENTS = (
+    "LOCK TABLE tickets IN SHARE MODE",
+    "DELETE FROM ticket_counters",
+    """
+    INSERT INTO ticket_counters (status, priority, count)
+    SELECT status, priority, count(*)
+    FROM tickets
+    GROUP BY status, priority
+    """,
+)
+
+
+async def reconcile_ticket_counters(session: AsyncSession) -> int:
+    """Пересобирает счетчики с нуля и возвращает число тикетов.
+
+    SHARE-блокировка tickets не дает записям изменить таблицу, пока
+    идет пересчет, поэтому результат точный на момент коммита.
+    """
+    for statement in RECONCILE_STATEMENTS:
+        await session.execute(text(statement))
+    result = await session.execute(
+        text("SELECT coalesce(sum(count), 0) FROM ticket_counters")
+    )
+    total = int(result.scalar_one())
+    await session.commit()
+    return total
+
+
+async def main() -> None:
+    """Точка входа команды пересчета."""
+    try:
+        async with get_session_factory()() as session:
+            total = await reconcile_ticket_counters(session)
+        print(f"Ticket counters reconciled: {total} tickets")
+    finally:
+        await get_engine().dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,132 @@
+import logging
+import math
+import os
+import time
+from collections.abc import Callable
+
+from prometheus_client import Counter, Gauge
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+READ_PRIMARY_COOKIE = "db_read_primary"
+DEFAULT_MAX_LAG_SECONDS = 5.0
+DEFAULT_CHECK_INTERVAL_SECONDS = 1.0
+DEFAULT_STICKY_SECONDS = 5
+
+# Реплика, которая проиграла весь полученный WAL, не отстает, даже если
+# последняя транзакция была давно: иначе простаивающий primary выглядел
+# бы как растущее отставание. Это верно, только пока WAL-приемник
+# стримит с primary: после обрыва receive LSN застывает, и равенство
+# LSN ничего не говорит. Такая реплика дает NULL и считается отставшей.
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE"
+    " WHEN NOT EXISTS ("
+    "SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming'"
+    ") THEN NULL"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE("
+    "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+DB_READ_ROUTES = Counter(
+    "db_read_routes_total",
+    "Read sessions by the database they were routed to.",
+    labelnames=("target", "reason"),
+)
+DB_REPLICA_LAG = Gauge(
+    "db_replica_lag_seconds",
+    "Replication lag of the read replica at the last check.",
+    multiprocess_mode="livemax",
+)
+
+
+class ReplicaMonitor:
+    """Следит за доступностью и отставанием реплики.
+
+    Проверка выполняется не чаще раза в check_interval секунд, между
+    проверками используется последний результат.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        max_lag: float = DEFAULT_MAX_LAG_SECONDS,
+        check_interval: float = DEFAULT_CHECK_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Создает монитор для движка реплики."""
+        self._engine = engine
+        self._max_lag = max_lag
+        self._check_interval = check_interval
+        self._clock = clock
+        self._checked_at: float | None = None
+        self._usable = False
+
+    async def is_usable(self) -> bool:
+        """Возвращает True, если реплика доступна и отстает не сильно."""
+        now = self._clock()
+        if (
+            self._checked_at is not None
+            and now - self._checked_at < self._check_interval
+        ):
+            return self._usable
+        # Отметка ставится до запроса, чтобы параллельные запросы не
+        # проверяли реплику одновременно, а брали прошлый результат.
+        self._checked_at = now
+        self._usable = await self._check()
+        return self._usable
+
+    async def _check(self) -> bool:
+        """Запрашивает отставание реплики."""
+        try:
+            async with self._engine.connect() as connection:
+                lag = await connection.scalar(REPLICA_LAG_QUERY)
+        except (OSError, SQLAlchemyError) as exc:
+            logger.warning("Read replica is unavailable: %s", exc)
+            return False
+        if lag is None:
+            DB_REPLICA_LAG.set(math.inf)
+            logger.warning("Read replica is not streaming WAL")
+            return False
+        lag = float(lag)
+        DB_REPLICA_LAG.set(lag)
+        if lag > self._max_lag:
+            logger.warning("Read replica lags by %.1f seconds", lag)
+            return False
+        return True
+
+
+_replica_monitor: ReplicaMonitor | None = None
+
+
+def get_replica_monitor(engine: AsyncEngine) -> ReplicaMonitor:
+    """Возвращает singleton-монитор реплики."""
+    global _replica_monitor
+    if _replica_monitor is None:
+        _replica_monitor = ReplicaMonitor(
+            engine,
+            max_lag=float(
+                os.getenv(
+                    "DATABASE_READ_MAX_LAG_SECONDS",
+                    DEFAULT_MAX_LAG_SECONDS,
+                )
+            ),
+            check_interval=float(
+                os.getenv(
+                    "DATABASE_READ_CHECK_INTERVAL_SECONDS",
+                    DEFAULT_CHECK_INTERVAL_SECONDS,
+                )
+            ),
+        )
+    return _replica_monitor
+
+
+def get_sticky_seconds() -> int:
+    """Сколько секунд после записи клиент читает с primary."""
+    return int(
+        os.getenv("DATABASE_READ_STICKY_SECONDS", DEFAULT_STICKY_SECONDS)
+    )
@@ -0,0 +1,61 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from prometheus_client import Histogram
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+ROUND_TRIP_EVENTS = ("begin", "before_cursor_execute", "commit", "rollback")
+
+DB_ROUND_TRIPS = Histogram(
+    "db_round_trips_per_request",
+    "Number of database round trips made while handling a request.",
+    labelnames=("method", "handler"),
+    buckets=(0, 1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 50),
+)
+
+
+class RoundTripCounter:
+    """Счетчик обращений к БД в рамках одного запроса."""
+
+    __slots__ = ("count",)
+
+    def __init__(self) -> None:
+        """Создает счетчик с нулевым значением."""
+        self.count = 0
+
+
+_current_counter: ContextVar[RoundTripCounter | None] = ContextVar(
+    "db_round_trip_counter",
+    default=None,
+)
+
+
+@contextmanager
+def count_round_trips() -> Iterator[RoundTripCounter]:
+    """Считает обращения к БД, сделанные внутри блока."""
+    counter = RoundTripCounter()
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+
+def _increment(*_: Any, **__: Any) -> None:
+    """Увеличивает счетчик текущего запроса, если он есть."""
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.count += 1
+
+
+def install_round_trip_counter(engine: AsyncEngine) -> None:
+    """Подписывает счетчик на события движка.
+
+    Считаются BEGIN, каждый отправленный в курсор запрос, COMMIT и
+    ROLLBACK: каждое из них - отдельный сетевой обмен с Postgres.
+    """
+    for name in ROUND_TRIP_EVENTS:
+        event.listen(engine.sync_engine, name, _increment)
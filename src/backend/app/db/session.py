@@ -1,39 +1,35 @@
-import os
 from collections.abc import AsyncIterator
 
+from fastapi import Request
 from sqlalchemy.ext.asyncio import (AsyncEngine, AsyncSession,
                                     async_sessionmaker, create_async_engine)
 
+from app.db.dsn import get_database_url, get_read_database_url
+from app.db.pool import get_engine_options
+from app.db.replica import (DB_READ_ROUTES, READ_PRIMARY_COOKIE,
+                            get_replica_monitor)
+from app.db.round_trips import install_round_trip_counter
+from app.db.statements import install_statement_metrics
 
-def _get_database_url() -> str:
-    """Возвращает DSN для подключения к БД."""
-    dsn = os.getenv("DATABASE_URL")
-    if dsn:
-        return dsn
-
-    user = os.getenv("POSTGRES_USER")
-    password = os.getenv("POSTGRES_PASSWORD")
-    database = os.getenv("POSTGRES_DB")
-    host = os.getenv("POSTGRES_HOST", "localhost")
-    port = os.getenv("POSTGRES_PORT", "5432")
-
-    if user and password and database:
-        return (
-            f"postgresql+asyncpg://{user}:{password}@{host}:{port}/{database}"
-        )
-
-    raise RuntimeError("DATABASE_URL (or POSTGRES_* vars) is not set")
+REPLICA_SESSION_INFO_KEY = "replica"
 
 
 _engine: AsyncEngine | None = None
 _session_factory: async_sessionmaker[AsyncSession] | None = None
+_read_engine: AsyncEngine | None = None
+_read_session_factory: async_sessionmaker[AsyncSession] | None = None
 
 
 def get_engine() -> AsyncEngine:
     """Возвращает singleton-движок БД."""
     global _engine
     if _engine is None:
-        _engine = create_async_engine(_get_database_url(), pool_pre_ping=True)
+        _engine = create_async_engine(
+            get_database_url(),
+            **get_engine_options("primary"),
+        )
+        install_round_trip_counter(_engine)
+        install_statement_metrics(_engine)
     return _engine
 
 
@@ -48,8 +44,67 @@ def get_session_factory() -> async_sessionmaker[AsyncSession]:
     return _session_factory
 
 
+def get_read_engine() -> AsyncEngine | None:
+    """Возвращает singleton-движок реплики или None без DATABASE_READ_URL."""
+    global _read_engine
+    if _read_engine is None:
+        url = get_read_database_url()
+        if url is None:
+            return None
+        _read_engine = create_async_engine(
+            url,
+            **get_engine_options("replica"),
+        )
+        install_round_trip_counter(_read_engine)
+        install_statement_metrics(_read_engine)
+    return _read_engine
+
+
+def get_read_session_factory() -> async_sessionmaker[AsyncSession] | None:
+    """Возвращает фабрику сессий реплики или None, если ее нет."""
+    global _read_session_factory
+    if _read_session_factory is None:
+        read_engine = get_read_engine()
+        if read_engine is None:
+            return None
+        _read_session_factory = async_sessionmaker(
+            read_engine,
+            expire_on_commit=False,
+        )
+    return _read_session_factory
+
+
 async def get_session() -> AsyncIterator[AsyncSession]:
     """Создает сессию БД для запроса."""
     session_factory = get_session_factory()
     async with session_factory() as session:
         yield session
+
+
+async def get_read_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """Создает сессию для чтения: с реплики, если ей можно доверять.
+
+    Запрос уходит на primary, если реплика не настроена, клиент
+    недавно писал (cookie READ_PRIMARY_COOKIE) или реплика недоступна
+    либо отстает. Сессия реплики помечается в session.info.
+    """
+    session_factory = get_session_factory()
+    replica = False
+    read_engine = get_read_engine()
+    if read_engine is None:
+        reason = "not_configured"
+    elif request.cookies.get(READ_PRIMARY_COOKIE):
+        reason = "recent_write"
+    elif not await get_replica_monitor(read_engine).is_usable():
+        reason = "replica_unhealthy"
+    else:
+        reason = "replica_ok"
+        replica = True
+        session_factory = get_read_session_factory() or session_factory
+    DB_READ_ROUTES.labels(
+        target="replica" if replica else "primary",
+        reason=reason,
+    ).inc()
+    async with session_factory() as session:
+        session.info[REPLICA_SESSION_INFO_KEY] = replica
+        yield session
@@ -0,0 +1,237 @@
+import functools
+import hashlib
+import logging
+import os
+import random
+import re
+import time
+from collections.abc import Callable
+from typing import Any
+
+from prometheus_client import Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExceptionContext, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.context import get_request_id
+from app.timing import record_phase
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOW_QUERY_MS = 500.0
+DEFAULT_EXPLAIN_SAMPLE_RATE = 0.0
+STATEMENT_STARTED_KEY = "statement_started_at"
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS, FORMAT TEXT) "
+EXPLAIN_SAVEPOINT = "statement_explain"
+STATEMENT_PHASE = "db"
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_OR_PLACEHOLDER = re.compile(r"\$\d+|(?<![\w$])\d+(?:\.\d+)?")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_ROW_GROUPS = re.compile(r"\(\s*\?[^()]*\)(?:\s*,\s*\(\s*\?[^()]*\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+DB_STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "Database statement execution time by normalized statement.",
+    labelnames=("fingerprint", "operation"),
+    buckets=(
+        0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+        1.0, 2.5, 5.0, 10.0,
+    ),
+)
+DB_STATEMENT_ROWS = Histogram(
+    "db_statement_rows",
+    "Rows returned or affected by a statement.",
+    labelnames=("fingerprint", "operation"),
+    buckets=(0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000),
+)
+
+
+def normalize_statement(statement: str) -> str:
+    """Приводит SQL к виду без литералов и параметров.
+
+    Списки IN и группы VALUES разной длины сворачиваются, чтобы
+    запросы с разным числом значений давали один отпечаток.
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_OR_PLACEHOLDER.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (...)", normalized)
+    normalized = _ROW_GROUPS.sub("(...), ...", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+@functools.lru_cache(maxsize=1024)
+def fingerprint_statement(statement: str) -> tuple[str, str, str]:
+    """Возвращает отпечаток, операцию и нормализованный текст запроса."""
+    normalized = normalize_statement(statement)
+    fingerprint = hashlib.blake2b(
+        normalized.encode(),
+        digest_size=8,
+    ).hexdigest()
+    operation = normalized.split(" ", 1)[0].upper() if normalized else ""
+    logger.debug("Statement %s: %s", fingerprint, normalized)
+    return fingerprint, operation, normalized
+
+
+def _before_cursor_execute(
+    conn: Connection,
+    *_: Any,
+) -> None:
+    """Запоминает время начала выполнения запроса."""
+    conn.info.setdefault(STATEMENT_STARTED_KEY, []).append(
+        time.perf_counter()
+    )
+
+
+def _should_explain(
+    context: ExecutionContext | None,
+    operation: str,
+    executemany: bool,
+) -> bool:
+    """Проверяет, что запрос можно безопасно повторить под EXPLAIN.
+
+    ANALYZE выполняет запрос заново, поэтому подходят только SELECT
+    без серверного курсора: выгрузку повторять слишком дорого.
+    """
+    if operation != "SELECT" or executemany or context is None:
+        return False
+    return not context.execution_options.get("stream_results", False)
+
+
+def _explain(
+    conn: Connection,
+    statement: str,
+    parameters: Any,
+) -> str | None:
+    """Выполняет EXPLAIN ANALYZE отдельным курсором того же соединения.
+
+    Отдельный курсор не затирает строки исходного запроса, а DBAPI
+    курсор не вызывает события движка повторно. Savepoint не дает
+    ошибке EXPLAIN оборвать транзакцию запроса. Для соединения, уже
+    отвязанного от DBAPI (инвалидированного), план не строится.
+    """
+    dbapi_connection = conn.connection.dbapi_connection
+    if dbapi_connection is None:
+        return None
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"SAVEPOINT {EXPLAIN_SAVEPOINT}")
+        try:
+            cursor.execute(EXPLAIN_PREFIX + statement, parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        except Exception:
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}")
+            raise
+        cursor.execute(f"RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}")
+        return plan
+    finally:
+        cursor.close()
+
+
+def _discard_started(context: ExceptionContext) -> None:
+    """Снимает время начала запроса, завершившегося ошибкой."""
+    conn = context.connection
+    if conn is None:
+        return
+    started = conn.info.get(STATEMENT_STARTED_KEY)
+    if started:
+        started.pop()
+
+
+def install_statement_metrics(
+    engine: AsyncEngine,
+    slow_query_ms: float | None = None,
+    explain_sample_rate: float | None = None,
+    sample: Callable[[], float] = random.random,
+) -> None:
+    """Подписывает метрики и лог медленных запросов на события движка.
+
+    Порог медленного запроса берется из DB_SLOW_QUERY_MS, доля
+    медленных SELECT, для которых снимается EXPLAIN (ANALYZE, BUFFERS),
+    - из DB_EXPLAIN_SAMPLE_RATE (по умолчанию 0, то есть выключено).
+    """
+    if slow_query_ms is None:
+        slow_query_ms = float(
+            os.getenv("DB_SLOW_QUERY_MS", DEFAULT_SLOW_QUERY_MS)
+        )
+    if explain_sample_rate is None:
+        explain_sample_rate = float(
+            os.getenv("DB_EXPLAIN_SAMPLE_RATE", DEFAULT_EXPLAIN_SAMPLE_RATE)
+        )
+
+    def _after_cursor_execute(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        started = conn.info[STATEMENT_STARTED_KEY].pop()
+        duration = time.perf_counter() - started
+        record_phase(STATEMENT_PHASE, duration)
+        fingerprint, operation, normalized = fingerprint_statement(statement)
+        DB_STATEMENT_DURATION.labels(
+            fingerprint=fingerprint,
+            operation=operation,
+        ).observe(duration)
+        if cursor.rowcount >= 0:
+            DB_STATEMENT_ROWS.labels(
+                fingerprint=fingerprint,
+                operation=operation,
+            ).observe(cursor.rowcount)
+        duration_ms = duration * 1000
+        if duration_ms < slow_query_ms:
+            return
+        plan = None
+        if (
+            explain_sample_rate > 0
+            and sample() < explain_sample_rate
+            and _should_explain(context, operation, executemany)
+        ):
+            try:
+                plan = _explain(conn, statement, parameters)
+            except Exception as exc:
+                logger.warning(
+                    "EXPLAIN failed for statement %s: %s",
+                    fingerprint,
+                    exc,
+                )
+        message = (
+            "Slow query fingerprint=%s duration_ms=%.1f rows=%d statement=%s"
+        )
+        args: list[Any] = [
+            fingerprint,
+            duration_ms,
+            cursor.rowcount,
+            normalized,
+        ]
+        if plan is not None:
+            message += "\nplan:\n%s"
+            args.append(plan)
+        logger.warning(
+            message,
+            *args,
+            extra={
+                "fingerprint": fingerprint,
+                "operation": operation,
+                "duration_ms": round(duration_ms, 1),
+                "rows": cursor.rowcount,
+                "statement": normalized,
+                "plan": plan,
+                "request_id": get_request_id(),
+            },
+        )
+
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        _before_cursor_execute,
+    )
+    event.listen(
+        engine.sync_engine,
+        "after_cursor_execute",
+        _after_cursor_execute,
+    )
+    event.listen(engine.sync_engine, "handle_error", _discard_started)
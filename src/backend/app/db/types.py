@@ -17,3 +17,6 @@ class TicketPriority(str, Enum):
     MEDIUM = "medium"
     HIGH = "high"
     CRITICAL = "critical"
+
+
+OPEN_TICKET_STATUSES = (TicketStatus.NEW, TicketStatus.IN_PROGRESS)
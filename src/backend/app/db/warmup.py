@@ -0,0 +1,285 @@
+import asyncio
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+from prometheus_client import Gauge
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from sqlalchemy.pool import QueuePool
+
+from app.db.pool import InstrumentedQueuePool
+from app.db.session import get_engine
+from app.metrics import MULTIPROC_DIR_ENV, is_multiprocess
+
+logger = logging.getLogger(__name__)
+
+READY = "ready"
+WARMING_UP = "warming_up"
+DB_UNAVAILABLE = "db_unavailable"
+DEFAULT_CHECK_INTERVAL_SECONDS = 5.0
+DEFAULT_CHECK_TIMEOUT_SECONDS = 2.0
+DEFAULT_WARMUP_RETRY_SECONDS = 2.0
+HEALTH_QUERY = text("SELECT 1")
+WARMED_WORKER_PREFIX = "warmed-worker-"
+WARMED_POD_FILE = "warmed-pod"
+
+DB_POOL_WARMUP_SECONDS = Gauge(
+    "db_pool_warmup_seconds",
+    "Time spent opening and priming pool connections at startup.",
+    labelnames=("pool",),
+    multiprocess_mode="livemax",
+)
+
+Prime = Callable[[AsyncSession], Awaitable[None]]
+
+
+class DatabaseReadiness:
+    """Готовность пода принимать трафик.
+
+    Под не готов, пока не прогрет пул. После прогрева готовность
+    определяется доступностью БД; проверка выполняется не чаще раза в
+    check_interval секунд, частые пробы kubelet получают последний
+    результат и не нагружают БД.
+
+    С shared_dir (каталог метрик воркеров app.server) пул у каждого
+    воркера свой, а /readyz попадает в случайный воркер. Прогретый
+    воркер оставляет в каталоге файл со своим pid, и под готов, когда
+    такие файлы есть у workers живых воркеров. Это отмечается файлом
+    пода, поэтому воркер, перезапущенный супервизором, не снимает под
+    с трафика на время своего прогрева.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        check_interval: float = DEFAULT_CHECK_INTERVAL_SECONDS,
+        check_timeout: float = DEFAULT_CHECK_TIMEOUT_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        shared_dir: Path | None = None,
+        workers: int = 1,
+    ) -> None:
+        """Создает проверку готовности для движка primary."""
+        self._engine = engine
+        self._check_interval = check_interval
+        self._check_timeout = check_timeout
+        self._clock = clock
+        self._shared_dir = shared_dir
+        self._workers = workers
+        self._checked_at: float | None = None
+        self._available = False
+        self._pod_warmed = False
+        self.warmed = False
+
+    def mark_warmed(self) -> None:
+        """Отмечает, что прогрев завершен.
+
+        Прогрев только что ходил в БД, поэтому он засчитывается как
+        успешная проверка.
+        """
+        self.warmed = True
+        self._checked_at = self._clock()
+        self._available = True
+        if self._shared_dir is not None:
+            path = self._shared_dir / f"{WARMED_WORKER_PREFIX}{os.getpid()}"
+            path.touch()
+
+    def mark_stopped(self) -> None:
+        """Убирает отметку о прогреве при остановке воркера."""
+        if self._shared_dir is not None:
+            path = self._shared_dir / f"{WARMED_WORKER_PREFIX}{os.getpid()}"
+            path.unlink(missing_ok=True)
+
+    def _is_pod_warmed(self) -> bool:
+        """Проверяет, прогреты ли все воркеры пода."""
+        if self._shared_dir is None:
+            return self.warmed
+        if self._pod_warmed:
+            return True
+        pod_file = self._shared_dir / WARMED_POD_FILE
+        if not pod_file.exists():
+            warmed = sum(
+                _is_alive(int(path.name.removeprefix(WARMED_WORKER_PREFIX)))
+                for path in self._shared_dir.glob(f"{WARMED_WORKER_PREFIX}*")
+            )
+            if warmed < self._workers:
+                return False
+            pod_file.touch()
+        self._pod_warmed = True
+        return True
+
+    async def state(self) -> str:
+        """Возвращает READY, WARMING_UP или DB_UNAVAILABLE."""
+        if not self._is_pod_warmed():
+            return WARMING_UP
+        now = self._clock()
+        if (
+            self._checked_at is None
+            or now - self._checked_at >= self._check_interval
+        ):
+            # Отметка ставится до запроса, как в ReplicaMonitor.
+            self._checked_at = now
+            self._available = await self._check()
+        return READY if self._available else DB_UNAVAILABLE
+
+    async def _check(self) -> bool:
+        """Выполняет SELECT 1 с таймаутом."""
+        try:
+            async with asyncio.timeout(self._check_timeout):
+                async with self._engine.connect() as connection:
+                    await connection.execute(HEALTH_QUERY)
+        except (OSError, SQLAlchemyError, TimeoutError) as exc:
+            logger.warning("Database is unavailable: %s", exc)
+            return False
+        return True
+
+
+def _is_alive(pid: int) -> bool:
+    """Проверяет, жив ли процесс: упавший воркер мог оставить файл."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+async def _prime_connection(connection: AsyncConnection, prime: Prime) -> None:
+    """Выполняет горячие запросы на соединении и откатывает транзакцию."""
+    async with AsyncSession(bind=connection) as session:
+        await prime(session)
+
+
+def _pool_size(engine: AsyncEngine) -> int:
+    """Размер пула движка; 0, если пул не держит соединения (NullPool)."""
+    pool = engine.pool
+    return pool.size() if isinstance(pool, QueuePool) else 0
+
+
+async def warm_up_pool(
+    engine: AsyncEngine,
+    connections: int,
+    prime: Prime,
+) -> None:
+    """Открывает connections соединений пула и готовит на них запросы.
+
+    Соединения открываются одновременно и держатся до конца прогрева,
+    чтобы каждое было отдельным соединением пула. Их число не больше
+    размера пула: overflow-соединения закрылись бы при возврате.
+    """
+    count = min(connections, _pool_size(engine))
+    if count <= 0:
+        return
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(engine.connect().start() for _ in range(count)),
+        return_exceptions=True,
+    )
+    opened = [
+        result for result in results if isinstance(result, AsyncConnection)
+    ]
+    try:
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        await asyncio.gather(
+            *(_prime_connection(connection, prime) for connection in opened)
+        )
+    finally:
+        for connection in opened:
+            await connection.close()
+    pool = engine.pool
+    name = (
+        pool.metrics_name
+        if isinstance(pool, InstrumentedQueuePool)
+        else "default"
+    )
+    DB_POOL_WARMUP_SECONDS.labels(pool=name).set(
+        time.perf_counter() - started
+    )
+
+
+async def run_warm_up(
+    readiness: DatabaseReadiness,
+    engine: AsyncEngine,
+    prime: Prime,
+    connections: int | None = None,
+    retry_delay: float = DEFAULT_WARMUP_RETRY_SECONDS,
+    read_engine: AsyncEngine | None = None,
+) -> None:
+    """Прогревает пулы и отмечает готовность пода.
+
+    Пул primary прогревается с повторами, пока БД недоступна. Пул
+    реплики прогревается один раз и не блокирует готовность: без
+    реплики чтения уходят на primary. connections=None открывает
+    столько соединений, сколько держит пул (DATABASE_POOL_SIZE).
+    """
+    while True:
+        try:
+            await warm_up_pool(
+                engine,
+                _pool_size(engine) if connections is None else connections,
+                prime,
+            )
+            break
+        except (OSError, SQLAlchemyError) as exc:
+            logger.warning(
+                "Pool warm-up failed, retrying in %.1fs: %s",
+                retry_delay,
+                exc,
+            )
+            await asyncio.sleep(retry_delay)
+    if read_engine is not None:
+        try:
+            await warm_up_pool(
+                read_engine,
+                _pool_size(read_engine) if connections is None
+                else connections,
+                prime,
+            )
+        except (OSError, SQLAlchemyError) as exc:
+            logger.warning("Read replica warm-up failed: %s", exc)
+    readiness.mark_warmed()
+    logger.info("Database pools are warmed up")
+
+
+def get_warmup_connections() -> int | None:
+    """Число соединений для прогрева; None - размер пула, 0 - без него."""
+    value = os.getenv("DATABASE_POOL_WARMUP_CONNECTIONS")
+    return None if value is None else int(value)
+
+
+_readiness: DatabaseReadiness | None = None
+
+
+def get_database_readiness() -> DatabaseReadiness:
+    """Возвращает singleton-проверку готовности.
+
+    Под app.server готовность общая для воркеров: их число супервизор
+    передает в WEB_CONCURRENCY.
+    """
+    global _readiness
+    if _readiness is None:
+        shared_dir = None
+        if is_multiprocess():
+            shared_dir = Path(os.environ[MULTIPROC_DIR_ENV])
+        _readiness = DatabaseReadiness(
+            get_engine(),
+            check_interval=float(
+                os.getenv(
+                    "READINESS_CHECK_INTERVAL_SECONDS",
+                    DEFAULT_CHECK_INTERVAL_SECONDS,
+                )
+            ),
+            check_timeout=float(
+                os.getenv(
+                    "READINESS_CHECK_TIMEOUT_SECONDS",
+                    DEFAULT_CHECK_TIMEOUT_SECONDS,
+                )
+            ),
+            shared_dir=shared_dir,
+            workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        )
+    return _readiness
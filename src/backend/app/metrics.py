@@ -0,0 +1,23 @@
+"""Режим multiprocess prometheus_client.
+
+Когда сервис запущен через app.server, каждый воркер пишет метрики в
+файлы каталога PROMETHEUS_MULTIPROC_DIR, а /metrics собирает их все.
+Для gauge в этом режиме задается multiprocess_mode: как сводить
+значения воркеров в одно.
+"""
+import os
+
+from prometheus_client import multiprocess
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+def is_multiprocess() -> bool:
+    """Проверяет, пишутся ли метрики в общий каталог воркеров."""
+    return bool(os.getenv(MULTIPROC_DIR_ENV))
+
+
+def mark_worker_dead() -> None:
+    """Удаляет live-gauge текущего воркера при его остановке."""
+    if is_multiprocess():
+        multiprocess.mark_process_dead(os.getpid())
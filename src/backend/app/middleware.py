@@ -0,0 +1,191 @@
+"""Middleware приложения на чистом ASGI.
+
+В отличие от @app.middleware("http") (BaseHTTPMiddleware), они не
+запускают приложение в отдельной задаче и не пропускают тело ответа
+через промежуточный поток: заголовки дописываются в сообщение
+http.response.start, а тело, в том числе потоковое, уходит клиенту
+без изменений.
+"""
+import re
+import time
+import uuid
+from typing import Any
+
+from starlette.applications import Starlette
+from starlette.datastructures import MutableHeaders
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.compression import CompressionMiddleware
+from app.context import reset_request_id, set_request_id
+from app.db.round_trips import DB_ROUND_TRIPS, count_round_trips
+from app.timing import SERVER_TIMING_HEADER, track_request_timing
+
+REQUEST_ID_HEADER = "X-Request-ID"
+REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+
+
+def _route_path(scope: Scope) -> str | None:
+    """Шаблон пути маршрута, который обработал запрос."""
+    route = scope.get("route")
+    return None if route is None else route.path
+
+
+class RootMessageMiddleware:
+    """Отвечает текстом на любой запрос к /, не доходя до роутера."""
+
+    def __init__(self, app: ASGIApp, message: str) -> None:
+        """Оборачивает app и готовит ответ для /."""
+        self.app = app
+        self.response = PlainTextResponse(message)
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """Отдает готовый ответ для / и передает остальное дальше."""
+        if scope["type"] == "http" and scope["path"] == "/":
+            await self.response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+class RoundTripMiddleware:
+    """Пишет число обращений к БД за запрос в db_round_trips_per_request.
+
+    Запросы, не дошедшие до маршрута, не учитываются.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Оборачивает app."""
+        self.app = app
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """Считает обращения к БД, пока выполняется запрос."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with count_round_trips() as counter:
+            await self.app(scope, receive, send)
+        handler = _route_path(scope)
+        if handler is not None:
+            DB_ROUND_TRIPS.labels(
+                method=scope["method"],
+                handler=handler,
+            ).observe(counter.count)
+
+
+class ServerTimingMiddleware:
+    """Добавляет заголовок Server-Timing и пишет фазы в метрики.
+
+    total - время до отправки заголовков ответа: тело потокового ответа
+    в него не входит, как и раньше.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Оборачивает app."""
+        self.app = app
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """Замеряет запрос и дописывает Server-Timing в ответ."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        total: float | None = None
+
+        with track_request_timing() as timing:
+
+            async def send_with_timing(message: Message) -> None:
+                nonlocal total
+                if message["type"] == "http.response.start":
+                    total = time.perf_counter() - started
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        SERVER_TIMING_HEADER,
+                        timing.server_timing(total),
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+        handler = _route_path(scope)
+        if handler is not None and total is not None:
+            timing.observe(handler, total)
+
+
+class RequestIdMiddleware:
+    """Присваивает запросу идентификатор и возвращает его в X-Request-ID.
+
+    Идентификатор от клиента или ingress используется, если он похож
+    на идентификатор; иначе создается новый. Внутри запроса он доступен
+    через app.context.get_request_id().
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Оборачивает app."""
+        self.app = app
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """Выставляет идентификатор запроса на время его обработки."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if request_id is None or not REQUEST_ID_PATTERN.fullmatch(
+            request_id
+        ):
+            request_id = uuid.uuid4().hex
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(REQUEST_ID_HEADER, request_id)
+            await send(message)
+
+        token = set_request_id(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            reset_request_id(token)
+
+
+def add_middleware_stack(
+    app: Starlette,
+    root_message: str,
+    compression: dict[str, Any] | None = None,
+) -> None:
+    """Подключает middleware сервиса к приложению.
+
+    Добавленный позже middleware оборачивает добавленные раньше:
+    идентификатор запроса выставляется первым, ответ на / проходит
+    через Server-Timing, но не через роутер. Сжатие стоит внутри
+    Server-Timing, чтобы его время попало в фазу compress;
+    compression - параметры CompressionMiddleware, None - без сжатия.
+    """
+    app.add_middleware(RootMessageMiddleware, message=root_message)
+    if compression is not None:
+        app.add_middleware(CompressionMiddleware, **compression)
+    app.add_middleware(RoundTripMiddleware)
+    app.add_middleware(ServerTimingMiddleware)
+    app.add_middleware(RequestIdMiddleware)
@@ -1,4 +1,5 @@
+from app.api.admin.handler import admin_router
 from app.api.healthz.handler import health_router
 from app.api.tickets.handler import tickets_router
 
-all_routers = [health_router, tickets_router]
+all_routers = [health_router, tickets_router, admin_router]
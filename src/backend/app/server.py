@@ -0,0 +1,173 @@
+"""Продакшен-запуск сервиса в нескольких воркерах uvicorn.
+
+Запуск: python -m app.server
+
+Число воркеров берется из WEB_CONCURRENCY, иначе из квоты CPU cgroup
+контейнера: os.cpu_count() в поде видит все ядра узла. Воркерами
+управляет супервизор uvicorn: он перезапускает упавшие и отработавшие
+UVICORN_MAX_REQUESTS запросов воркеры, а по SIGHUP по очереди
+перезапускает все. Метрики воркеров пишутся в общий каталог
+PROMETHEUS_MULTIPROC_DIR, и /metrics любого воркера отдает сумму.
+
+Модуль не импортирует приложение и prometheus_client: переменные
+окружения должны быть выставлены до того, как воркеры создадут метрики.
+"""
+import inspect
+import logging
+import math
+import os
+import shutil
+import socket
+from collections.abc import Callable
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+logger = logging.getLogger(__name__)
+
+APP = "app.main:app"
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+DEFAULT_MULTIPROC_DIR = "/tmp/prometheus-multiproc"
+DEFAULT_GRACEFUL_TIMEOUT_SECONDS = 20
+
+
+def get_cpu_limit(cgroup_root: Path = CGROUP_ROOT) -> float | None:
+    """Возвращает квоту CPU контейнера в ядрах; None - без лимита.
+
+    Сначала читается cpu.max cgroup v2, затем cpu.cfs_quota_us и
+    cpu.cfs_period_us cgroup v1.
+    """
+    try:
+        quota, period = (cgroup_root / "cpu.max").read_text().split()
+    except (OSError, ValueError):
+        pass
+    else:
+        if quota == "max":
+            return None
+        return int(quota) / int(period)
+    try:
+        quota = (cgroup_root / "cpu" / "cpu.cfs_quota_us").read_text()
+        period = (cgroup_root / "cpu" / "cpu.cfs_period_us").read_text()
+    except OSError:
+        return None
+    if int(quota) <= 0:
+        return None
+    return int(quota) / int(period)
+
+
+def get_available_cpus() -> int:
+    """Число ядер, на которых процессу разрешено выполняться."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def get_workers(
+    cpu_limit: float | None,
+    available_cpus: int,
+) -> int:
+    """Возвращает число воркеров.
+
+    WEB_CONCURRENCY задает его явно. Иначе воркеров столько, сколько
+    ядер дает квота с округлением вверх: при 500m один воркер, при
+    1500m - два. Воркер на долю ядра не делит квоту, а только добавляет
+    переключения контекста и соединения в пулах БД.
+    """
+    value = os.getenv("WEB_CONCURRENCY")
+    if value is not None:
+        return max(1, int(value))
+    if cpu_limit is None:
+        return available_cpus
+    return max(1, min(math.ceil(cpu_limit), available_cpus))
+
+
+def select_loop() -> str:
+    """uvloop, если он установлен, иначе asyncio."""
+    return "uvloop" if find_spec("uvloop") is not None else "asyncio"
+
+
+def select_http() -> str:
+    """httptools, если он установлен, иначе h11."""
+    return "httptools" if find_spec("httptools") is not None else "h11"
+
+
+def prepare_multiproc_dir() -> Path:
+    """Создает пустой каталог метрик воркеров.
+
+    Файлы от прошлого запуска контейнера удаляются, иначе их счетчики
+    попали бы в сумму.
+    """
+    path = Path(
+        os.environ.setdefault(
+            "PROMETHEUS_MULTIPROC_DIR",
+            DEFAULT_MULTIPROC_DIR,
+        )
+    )
+    shutil.rmtree(path, ignore_errors=True)
+    path.mkdir(parents=True)
+    return path
+
+
+def build_config(workers: int) -> uvicorn.Config:
+    """Собирает конфигурацию uvicorn из переменных окружения."""
+    return uvicorn.Config(
+        APP,
+        host=os.getenv("APP_HOST", "0.0.0.0"),
+        port=int(os.getenv("APP_PORT", "8000")),
+        workers=workers,
+        loop=select_loop(),
+        http=select_http(),
+        # 0 отключает перезапуск воркеров по числу запросов.
+        limit_max_requests=(
+            int(os.getenv("UVICORN_MAX_REQUESTS", "0")) or None
+        ),
+        limit_max_requests_jitter=int(
+            os.getenv("UVICORN_MAX_REQUESTS_JITTER", "0")
+        ),
+        timeout_graceful_shutdown=int(
+            os.getenv(
+                "UVICORN_GRACEFUL_TIMEOUT",
+                DEFAULT_GRACEFUL_TIMEOUT_SECONDS,
+            )
+        ),
+    )
+
+
+def main() -> None:
+    """Запускает супервизор и воркеры."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    cpu_limit = get_cpu_limit()
+    workers = get_workers(cpu_limit, get_available_cpus())
+    # По числу воркеров /readyz ждет прогрева каждого из них.
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    multiproc_dir = prepare_multiproc_dir()
+    config = build_config(workers)
+    logger.info(
+        "Starting %d worker(s): cpu limit %s, loop %s, http %s, "
+        "metrics in %s",
+        workers,
+        "none" if cpu_limit is None else f"{cpu_limit:g}",
+        config.loop,
+        config.http,
+        multiproc_dir,
+    )
+    # Супервизор нужен и для одного воркера: без него воркер,
+    # отработавший max-requests, завершил бы контейнер.
+    sock = config.bind_socket()
+    options: dict[str, Any] = {"sockets": [sock]}
+    if "target" in inspect.signature(Multiprocess).parameters:
+        # uvicorn < 0.42 запускает в воркере переданный target, более
+        # новые версии сами создают Server из config.
+        target: Callable[[list[socket.socket] | None], None] = (
+            uvicorn.Server(config).run
+        )
+        options["target"] = target
+    Multiprocess(config, **options).run()
+
+
+if __name__ == "__main__":
+    main()
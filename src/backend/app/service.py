@@ -1,10 +1,19 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
-from fastapi import FastAPI, Request
-from fastapi.responses import PlainTextResponse
+from fastapi import FastAPI
 from prometheus_fastapi_instrumentator import Instrumentator
 
-from app.db.session import get_engine
+from app.api.admin.memory import refresh_process_rss
+from app.api.tickets.cache import get_ticket_cache, listen_ticket_changes
+from app.api.tickets.service import ServiceDesk
+from app.compression import get_compression_options
+from app.db.dsn import get_asyncpg_dsn
+from app.db.session import get_engine, get_read_engine
+from app.db.warmup import (get_database_readiness, get_warmup_connections,
+                           run_warm_up)
+from app.metrics import is_multiprocess, mark_worker_dead
+from app.middleware import add_middleware_stack
 
 
 def create_app(root_message: str = "Welcome") -> FastAPI:
@@ -13,16 +22,41 @@ def create_app(root_message: str = "Welcome") -> FastAPI:
     @asynccontextmanager
     async def lifespan(_: FastAPI):
         """Управляет жизненным циклом приложения."""
+        listener = None
+        ticket_cache = get_ticket_cache()
+        if ticket_cache is not None:
+            listener = asyncio.create_task(
+                listen_ticket_changes(ticket_cache, get_asyncpg_dsn())
+            )
+        read_engine = get_read_engine()
+        readiness = get_database_readiness()
+        warm_up = asyncio.create_task(
+            run_warm_up(
+                readiness,
+                get_engine(),
+                lambda session: ServiceDesk(session).warm_up(),
+                connections=get_warmup_connections(),
+                read_engine=read_engine,
+            )
+        )
+        rss = None
+        if is_multiprocess():
+            rss = asyncio.create_task(refresh_process_rss())
         yield
+        for task in (warm_up, listener, rss):
+            if task is not None:
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
         await get_engine().dispose()
+        if read_engine is not None:
+            await read_engine.dispose()
+        readiness.mark_stopped()
+        mark_worker_dead()
 
     app = FastAPI(lifespan=lifespan)
 
-    @app.middleware("http")
-    async def root_response(request: Request, call_next):
-        if request.url.path == "/":
-            return PlainTextResponse(root_message)
-        return await call_next(request)
+    add_middleware_stack(app, root_message, get_compression_options())
 
     instrumentator = Instrumentator(
         should_group_status_codes=False,
@@ -0,0 +1,89 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from prometheus_client import Histogram
+
+SERVER_TIMING_HEADER = "Server-Timing"
+TOTAL_PHASE = "total"
+OTHER_PHASE = "other"
+
+HTTP_REQUEST_PHASE_SECONDS = Histogram(
+    "http_request_phase_seconds",
+    "Time spent in each phase of request handling.",
+    labelnames=("handler", "phase"),
+    buckets=(
+        0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+        1.0, 2.5, 5.0, 10.0,
+    ),
+)
+
+
+class RequestTiming:
+    """Время фаз обработки одного запроса в секундах."""
+
+    __slots__ = ("phases",)
+
+    def __init__(self) -> None:
+        """Создает пустую раскладку по фазам."""
+        self.phases: dict[str, float] = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Добавляет время к фазе."""
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def server_timing(self, total: float) -> str:
+        """Собирает значение заголовка Server-Timing в миллисекундах."""
+        entries = [
+            f"{phase};dur={seconds * 1000:.1f}"
+            for phase, seconds in self.phases.items()
+        ]
+        entries.append(f"{TOTAL_PHASE};dur={total * 1000:.1f}")
+        return ", ".join(entries)
+
+    def observe(self, handler: str, total: float) -> None:
+        """Пишет фазы и остаток времени запроса в гистограмму."""
+        for phase, seconds in self.phases.items():
+            HTTP_REQUEST_PHASE_SECONDS.labels(
+                handler=handler,
+                phase=phase,
+            ).observe(seconds)
+        HTTP_REQUEST_PHASE_SECONDS.labels(
+            handler=handler,
+            phase=OTHER_PHASE,
+        ).observe(max(total - sum(self.phases.values()), 0.0))
+
+
+_current_timing: ContextVar[RequestTiming | None] = ContextVar(
+    "request_timing",
+    default=None,
+)
+
+
+@contextmanager
+def track_request_timing() -> Iterator[RequestTiming]:
+    """Собирает время фаз, измеренных внутри блока."""
+    timing = RequestTiming()
+    token = _current_timing.set(timing)
+    try:
+        yield timing
+    finally:
+        _current_timing.reset(token)
+
+
+def record_phase(phase: str, seconds: float) -> None:
+    """Учитывает время фазы в текущем запросе, если он есть."""
+    timing = _current_timing.get()
+    if timing is not None:
+        timing.add(phase, seconds)
+
+
+@contextmanager
+def timed_phase(phase: str) -> Iterator[None]:
+    """Измеряет время блока как фазу текущего запроса."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(phase, time.perf_counter() - started)
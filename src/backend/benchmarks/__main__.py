@@ -0,0 +1,120 @@
+"""Набор бенчмарков с JSON-результатами и сравнением с базовым прогоном.
+
+Запуск из src/backend:
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --baseline baseline.json --tolerance 0.15
+
+С --baseline процесс завершается с кодом 1, если медиана хотя бы
+одного бенчмарка выросла больше чем на tolerance.
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import Any
+
+from benchmarks.bench_asgi import asgi_benchmarks
+from benchmarks.bench_middleware import middleware_benchmarks
+from benchmarks.bench_schemas import schema_benchmarks
+from benchmarks.bench_service import service_benchmarks
+from benchmarks.harness import (DEFAULT_MIN_ROUND_SECONDS, DEFAULT_ROUNDS,
+                                DEFAULT_TOLERANCE, Suite, compare,
+                                dump_results, load_results, run_suites)
+
+SUITES: dict[str, Suite] = {
+    "schemas": schema_benchmarks,
+    "asgi": asgi_benchmarks,
+    "middleware": middleware_benchmarks,
+    "service": service_benchmarks,
+}
+
+
+def print_result(name: str, stats: dict[str, Any]) -> None:
+    """Печатает результат одного бенчмарка в stderr."""
+    print(
+        f"{name:<45} median {stats['median'] * 1e6:>12.1f} us"
+        f"  min {stats['min'] * 1e6:>12.1f} us"
+        f"  x{stats['number']}",
+        file=sys.stderr,
+    )
+
+
+def print_comparison(comparison: dict[str, Any]) -> None:
+    """Печатает регрессии и улучшения относительно базового прогона."""
+    for title, key in (("REGRESSION", "regressions"),
+                       ("improvement", "improvements")):
+        for entry in comparison[key]:
+            print(
+                f"{title}: {entry['name']} {entry['change']:+.1%}",
+                file=sys.stderr,
+            )
+    for name in comparison["missing"]:
+        print(f"missing in this run: {name}", file=sys.stderr)
+
+
+def main() -> None:
+    """Выполняет бенчмарки и сравнивает их с базовым прогоном."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--suite",
+        action="append",
+        choices=sorted(SUITES),
+        help="suite to run; repeatable, default all",
+    )
+    parser.add_argument(
+        "-k",
+        "--filter",
+        default="",
+        help="run benchmarks whose name contains this substring",
+    )
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument(
+        "--min-round-seconds",
+        type=float,
+        default=DEFAULT_MIN_ROUND_SECONDS,
+    )
+    parser.add_argument("--output", type=Path, help="write results JSON")
+    parser.add_argument("--baseline", type=Path, help="results to compare")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="allowed median slowdown as a fraction, default "
+        f"{DEFAULT_TOLERANCE}",
+    )
+    args = parser.parse_args()
+
+    suites = {
+        name: SUITES[name]
+        for name in (args.suite or SUITES)
+    }
+    results = asyncio.run(
+        run_suites(
+            suites,
+            lambda name: args.filter in name,
+            rounds=args.rounds,
+            min_round_seconds=args.min_round_seconds,
+            progress=print_result,
+        )
+    )
+    for suite, reason in results["skipped"].items():
+        print(f"skipped {suite}: {reason}", file=sys.stderr)
+    passed = True
+    if args.baseline is not None:
+        comparison = compare(
+            results,
+            load_results(args.baseline),
+            args.tolerance,
+        )
+        results["comparison"] = comparison
+        print_comparison(comparison)
+        passed = comparison["passed"]
+    if args.output is not None:
+        dump_results(results, args.output)
+    if not passed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
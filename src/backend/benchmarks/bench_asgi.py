@@ -0,0 +1,110 @@
+"""Бенчмарки полного пути запроса через ASGI без сети и БД.
+
+Запросы идут через httpx.ASGITransport в приложение app.main со всеми
+middleware, валидацией и сериализацией; ServiceDesk заменен заглушкой
+с готовыми тикетами, поэтому замер не включает БД.
+"""
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+from httpx import ASGITransport, AsyncClient
+
+from app.api.tickets.dependencies import (get_read_service_desk,
+                                          get_service_desk)
+from app.api.tickets.schemas import Ticket, TicketFilters, TicketPage
+from app.api.tickets.serialization import tickets_from_rows
+from app.main import app
+from benchmarks.bench_serialization import make_rows
+from benchmarks.harness import Benchmark
+
+PAGE_SIZES = (1, 100)
+GROUP = "asgi"
+
+
+class StaticServiceDesk:
+    """ServiceDesk, который отдает заранее построенные тикеты."""
+
+    def __init__(self, tickets: list[Ticket]) -> None:
+        """Создает заглушку поверх списка тикетов."""
+        self._tickets = tickets
+
+    async def get_ticket(self, ticket_id: int) -> Ticket | None:
+        """Возвращает тикет по позиции в списке."""
+        if 0 <= ticket_id < len(self._tickets):
+            return self._tickets[ticket_id]
+        return None
+
+    async def get_tickets_version(self) -> str:
+        """Версия данных не меняется."""
+        return "0-0"
+
+    async def list_tickets(
+        self,
+        limit: int,
+        after: tuple[datetime, int] | None = None,
+        filters: TicketFilters | None = None,
+    ) -> TicketPage:
+        """Возвращает первые limit тикетов."""
+        return TicketPage.model_construct(
+            items=self._tickets[:limit],
+            next_cursor=None,
+        )
+
+    async def create_ticket(self, **_: object) -> Ticket:
+        """Возвращает первый тикет как созданный."""
+        return self._tickets[0]
+
+
+@asynccontextmanager
+async def asgi_benchmarks() -> AsyncIterator[list[Benchmark]]:
+    """Запросы к /healthz и ручкам тикетов через ASGITransport."""
+    service_desk = StaticServiceDesk(
+        tickets_from_rows(make_rows(max(PAGE_SIZES)))
+    )
+    app.dependency_overrides[get_service_desk] = lambda: service_desk
+    app.dependency_overrides[get_read_service_desk] = lambda: service_desk
+    transport = ASGITransport(app=app)
+    try:
+        async with AsyncClient(
+            transport=transport,
+            base_url="http://bench",
+        ) as client:
+
+            async def healthz() -> None:
+                (await client.get("/healthz")).raise_for_status()
+
+            async def get_ticket() -> None:
+                (await client.get("/tickets/1")).raise_for_status()
+
+            async def create_ticket() -> None:
+                response = await client.post(
+                    "/ticket",
+                    json={"title": "printer", "description": "jammed"},
+                )
+                response.raise_for_status()
+
+            def list_tickets(limit: int):
+                async def request() -> None:
+                    response = await client.get(
+                        "/tickets",
+                        params={"limit": limit},
+                    )
+                    response.raise_for_status()
+                return request
+
+            yield [
+                Benchmark("asgi.healthz", GROUP, healthz),
+                Benchmark("asgi.get_ticket", GROUP, get_ticket),
+                Benchmark("asgi.create_ticket", GROUP, create_ticket),
+                *(
+                    Benchmark(
+                        f"asgi.list_tickets[{limit}]",
+                        GROUP,
+                        list_tickets(limit),
+                    )
+                    for limit in PAGE_SIZES
+                ),
+            ]
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,137 @@
+"""Стоимость middleware: BaseHTTPMiddleware против чистого ASGI.
+
+Запуск из src/backend:
+
+    python -m benchmarks.bench_middleware
+    python -m benchmarks --suite middleware --output middleware.json
+
+Оба приложения собраны из тех же роутеров с заглушкой ServiceDesk из
+bench_asgi и отличаются только middleware: base_http повторяет прежние
+@app.middleware("http"), asgi - add_middleware_stack. Instrumentator и
+lifespan не подключаются, чтобы замер включал только middleware.
+"""
+import asyncio
+import sys
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.api.tickets.dependencies import (get_read_service_desk,
+                                          get_service_desk)
+from app.api.tickets.serialization import tickets_from_rows
+from app.db.round_trips import DB_ROUND_TRIPS, count_round_trips
+from app.middleware import add_middleware_stack
+from app.routers import all_routers
+from app.timing import SERVER_TIMING_HEADER, track_request_timing
+from benchmarks.bench_asgi import StaticServiceDesk
+from benchmarks.bench_serialization import make_rows
+from benchmarks.harness import Benchmark, run_suites
+
+GROUP = "middleware"
+ROOT_MESSAGE = "Service Desk Backend"
+STACKS = ("base_http", "asgi")
+PATHS = {"healthz": "/healthz", "get_ticket": "/tickets/1"}
+
+
+def add_base_http_stack(app: FastAPI, root_message: str) -> None:
+    """Прежние middleware сервиса на BaseHTTPMiddleware."""
+
+    @app.middleware("http")
+    async def root_response(request: Request, call_next):
+        if request.url.path == "/":
+            return PlainTextResponse(root_message)
+        return await call_next(request)
+
+    @app.middleware("http")
+    async def observe_db_round_trips(request: Request, call_next):
+        with count_round_trips() as counter:
+            response = await call_next(request)
+        route = request.scope.get("route")
+        if route is not None:
+            DB_ROUND_TRIPS.labels(
+                method=request.method,
+                handler=route.path,
+            ).observe(counter.count)
+        return response
+
+    @app.middleware("http")
+    async def server_timing(request: Request, call_next):
+        started = time.perf_counter()
+        with track_request_timing() as timing:
+            response = await call_next(request)
+        total = time.perf_counter() - started
+        response.headers[SERVER_TIMING_HEADER] = timing.server_timing(total)
+        route = request.scope.get("route")
+        if route is not None:
+            timing.observe(route.path, total)
+        return response
+
+
+def build_app(stack: str, service_desk: StaticServiceDesk) -> FastAPI:
+    """Приложение с роутерами сервиса и выбранным набором middleware."""
+    app = FastAPI()
+    if stack == "asgi":
+        add_middleware_stack(app, ROOT_MESSAGE)
+    else:
+        add_base_http_stack(app, ROOT_MESSAGE)
+    for router in all_routers:
+        app.include_router(router)
+    app.dependency_overrides[get_service_desk] = lambda: service_desk
+    app.dependency_overrides[get_read_service_desk] = lambda: service_desk
+    return app
+
+
+@asynccontextmanager
+async def middleware_benchmarks() -> AsyncIterator[list[Benchmark]]:
+    """GET /healthz и GET /tickets/{id} через оба набора middleware."""
+    service_desk = StaticServiceDesk(tickets_from_rows(make_rows(2)))
+    clients = {
+        stack: AsyncClient(
+            transport=ASGITransport(app=build_app(stack, service_desk)),
+            base_url="http://bench",
+        )
+        for stack in STACKS
+    }
+
+    def request(client: AsyncClient, path: str):
+        async def call() -> None:
+            (await client.get(path)).raise_for_status()
+        return call
+
+    try:
+        yield [
+            Benchmark(
+                f"middleware.{name}[{stack}]",
+                GROUP,
+                request(clients[stack], path),
+            )
+            for name, path in PATHS.items()
+            for stack in STACKS
+        ]
+    finally:
+        for client in clients.values():
+            await client.aclose()
+
+
+def main() -> None:
+    """Печатает запросы в секунду для обоих наборов и прирост."""
+    results = asyncio.run(
+        run_suites({GROUP: middleware_benchmarks}, lambda _: True)
+    )
+    benchmarks = results["benchmarks"]
+    for name in PATHS:
+        base = benchmarks[f"middleware.{name}[base_http]"]["ops_per_second"]
+        asgi = benchmarks[f"middleware.{name}[asgi]"]["ops_per_second"]
+        print(
+            f"{name:<12} base_http {base:>9.0f} req/s"
+            f"  asgi {asgi:>9.0f} req/s  {asgi / base - 1:+.1%}",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
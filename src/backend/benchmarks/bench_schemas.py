@@ -0,0 +1,56 @@
+"""Бенчмарки валидации и сериализации списка тикетов."""
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from app.api.tickets.schemas import Ticket
+from app.api.tickets.serialization import dump_tickets, tickets_from_rows
+from benchmarks.bench_serialization import make_rows
+from benchmarks.harness import Benchmark
+
+ROW_COUNTS = (1, 100, 10_000)
+GROUP = "schemas"
+
+
+@asynccontextmanager
+async def schema_benchmarks() -> AsyncIterator[list[Benchmark]]:
+    """Валидация строк, сериализация и полный путь для 1/100/10k строк."""
+    benchmarks = []
+    for count in ROW_COUNTS:
+        rows = make_rows(count)
+        tickets = tickets_from_rows(rows)
+        benchmarks.extend(
+            [
+                Benchmark(
+                    f"schemas.tickets_from_rows[{count}]",
+                    GROUP,
+                    lambda rows=rows: tickets_from_rows(rows),
+                ),
+                Benchmark(
+                    f"schemas.dump_tickets[{count}]",
+                    GROUP,
+                    lambda tickets=tickets: dump_tickets(tickets),
+                ),
+                Benchmark(
+                    f"schemas.rows_to_json[{count}]",
+                    GROUP,
+                    lambda rows=rows: dump_tickets(tickets_from_rows(rows)),
+                ),
+            ]
+        )
+    ticket = tickets[0]
+    benchmarks.append(
+        Benchmark(
+            "schemas.ticket_model_dump_json",
+            GROUP,
+            ticket.model_dump_json,
+        )
+    )
+    payload = ticket.model_dump_json()
+    benchmarks.append(
+        Benchmark(
+            "schemas.ticket_model_validate_json",
+            GROUP,
+            lambda: Ticket.model_validate_json(payload),
+        )
+    )
+    yield benchmarks
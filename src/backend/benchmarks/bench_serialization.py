@@ -0,0 +1,107 @@
+"""Сравнение старого и нового пути сериализации списка тикетов.
+
+Запуск из src/backend: python -m benchmarks.bench_serialization
+"""
+import argparse
+import time
+from collections import namedtuple
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+from fastapi._compat import ModelField
+from fastapi.utils import create_model_field
+
+from app.api.tickets.schemas import Ticket
+from app.api.tickets.serialization import dump_tickets, tickets_from_rows
+from app.db.models import Ticket as TicketModel
+from app.db.types import TicketPriority, TicketStatus
+
+DEFAULT_ROWS = 10_000
+DEFAULT_REPEAT = 5
+
+TicketRow = namedtuple("TicketRow", list(Ticket.model_fields))
+
+
+def make_rows(count: int) -> list[TicketRow]:
+    """Строит кортежи колонок, как их возвращает select(*columns)."""
+    started_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    statuses = list(TicketStatus)
+    priorities = list(TicketPriority)
+    return [
+        TicketRow(
+            id=index,
+            title=f"ticket {index}",
+            description=f"description of ticket {index}",
+            status=statuses[index % len(statuses)],
+            priority=priorities[index % len(priorities)],
+            created_at=started_at + timedelta(seconds=index),
+            updated_at=started_at + timedelta(seconds=index),
+        )
+        for index in range(count)
+    ]
+
+
+def make_models(rows: list[TicketRow]) -> list[TicketModel]:
+    """Строит ORM-объекты с теми же значениями, что и строки."""
+    return [TicketModel(**row._asdict()) for row in rows]
+
+
+def legacy_path(
+    models: list[TicketModel],
+    response_field: ModelField,
+) -> bytes:
+    """Прежний путь: model_validate на строку и валидация FastAPI."""
+    tickets = [Ticket.model_validate(model) for model in models]
+    value, errors = response_field.validate(tickets, {}, loc=("response",))
+    assert not errors
+    return response_field.serialize_json(value, by_alias=True)
+
+
+def fast_path(rows: list[TicketRow]) -> bytes:
+    """Новый путь: кортежи колонок и закэшированный TypeAdapter."""
+    return dump_tickets(tickets_from_rows(rows))
+
+
+def measure(func: Callable[[], bytes], repeat: int) -> float:
+    """Возвращает лучшее время выполнения из repeat прогонов."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    """Печатает время обоих путей и проверяет совпадение байтов."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    models = make_models(rows)
+    response_field = create_model_field(
+        name="Response_list_tickets",
+        type_=list[Ticket],
+        mode="serialization",
+    )
+
+    legacy_body = legacy_path(models, response_field)
+    fast_body = fast_path(rows)
+    if legacy_body != fast_body:
+        raise SystemExit("Serialized bodies differ")
+
+    legacy_seconds = measure(
+        lambda: legacy_path(models, response_field),
+        args.repeat,
+    )
+    fast_seconds = measure(lambda: fast_path(rows), args.repeat)
+    print(f"rows:    {args.rows}")
+    print(f"legacy:  {legacy_seconds * 1000:.1f} ms")
+    print(f"fast:    {fast_seconds * 1000:.1f} ms")
+    print(f"speedup: {legacy_seconds / fast_seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Бенчмарки методов ServiceDesk на живом Postgres.
+
+Нужна БД с примененными миграциями, настроенная через DATABASE_URL или
+POSTGRES_*, например из docker compose. Набор создает свои тикеты с
+уникальным префиксом заголовка и удаляет их в конце.
+"""
+import itertools
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from sqlalchemy import delete
+
+from app.api.tickets.schemas import TicketCreate, TicketFilters
+from app.api.tickets.service import ServiceDesk
+from app.db.models import Ticket as TicketModel
+from app.db.session import get_engine, get_session_factory
+from app.db.types import TicketPriority, TicketStatus
+from benchmarks.harness import Benchmark, SuiteSkipped
+
+SEED_TICKETS = 1_000
+PAGE_SIZE = 50
+BULK_SIZE = 100
+GROUP = "service"
+
+
+@asynccontextmanager
+async def service_benchmarks() -> AsyncIterator[list[Benchmark]]:
+    """Чтение, запись, списки, поиск и статистика через ServiceDesk."""
+    try:
+        session_factory = get_session_factory()
+    except RuntimeError as exc:
+        raise SuiteSkipped(str(exc)) from exc
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    statuses = itertools.cycle(TicketStatus)
+    priorities = itertools.cycle(TicketPriority)
+    try:
+        async with session_factory() as session:
+            service = ServiceDesk(session)
+            seeded = await service.create_tickets(
+                [
+                    TicketCreate(
+                        title=f"{prefix} printer {index}",
+                        description=f"printer {index} is jammed again",
+                        status=next(statuses),
+                        priority=next(priorities),
+                    )
+                    for index in range(SEED_TICKETS)
+                ]
+            )
+            ids = itertools.cycle(ticket.id for ticket in seeded)
+            bulk = [
+                TicketCreate(title=f"{prefix} bulk {index}")
+                for index in range(BULK_SIZE)
+            ]
+
+            async def get_ticket() -> None:
+                session.expunge_all()
+                await service.get_ticket(next(ids))
+
+            async def update_ticket() -> None:
+                await service.update_ticket(
+                    next(ids),
+                    status=next(statuses),
+                )
+
+            async def create_and_delete_ticket() -> None:
+                ticket = await service.create_ticket(title=f"{prefix} new")
+                await service.delete_ticket(ticket.id)
+
+            async def list_tickets() -> None:
+                await service.list_tickets(limit=PAGE_SIZE)
+
+            async def list_tickets_filtered() -> None:
+                await service.list_tickets(
+                    limit=PAGE_SIZE,
+                    filters=TicketFilters(
+                        statuses=[TicketStatus.NEW],
+                        priorities=[TicketPriority.HIGH],
+                    ),
+                )
+
+            async def list_ticket_fields() -> None:
+                await service.list_ticket_fields(
+                    ("id", "title", "status"),
+                    limit=PAGE_SIZE,
+                )
+
+            async def search_tickets() -> None:
+                await service.search_tickets(
+                    TicketFilters(query="printer jammed"),
+                    limit=PAGE_SIZE,
+                )
+
+            async def create_tickets() -> None:
+                await service.create_tickets(bulk)
+
+            try:
+                yield [
+                    Benchmark("service.get_ticket", GROUP, get_ticket),
+                    Benchmark("service.update_ticket", GROUP, update_ticket),
+                    Benchmark(
+                        "service.create_and_delete_ticket",
+                        GROUP,
+                        create_and_delete_ticket,
+                    ),
+                    Benchmark(
+                        f"service.list_tickets[{PAGE_SIZE}]",
+                        GROUP,
+                        list_tickets,
+                    ),
+                    Benchmark(
+                        f"service.list_tickets_filtered[{PAGE_SIZE}]",
+                        GROUP,
+                        list_tickets_filtered,
+                    ),
+                    Benchmark(
+                        f"service.list_ticket_fields[{PAGE_SIZE}]",
+                        GROUP,
+                        list_ticket_fields,
+                    ),
+                    Benchmark("service.search_tickets", GROUP, search_tickets),
+                    Benchmark(
+                        "service.get_ticket_stats",
+                        GROUP,
+                        service.get_ticket_stats,
+                    ),
+                    Benchmark(
+                        f"service.create_tickets[{BULK_SIZE}]",
+                        GROUP,
+                        create_tickets,
+                    ),
+                ]
+            finally:
+                await session.rollback()
+                await session.execute(
+                    delete(TicketModel).where(
+                        TicketModel.title.startswith(prefix)
+                    )
+                )
+                await session.commit()
+    except OSError as exc:
+        raise SuiteSkipped(f"Database is unavailable: {exc}") from exc
+    finally:
+        await get_engine().dispose()
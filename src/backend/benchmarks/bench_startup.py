@@ -0,0 +1,174 @@
+"""Время старта сервиса до первого успешного /healthz.
+
+Запуск из src/backend:
+
+    python -m benchmarks.bench_startup --rounds 5 --output startup.json
+
+Каждый раунд запускает отдельный процесс так же, как
+docker-entrypoint.sh: проверка миграций (если настроена БД), затем
+app.server. Время считается от запуска до первого ответа 200 на /healthz.
+--launcher uv запускает те же команды через uv run для сравнения.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from app.db.dsn import get_database_url
+from benchmarks.harness import (DEFAULT_TOLERANCE, compare, dump_results,
+                                load_results, new_results, summarize)
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_ROUNDS = 5
+STARTUP_TIMEOUT_SECONDS = 60.0
+POLL_INTERVAL_SECONDS = 0.01
+GROUP = "startup"
+
+
+def _free_port() -> int:
+    """Возвращает свободный локальный порт."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _has_database() -> bool:
+    """Проверяет, настроено ли подключение к БД."""
+    try:
+        get_database_url()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _python(launcher: str) -> list[str]:
+    """Префикс команды запуска python."""
+    if launcher == "uv":
+        return ["uv", "run", "python"]
+    return [sys.executable]
+
+
+async def _wait_healthy(
+    client: httpx.AsyncClient,
+    url: str,
+    process: subprocess.Popen,
+) -> None:
+    """Опрашивает /healthz, пока он не ответит 200."""
+    deadline = time.perf_counter() + STARTUP_TIMEOUT_SECONDS
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(
+                f"Service exited with code {process.returncode}"
+            )
+        try:
+            response = await client.get(url)
+        except httpx.TransportError:
+            pass
+        else:
+            if response.status_code == 200:
+                return
+        await asyncio.sleep(POLL_INTERVAL_SECONDS)
+    raise TimeoutError(f"{url} is not healthy after startup timeout")
+
+
+async def measure_startup(launcher: str, migrations: bool) -> float:
+    """Запускает сервис и возвращает время до первого /healthz."""
+    port = _free_port()
+    env = dict(os.environ, APP_HOST="127.0.0.1", APP_PORT=str(port))
+    if not migrations:
+        # Без БД слушатель кэша тикетов не сможет подключиться.
+        env.setdefault("TICKET_CACHE_MAX_SIZE", "0")
+    python = _python(launcher)
+    serve = [*python, "-m", "app.server"]
+    started = time.perf_counter()
+    if migrations:
+        subprocess.run(
+            [*python, "-m", "app.db.migrate"],
+            cwd=BACKEND_ROOT,
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+    process = subprocess.Popen(
+        serve,
+        cwd=BACKEND_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        async with httpx.AsyncClient(timeout=1.0) as client:
+            await _wait_healthy(
+                client,
+                f"http://127.0.0.1:{port}/healthz",
+                process,
+            )
+        return time.perf_counter() - started
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main() -> None:
+    """Замеряет старт и сравнивает его с базовым прогоном."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument(
+        "--launcher",
+        choices=("direct", "uv"),
+        default="direct",
+    )
+    parser.add_argument(
+        "--no-migrations",
+        dest="migrations",
+        action="store_false",
+        help="skip app.db.migrate even if a database is configured",
+    )
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    migrations = args.migrations and _has_database()
+    name = f"startup.healthz[{args.launcher}"
+    name += ",migrate]" if migrations else "]"
+    timings = [
+        asyncio.run(measure_startup(args.launcher, migrations))
+        for _ in range(args.rounds)
+    ]
+    results = new_results()
+    results["benchmarks"][name] = summarize(GROUP, timings)
+    stats = results["benchmarks"][name]
+    print(
+        f"{name}: median {stats['median'] * 1000:.0f} ms, "
+        f"min {stats['min'] * 1000:.0f} ms",
+        file=sys.stderr,
+    )
+    passed = True
+    if args.baseline is not None:
+        comparison = compare(
+            results,
+            load_results(args.baseline),
+            args.tolerance,
+        )
+        results["comparison"] = comparison
+        passed = comparison["passed"]
+        for entry in comparison["regressions"]:
+            print(
+                f"REGRESSION: {entry['name']} {entry['change']:+.1%}",
+                file=sys.stderr,
+            )
+    if args.output is not None:
+        dump_results(results, args.output)
+    if not passed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
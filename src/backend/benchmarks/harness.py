@@ -0,0 +1,202 @@
+"""Замер бенчмарков, JSON-результаты и сравнение с базовым прогоном."""
+import inspect
+import json
+import platform
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+DEFAULT_ROUNDS = 7
+DEFAULT_MIN_ROUND_SECONDS = 0.05
+DEFAULT_TOLERANCE = 0.2
+MAX_NUMBER = 1_000_000
+
+
+class SuiteSkipped(Exception):
+    """Набор бенчмарков нельзя выполнить в этом окружении."""
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """Бенчмарк: имя, группа и функция одной операции.
+
+    Функция может быть обычной или корутинной.
+    """
+    name: str
+    group: str
+    func: Callable[[], Any] | Callable[[], Awaitable[Any]]
+
+
+Suite = Callable[[], AbstractAsyncContextManager[list[Benchmark]]]
+
+
+async def _run_round(benchmark: Benchmark, number: int) -> float:
+    """Выполняет операцию number раз и возвращает затраченное время."""
+    func = benchmark.func
+    if inspect.iscoroutinefunction(func):
+        started = time.perf_counter()
+        for _ in range(number):
+            await func()
+        return time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - started
+
+
+async def _calibrate(benchmark: Benchmark, min_round_seconds: float) -> int:
+    """Подбирает число операций в раунде.
+
+    Раунд должен длиться не меньше min_round_seconds, тогда
+    погрешность таймера не влияет на результат.
+    """
+    number = 1
+    while number < MAX_NUMBER:
+        elapsed = await _run_round(benchmark, number)
+        if elapsed >= min_round_seconds:
+            return number
+        if elapsed <= 0:
+            number *= 10
+            continue
+        number = min(
+            max(int(number * min_round_seconds / elapsed * 1.2), number + 1),
+            MAX_NUMBER,
+        )
+    return number
+
+
+async def measure(
+    benchmark: Benchmark,
+    rounds: int = DEFAULT_ROUNDS,
+    min_round_seconds: float = DEFAULT_MIN_ROUND_SECONDS,
+) -> dict[str, Any]:
+    """Замеряет бенчмарк и возвращает статистику времени операции.
+
+    Первый вызов и калибровка служат прогревом, затем выполняется
+    rounds раундов. Время - в секундах на одну операцию.
+    """
+    await _run_round(benchmark, 1)
+    number = await _calibrate(benchmark, min_round_seconds)
+    timings = [
+        await _run_round(benchmark, number) / number
+        for _ in range(rounds)
+    ]
+    return summarize(benchmark.group, timings, number)
+
+
+def summarize(
+    group: str,
+    timings: list[float],
+    number: int = 1,
+) -> dict[str, Any]:
+    """Статистика по временам раундов в секундах на операцию."""
+    rounds = len(timings)
+    median = statistics.median(timings)
+    return {
+        "group": group,
+        "rounds": rounds,
+        "number": number,
+        "min": min(timings),
+        "median": median,
+        "mean": statistics.fmean(timings),
+        "stdev": statistics.stdev(timings) if rounds > 1 else 0.0,
+        "ops_per_second": 1 / median if median else None,
+    }
+
+
+def new_results() -> dict[str, Any]:
+    """Пустые результаты прогона с описанием окружения."""
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": {},
+        "skipped": {},
+    }
+
+
+async def run_suites(
+    suites: dict[str, Suite],
+    selected: Callable[[str], bool],
+    rounds: int = DEFAULT_ROUNDS,
+    min_round_seconds: float = DEFAULT_MIN_ROUND_SECONDS,
+    progress: Callable[[str, dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """Выполняет наборы бенчмарков и собирает результаты прогона.
+
+    Наборы, которые бросили SuiteSkipped, попадают в skipped с
+    причиной.
+    """
+    results = new_results()
+    for suite_name, suite in suites.items():
+        try:
+            async with suite() as benchmarks:
+                for benchmark in benchmarks:
+                    if not selected(benchmark.name):
+                        continue
+                    stats = await measure(
+                        benchmark,
+                        rounds,
+                        min_round_seconds,
+                    )
+                    results["benchmarks"][benchmark.name] = stats
+                    if progress is not None:
+                        progress(benchmark.name, stats)
+        except SuiteSkipped as exc:
+            results["skipped"][suite_name] = str(exc)
+    return results
+
+
+def compare(
+    results: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> dict[str, Any]:
+    """Сравнивает медианы прогона с базовым прогоном.
+
+    Регрессия - медиана выросла больше чем на tolerance (доля от
+    базовой), улучшение - уменьшилась больше чем на tolerance.
+    """
+    current = results["benchmarks"]
+    previous = baseline["benchmarks"]
+    regressions = []
+    improvements = []
+    for name in sorted(current.keys() & previous.keys()):
+        base_median = previous[name]["median"]
+        median = current[name]["median"]
+        if not base_median:
+            continue
+        change = median / base_median - 1
+        entry = {
+            "name": name,
+            "baseline_median": base_median,
+            "median": median,
+            "change": round(change, 4),
+        }
+        if change > tolerance:
+            regressions.append(entry)
+        elif change < -tolerance:
+            improvements.append(entry)
+    return {
+        "tolerance": tolerance,
+        "regressions": regressions,
+        "improvements": improvements,
+        "missing": sorted(previous.keys() - current.keys()),
+        "new": sorted(current.keys() - previous.keys()),
+        "passed": not regressions,
+    }
+
+
+def load_results(path: Path) -> dict[str, Any]:
+    """Читает JSON-результаты прогона."""
+    return json.loads(path.read_text())
+
+
+def dump_results(results: dict[str, Any], path: Path) -> None:
+    """Пишет JSON-результаты прогона."""
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
@@ -1,13 +1,16 @@
 #!/bin/sh
 set -e
 
+# Процесс запускается прямо из виртуального окружения образа: uv run
+# при каждом старте заново проверял бы окружение.
 if [ "${RUN_MIGRATIONS:-1}" = "1" ]; then
-  uv run alembic upgrade head
+  python -m app.db.migrate
 fi
 
-UVICORN_ARGS="--host 0.0.0.0 --port 8000"
+# --reload работает только в одном процессе, поэтому для разработки
+# uvicorn запускается напрямую, а в проде - супервизор воркеров.
 if [ "${UVICORN_RELOAD:-0}" = "1" ]; then
-  UVICORN_ARGS="$UVICORN_ARGS --reload"
+  exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
 fi
 
-exec uv run uvicorn app.main:app $UVICORN_ARGS
+exec python -m app.server
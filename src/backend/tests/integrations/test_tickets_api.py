@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy import text
@@ -110,3 +112,132 @@ async def test_list_tickets(client: AsyncClient, db_session: object) -> None:
         {"id1": ticket_one.id, "id2": ticket_two.id},
     )
     await db_session.commit()
+
+
+async def test_list_tickets_paginates_with_cursor(
+    client: AsyncClient,
+    db_session: object,
+) -> None:
+    service = ServiceDesk(db_session)
+    created = [
+        await service.create_ticket(title=f"page-{index}")
+        for index in range(3)
+    ]
+
+    first_page = await client.get("/tickets", params={"limit": 2})
+    next_cursor = first_page.headers["x-next-cursor"]
+    second_page = await client.get(
+        "/tickets",
+        params={"limit": 2, "cursor": next_cursor},
+    )
+
+    assert first_page.status_code == 200
+    assert second_page.status_code == 200
+    first_ids = [item["id"] for item in first_page.json()]
+    second_ids = [item["id"] for item in second_page.json()]
+    assert first_ids == [created[2].id, created[1].id]
+    assert second_ids[0] == created[0].id
+
+    await db_session.execute(
+        text("DELETE FROM tickets WHERE id = ANY(:ids)"),
+        {"ids": [ticket.id for ticket in created]},
+    )
+    await db_session.commit()
+
+
+async def test_list_tickets_returns_requested_fields(
+    client: AsyncClient,
+    db_session: object,
+) -> None:
+    service = ServiceDesk(db_session)
+    created = [
+        await service.create_ticket(title=f"fields-{index}", description="x")
+        for index in range(2)
+    ]
+
+    first_page = await client.get(
+        "/tickets",
+        params={"limit": 1, "fields": "title,status"},
+    )
+    second_page = await client.get(
+        "/tickets",
+        params={
+            "limit": 1,
+            "fields": "title,status",
+            "cursor": first_page.headers["x-next-cursor"],
+        },
+    )
+
+    assert first_page.status_code == 200
+    assert first_page.json() == [
+        {"id": created[1].id, "title": "fields-1", "status": "new"}
+    ]
+    assert second_page.json()[0]["id"] == created[0].id
+
+    await db_session.execute(
+        text("DELETE FROM tickets WHERE id = ANY(:ids)"),
+        {"ids": [ticket.id for ticket in created]},
+    )
+    await db_session.commit()
+
+
+async def test_export_tickets_ndjson(
+    client: AsyncClient,
+    db_session: object,
+) -> None:
+    service = ServiceDesk(db_session)
+    ticket = await service.create_ticket(
+        title="export",
+        status=TicketStatus.IN_PROGRESS,
+    )
+
+    response = await client.get(
+        "/tickets/export",
+        params={"status": TicketStatus.IN_PROGRESS.value},
+    )
+
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert ticket.id in [row["id"] for row in rows]
+    assert {row["status"] for row in rows} == {
+        TicketStatus.IN_PROGRESS.value
+    }
+
+    await db_session.execute(
+        text("DELETE FROM tickets WHERE id = :id"),
+        {"id": ticket.id},
+    )
+    await db_session.commit()
+
+
+async def test_search_tickets_ranks_title_matches_first(
+    client: AsyncClient,
+    db_session: object,
+) -> None:
+    service = ServiceDesk(db_session)
+    in_description = await service.create_ticket(
+        title="office",
+        description="laserjet printer jammed",
+    )
+    in_title = await service.create_ticket(
+        title="laserjet printer offline",
+        description="",
+    )
+
+    response = await client.get("/tickets/search", params={"q": "laserjet"})
+    fuzzy_response = await client.get(
+        "/tickets/search",
+        params={"q": "lasrjet printr"},
+    )
+
+    assert response.status_code == 200
+    ids = [item["id"] for item in response.json()]
+    assert ids.index(in_title.id) < ids.index(in_description.id)
+    assert fuzzy_response.status_code == 200
+    assert in_title.id in [item["id"] for item in fuzzy_response.json()]
+
+    await db_session.execute(
+        text("DELETE FROM tickets WHERE id = ANY(:ids)"),
+        {"ids": [in_description.id, in_title.id]},
+    )
+    await db_session.commit()
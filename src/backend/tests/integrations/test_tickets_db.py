@@ -1,7 +1,9 @@
 import pytest
 from sqlalchemy import text
 
+from app.api.tickets.schemas import TicketCreate
 from app.api.tickets.service import ServiceDesk
+from app.db.reconcile_counters import reconcile_ticket_counters
 from app.db.types import TicketPriority, TicketStatus
 
 pytestmark = pytest.mark.asyncio
@@ -40,3 +42,112 @@ async def test_create_ticket_persists_to_db(
         {"id": ticket.id},
     )
     await db_session.commit()
+
+
+async def test_create_tickets_persists_batch_in_order(
+    db_session: object,
+) -> None:
+    service_desk = ServiceDesk(db_session)
+    tickets = await service_desk.create_tickets(
+        [
+            TicketCreate(title=f"bulk-{index}", priority=TicketPriority.HIGH)
+            for index in range(3)
+        ]
+    )
+
+    assert [ticket.title for ticket in tickets] == [
+        "bulk-0",
+        "bulk-1",
+        "bulk-2",
+    ]
+    result = await db_session.execute(
+        text("SELECT count(*) FROM tickets WHERE id = ANY(:ids)"),
+        {"ids": [ticket.id for ticket in tickets]},
+    )
+    assert result.scalar_one() == 3
+
+    await db_session.execute(
+        text("DELETE FROM tickets WHERE id = ANY(:ids)"),
+        {"ids": [ticket.id for ticket in tickets]},
+    )
+    await db_session.commit()
+
+
+async def test_update_tickets_closes_batch_and_reports_missing(
+    db_session: object,
+) -> None:
+    service_desk = ServiceDesk(db_session)
+    tickets = await service_desk.create_tickets(
+        [TicketCreate(title=f"incident-{index}") for index in range(2)]
+    )
+    ids = [ticket.id for ticket in tickets]
+    missing_id = max(ids) + 1_000_000
+
+    outcome = await service_desk.update_tickets(
+        {"status": TicketStatus.CLOSED},
+        ids=[*ids, missing_id],
+    )
+
+    assert sorted(outcome.updated) == sorted(ids)
+    assert outcome.not_found == [missing_id]
+    result = await db_session.execute(
+        text(
+            "SELECT status, updated_at > created_at AS touched "
+            "FROM tickets WHERE id = ANY(:ids)"
+        ),
+        {"ids": ids},
+    )
+    rows = result.mappings().all()
+    assert {row["status"] for row in rows} == {TicketStatus.CLOSED.value}
+    assert all(row["touched"] for row in rows)
+
+    await db_session.execute(
+        text("DELETE FROM tickets WHERE id = ANY(:ids)"),
+        {"ids": ids},
+    )
+    await db_session.commit()
+
+
+async def test_tickets_version_changes_on_write(db_session: object) -> None:
+    service_desk = ServiceDesk(db_session)
+    before = await service_desk.get_tickets_version()
+
+    ticket = await service_desk.create_ticket(title="versioned")
+    after_create = await service_desk.get_tickets_version()
+    await service_desk.update_ticket(ticket.id, title="versioned again")
+    after_update = await service_desk.get_tickets_version()
+    await service_desk.delete_ticket(ticket.id)
+    after_delete = await service_desk.get_tickets_version()
+
+    assert len({before, after_create, after_update}) == 3
+    assert after_delete != after_update
+    # Те же строки, что и до теста, - та же версия.
+    assert after_delete == before
+
+
+async def test_ticket_counters_follow_writes(db_session: object) -> None:
+    service_desk = ServiceDesk(db_session)
+    total = await reconcile_ticket_counters(db_session)
+    before = await service_desk.get_ticket_stats()
+    assert before.total == total
+
+    ticket = await service_desk.create_ticket(
+        title="counted",
+        status=TicketStatus.NEW,
+        priority=TicketPriority.CRITICAL,
+    )
+    await service_desk.update_ticket(ticket.id, status=TicketStatus.DONE)
+    after_update = await service_desk.get_ticket_stats()
+    await service_desk.delete_ticket(ticket.id)
+    after_delete = await service_desk.get_ticket_stats()
+
+    assert after_update.total == before.total + 1
+    assert (
+        after_update.by_status[TicketStatus.DONE]
+        == before.by_status[TicketStatus.DONE] + 1
+    )
+    assert (
+        after_update.by_status[TicketStatus.NEW]
+        == before.by_status[TicketStatus.NEW]
+    )
+    assert after_delete == before
@@ -0,0 +1,149 @@
+import asyncio
+import marshal
+import pstats
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.api.admin.profiler import ProfilerBusyError, sample_stacks
+from app.routers import all_routers
+from app.service import create_app
+
+ADMIN_TOKEN = "secret-token"
+
+
+def create_admin_client(monkeypatch, token: str | None) -> TestClient:
+    monkeypatch.setenv("POSTGRES_USER", "service_desk")
+    monkeypatch.setenv("POSTGRES_PASSWORD", "service_desk")
+    monkeypatch.setenv("POSTGRES_DB", "service_desk")
+    if token is None:
+        monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    else:
+        monkeypatch.setenv("ADMIN_TOKEN", token)
+
+    app = create_app()
+    for router in all_routers:
+        app.include_router(router)
+    return TestClient(app)
+
+
+def auth(token: str = ADMIN_TOKEN) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_memory_stats_report_rss_and_gc(monkeypatch) -> None:
+    with create_admin_client(monkeypatch, ADMIN_TOKEN) as client:
+        response = client.get("/admin/memory", headers=auth())
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["rss_bytes"] > 0
+    assert [item["generation"] for item in body["gc"]] == [0, 1, 2]
+    assert "gc_objects" not in body
+    assert REGISTRY.get_sample_value("process_rss_bytes") is None
+
+
+def test_admin_endpoints_are_disabled_without_token(monkeypatch) -> None:
+    with create_admin_client(monkeypatch, None) as client:
+        response = client.post("/admin/profile", headers=auth())
+
+    assert response.status_code == 404
+
+
+def test_admin_endpoints_require_valid_token(monkeypatch) -> None:
+    with create_admin_client(monkeypatch, ADMIN_TOKEN) as client:
+        missing = client.post("/admin/profile")
+        wrong = client.post("/admin/profile", headers=auth("wrong"))
+
+    assert missing.status_code == 401
+    assert wrong.status_code == 401
+    assert wrong.headers["www-authenticate"] == "Bearer"
+
+
+def test_profile_returns_collapsed_stacks(monkeypatch) -> None:
+    with create_admin_client(monkeypatch, ADMIN_TOKEN) as client:
+        response = client.post(
+            "/admin/profile",
+            params={"seconds": 0.05, "interval_ms": 1},
+            headers=auth(),
+        )
+
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) >= 1
+    assert ";" in stack
+
+
+def test_profile_returns_pstats(monkeypatch, tmp_path) -> None:
+    with create_admin_client(monkeypatch, ADMIN_TOKEN) as client:
+        response = client.post(
+            "/admin/profile",
+            params={"seconds": 0.01, "format": "pstats"},
+            headers=auth(),
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/octet-stream"
+    assert isinstance(marshal.loads(response.content), dict)
+    dump = tmp_path / "profile.pstats"
+    dump.write_bytes(response.content)
+    assert pstats.Stats(str(dump)).total_calls >= 0
+
+
+@pytest.mark.asyncio
+async def test_profiler_runs_one_profile_at_a_time() -> None:
+    results = await asyncio.gather(
+        sample_stacks(0.02, 0.001),
+        sample_stacks(0.02, 0.001),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[0], str)
+    assert isinstance(results[1], ProfilerBusyError)
+
+
+def test_tracemalloc_snapshots_and_diff(monkeypatch) -> None:
+    with create_admin_client(monkeypatch, ADMIN_TOKEN) as client:
+        not_started = client.post(
+            "/admin/tracemalloc/snapshots",
+            headers=auth(),
+        )
+        started = client.post(
+            "/admin/tracemalloc/start",
+            params={"frames": 5},
+            headers=auth(),
+        )
+        first = client.post("/admin/tracemalloc/snapshots", headers=auth())
+        retained = [bytearray(1024) for _ in range(1000)]
+        second = client.post("/admin/tracemalloc/snapshots", headers=auth())
+        first_id = first.json()["id"]
+        second_id = second.json()["id"]
+        diff = client.get(
+            f"/admin/tracemalloc/snapshots/{first_id}/diff/{second_id}",
+            params={"limit": 5},
+            headers=auth(),
+        )
+        missing = client.get(
+            f"/admin/tracemalloc/snapshots/{first_id}/diff/999",
+            headers=auth(),
+        )
+        stopped = client.post("/admin/tracemalloc/stop", headers=auth())
+
+    assert not_started.status_code == 409
+    assert started.json()["tracing"] is True
+    assert started.json()["frames"] == 5
+    assert diff.status_code == 200
+    assert diff.json()[0]["size_diff_bytes"] >= 1000 * 1024
+    assert any(
+        __file__ in frame
+        for frame in diff.json()[0]["traceback"]
+    )
+    assert missing.status_code == 404
+    assert stopped.json()["tracing"] is False
+    assert stopped.json()["snapshots"] == []
+    assert not tracemalloc.is_tracing()
+    del retained
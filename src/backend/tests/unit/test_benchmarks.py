@@ -0,0 +1,93 @@
+from contextlib import asynccontextmanager
+
+import pytest
+
+from benchmarks.harness import (Benchmark, SuiteSkipped, compare, measure,
+                                run_suites)
+
+
+def make_results(**medians: float) -> dict:
+    return {
+        "benchmarks": {
+            name: {"median": median} for name, median in medians.items()
+        },
+    }
+
+
+def test_compare_flags_regressions_beyond_tolerance() -> None:
+    baseline = make_results(fast=1.0, slow=1.0, gone=1.0)
+    results = make_results(fast=0.5, slow=1.3, added=1.0)
+
+    comparison = compare(results, baseline, tolerance=0.2)
+
+    assert [entry["name"] for entry in comparison["regressions"]] == [
+        "slow"
+    ]
+    assert comparison["regressions"][0]["change"] == pytest.approx(0.3)
+    assert [entry["name"] for entry in comparison["improvements"]] == [
+        "fast"
+    ]
+    assert comparison["missing"] == ["gone"]
+    assert comparison["new"] == ["added"]
+    assert comparison["passed"] is False
+
+
+def test_compare_passes_within_tolerance() -> None:
+    comparison = compare(
+        make_results(stable=1.1),
+        make_results(stable=1.0),
+        tolerance=0.2,
+    )
+
+    assert comparison["regressions"] == []
+    assert comparison["passed"] is True
+
+
+@pytest.mark.asyncio
+async def test_measure_calibrates_sync_and_async_benchmarks() -> None:
+    calls = []
+
+    async def operation() -> None:
+        calls.append(None)
+
+    stats = await measure(
+        Benchmark("op", "test", operation),
+        rounds=3,
+        min_round_seconds=0.001,
+    )
+    sync_stats = await measure(
+        Benchmark("sum", "test", lambda: sum(range(100))),
+        rounds=3,
+        min_round_seconds=0.001,
+    )
+
+    assert stats["number"] > 1
+    assert len(calls) >= stats["number"] * 3
+    assert 0 < stats["min"] <= stats["median"]
+    assert sync_stats["rounds"] == 3
+    assert sync_stats["ops_per_second"] > 0
+
+
+@pytest.mark.asyncio
+async def test_run_suites_records_skipped_suites() -> None:
+    @asynccontextmanager
+    async def available():
+        yield [
+            Benchmark("available.op", "test", lambda: None),
+            Benchmark("available.other", "test", lambda: None),
+        ]
+
+    @asynccontextmanager
+    async def unavailable():
+        raise SuiteSkipped("no database")
+        yield []
+
+    results = await run_suites(
+        {"available": available, "unavailable": unavailable},
+        lambda name: name.endswith(".op"),
+        rounds=2,
+        min_round_seconds=0.001,
+    )
+
+    assert list(results["benchmarks"]) == ["available.op"]
+    assert results["skipped"] == {"unavailable": "no database"}
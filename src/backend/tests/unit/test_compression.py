@@ -0,0 +1,175 @@
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app import compression
+from app.compression import (CompressedBodyCache, get_compression_options,
+                             negotiate_encoding)
+from app.middleware import add_middleware_stack
+
+ITEMS = [
+    {"id": index, "status": "open", "priority": "medium"}
+    for index in range(200)
+]
+
+
+def cache_lookups(result: str) -> float:
+    return REGISTRY.get_sample_value(
+        "http_response_compression_cache_total",
+        {"result": result},
+    ) or 0.0
+
+
+def make_app(cache_max_bytes: int = 1 << 20) -> FastAPI:
+    app = FastAPI()
+    add_middleware_stack(
+        app,
+        "Service Desk Backend",
+        {
+            "encodings": ("gzip",),
+            "min_size": 256,
+            "cache_max_bytes": cache_max_bytes,
+        },
+    )
+
+    @app.get("/items")
+    async def items(response: Response) -> list[dict[str, object]]:
+        response.headers["ETag"] = '"items-1"'
+        return ITEMS
+
+    @app.get("/small")
+    async def small() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @app.get("/encoded")
+    async def encoded() -> Response:
+        return Response(
+            gzip.compress(b"x" * 1000),
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip"},
+        )
+
+    @app.get("/export")
+    async def export() -> StreamingResponse:
+        async def lines():
+            for item in ITEMS:
+                yield json.dumps(item).encode() + b"\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return app
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        (None, None),
+        ("", None),
+        ("gzip", "gzip"),
+        ("gzip, br", "br"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("br;q=0, gzip;q=0.1", "gzip"),
+        ("*", "br"),
+        ("*;q=0.5, br;q=0", "gzip"),
+        ("identity", None),
+        ("gzip;q=bad", None),
+    ],
+)
+def test_negotiate_encoding_follows_q_values(
+    accept_encoding: str | None,
+    expected: str | None,
+) -> None:
+    assert negotiate_encoding(accept_encoding, ("br", "gzip")) == expected
+
+
+def test_compressed_body_cache_evicts_by_size() -> None:
+    cache = CompressedBodyCache(max_bytes=10)
+    cache.set(("/a", '"1"', "gzip"), b"12345")
+    cache.set(("/b", '"1"', "gzip"), b"12345")
+    assert cache.get(("/a", '"1"', "gzip")) == b"12345"
+
+    cache.set(("/c", '"1"', "gzip"), b"123")
+    cache.set(("/d", '"1"', "gzip"), b"x" * 11)
+
+    assert cache.get(("/b", '"1"', "gzip")) is None
+    assert cache.get(("/a", '"1"', "gzip")) == b"12345"
+    assert cache.get(("/d", '"1"', "gzip")) is None
+    assert len(cache) == 2
+
+
+def test_large_json_is_gzipped_with_weak_etag() -> None:
+    with TestClient(make_app()) as client:
+        response = client.get("/items", headers={"Accept-Encoding": "gzip"})
+        plain = client.get("/items", headers={"Accept-Encoding": "identity"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"items-1"'
+    assert int(response.headers["content-length"]) < len(plain.content) / 4
+    assert response.json() == ITEMS
+    assert "server-timing" in response.headers
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] == '"items-1"'
+
+
+def test_small_and_encoded_responses_are_not_compressed() -> None:
+    with TestClient(make_app()) as client:
+        small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+        encoded = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in small.headers
+    assert small.headers["vary"] == "Accept-Encoding"
+    assert encoded.content == b"x" * 1000
+    assert "vary" not in encoded.headers
+
+
+def test_streaming_export_is_compressed_in_chunks() -> None:
+    with TestClient(make_app()) as client:
+        response = client.get("/export", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    lines = response.text.splitlines()
+    assert [json.loads(line) for line in lines] == ITEMS
+
+
+def test_repeat_requests_reuse_precompressed_body(monkeypatch) -> None:
+    calls = []
+    codec = compression.CODECS["gzip"]
+    counting = compression.Codec(
+        "gzip",
+        lambda data: calls.append(data) or codec.compress(data),
+        codec.stream,
+    )
+    monkeypatch.setitem(compression.CODECS, "gzip", counting)
+    hits = cache_lookups("hit")
+
+    with TestClient(make_app()) as client:
+        first = client.get("/items", headers={"Accept-Encoding": "gzip"})
+        second = client.get("/items", headers={"Accept-Encoding": "gzip"})
+
+    assert len(calls) == 1
+    assert cache_lookups("hit") == hits + 1
+    assert first.content == second.content
+    assert second.headers["content-encoding"] == "gzip"
+
+
+def test_compression_options_skip_unavailable_encodings(monkeypatch) -> None:
+    monkeypatch.setattr(compression, "CODECS", {"gzip": object()})
+    monkeypatch.setenv("COMPRESSION_ENCODINGS", "zstd, br, gzip")
+    monkeypatch.setenv("COMPRESSION_MIN_SIZE", "2048")
+    monkeypatch.setenv("COMPRESSION_CACHE_MAX_BYTES", "0")
+
+    assert get_compression_options() == {
+        "encodings": ("gzip",),
+        "min_size": 2048,
+        "cache_max_bytes": 0,
+    }
+
+    monkeypatch.setenv("COMPRESSION_ENCODINGS", "")
+    assert get_compression_options() is None
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta, timezone
+
+from app.api.tickets.etag import etag_matches, list_etag, ticket_etag
+from app.api.tickets.schemas import Ticket
+from app.db.types import TicketPriority, TicketStatus
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+
+def make_ticket(ticket_id: int, updated_at: datetime = NOW) -> Ticket:
+    return Ticket(
+        id=ticket_id,
+        title=f"ticket-{ticket_id}",
+        description="",
+        status=TicketStatus.NEW,
+        priority=TicketPriority.MEDIUM,
+        created_at=NOW,
+        updated_at=updated_at,
+    )
+
+
+def test_ticket_etag_changes_with_updated_at() -> None:
+    etag = ticket_etag(make_ticket(1))
+
+    assert etag == ticket_etag(make_ticket(1))
+    assert etag != ticket_etag(make_ticket(2))
+    assert etag != ticket_etag(
+        make_ticket(1, updated_at=NOW + timedelta(microseconds=1))
+    )
+
+
+def test_list_etag_depends_on_version_and_query() -> None:
+    etag = list_etag("1792281600000000-42", "status=new")
+
+    assert etag == list_etag("1792281600000000-42", "status=new")
+    assert etag != list_etag("1792281600000001-42", "status=new")
+    assert etag != list_etag("1792281600000000-42", "status=done")
+    assert "," not in etag
+
+
+def test_etag_matches_if_none_match_lists() -> None:
+    etag = ticket_etag(make_ticket(1))
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
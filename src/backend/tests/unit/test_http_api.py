@@ -1,11 +1,16 @@
 from datetime import datetime, timezone
 from importlib import import_module
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock
 
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
-from app.api.tickets.dependencies import get_service_desk
-from app.api.tickets.schemas import Ticket
+from app.api.tickets.dependencies import (get_read_service_desk,
+                                          get_service_desk)
+from app.api.tickets.pagination import encode_cursor
+from app.api.tickets.schemas import (Ticket, TicketBulkUpdated,
+                                     TicketFieldsPage, TicketFilters,
+                                     TicketPage, TicketStats)
 from app.db.types import TicketPriority, TicketStatus
 from app.routers import all_routers
 from app.service import create_app
@@ -35,6 +40,9 @@ def create_test_client(monkeypatch, service_desk_mock: AsyncMock) -> TestClient:
     for router in all_routers:
         app.include_router(router)
     app.dependency_overrides[get_service_desk] = lambda: service_desk_mock
+    app.dependency_overrides[get_read_service_desk] = (
+        lambda: service_desk_mock
+    )
 
     return TestClient(app)
 
@@ -68,6 +76,48 @@ def test_create_ticket_endpoint(monkeypatch) -> None:
     service_desk_mock.create_ticket.assert_awaited_once()
 
 
+def test_create_tickets_bulk_endpoint(monkeypatch) -> None:
+    service_desk_mock = AsyncMock()
+    service_desk_mock.create_tickets.return_value = [
+        make_ticket(1),
+        make_ticket(2),
+    ]
+
+    with create_test_client(monkeypatch, service_desk_mock) as client:
+        response = client.post(
+            "/tickets/bulk",
+            json=[{"title": "one"}, {"title": "two", "priority": "high"}],
+        )
+
+    assert response.status_code == 200
+    assert [ticket["id"] for ticket in response.json()] == [1, 2]
+    payloads = service_desk_mock.create_tickets.await_args.args[0]
+    assert [payload.title for payload in payloads] == ["one", "two"]
+
+
+def test_create_tickets_bulk_endpoint_reports_invalid_items(
+    monkeypatch,
+) -> None:
+    monkeypatch.setenv("TICKETS_BULK_MAX_SIZE", "2")
+    service_desk_mock = AsyncMock()
+
+    with create_test_client(monkeypatch, service_desk_mock) as client:
+        invalid_response = client.post(
+            "/tickets/bulk",
+            json=[{"title": "ok"}, {"title": "x" * 256}],
+        )
+        too_large_response = client.post(
+            "/tickets/bulk",
+            json=[{"title": "one"}, {"title": "two"}, {"title": "three"}],
+        )
+
+    assert invalid_response.status_code == 422
+    locations = [error["loc"] for error in invalid_response.json()["detail"]]
+    assert locations == [["body", 1, "title"]]
+    assert too_large_response.status_code == 413
+    service_desk_mock.create_tickets.assert_not_awaited()
+
+
 def test_get_ticket_endpoint_returns_404(monkeypatch) -> None:
     service_desk_mock = AsyncMock()
     service_desk_mock.get_ticket.return_value = None
@@ -79,6 +129,63 @@ def test_get_ticket_endpoint_returns_404(monkeypatch) -> None:
     assert response.json()["detail"] == "Ticket not found"
 
 
+def test_get_ticket_endpoint_supports_etag(monkeypatch) -> None:
+    service_desk_mock = AsyncMock()
+    service_desk_mock.get_ticket.return_value = make_ticket(3)
+
+    with create_test_client(monkeypatch, service_desk_mock) as client:
+        response = client.get("/tickets/3")
+        etag = response.headers["etag"]
+        cached_response = client.get(
+            "/tickets/3",
+            headers={"If-None-Match": etag},
+        )
+        stale_response = client.get(
+            "/tickets/3",
+            headers={"If-None-Match": '"t3-0"'},
+        )
+
+    assert response.status_code == 200
+    assert cached_response.status_code == 304
+    assert cached_response.content == b""
+    assert cached_response.headers["etag"] == etag
+    assert stale_response.status_code == 200
+
+
+def test_list_tickets_endpoint_returns_304_without_listing(
+    monkeypatch,
+) -> None:
+    service_desk_mock = AsyncMock()
+    service_desk_mock.get_tickets_version.return_value = "1000-3"
+    service_desk_mock.list_tickets.return_value = TicketPage(
+        items=[make_ticket(1)],
+    )
+
+    with create_test_client(monkeypatch, service_desk_mock) as client:
+        response = client.get("/tickets?status=new")
+        etag = response.headers["etag"]
+        cached_response = client.get(
+            "/tickets?status=new",
+            headers={"If-None-Match": etag},
+        )
+        other_page_response = client.get(
+            "/tickets?status=done",
+            headers={"If-None-Match": etag},
+        )
+        service_desk_mock.get_tickets_version.return_value = "1000-4"
+        changed_response = client.get(
+            "/tickets?status=new",
+            headers={"If-None-Match": etag},
+        )
+
+    assert response.status_code == 200
+    assert cached_response.status_code == 304
+    assert other_page_response.status_code == 200
+    assert changed_response.status_code == 200
+    assert changed_response.headers["etag"] != etag
+    assert service_desk_mock.list_tickets.await_count == 3
+
+
 def test_update_ticket_endpoint_validates_payload(monkeypatch) -> None:
     service_desk_mock = AsyncMock()
 
@@ -113,15 +220,283 @@ def test_update_ticket_endpoint_returns_ticket(monkeypatch) -> None:
     assert response.json()["title"] == "updated"
 
 
+def test_update_tickets_bulk_endpoint(monkeypatch) -> None:
+    service_desk_mock = AsyncMock()
+    service_desk_mock.update_tickets.return_value = TicketBulkUpdated(
+        updated=[1],
+        not_found=[2],
+    )
+
+    with create_test_client(monkeypatch, service_desk_mock) as client:
+        by_ids_response = client.patch(
+            "/tickets",
+            json={"ids": [1, 2], "changes": {"status": "closed"}},
+        )
+        by_filters_response = client.patch(
+            "/tickets",
+            json={
+                "filters": {"statuses": ["new"]},
+                "changes": {"priority": "high"},
+            },
+        )
+
+    assert by_ids_response.status_code == 200
+    assert by_ids_response.json() == {"updated": [1], "not_found": [2]}
+    assert by_filters_response.status_code == 200
+    first_call, second_call = service_desk_mock.update_tickets.await_args_list
+    assert first_call.args == ({"status": TicketStatus.CLOSED},)
+    assert first_call.kwargs == {"ids": [1, 2], "filters": None}
+    assert second_call.kwargs["filters"] == TicketFilters(
+        statuses=[TicketStatus.NEW],
+    )
+
+
+def test_update_tickets_bulk_endpoint_validates_target(monkeypatch) -> None:
+    service_desk_mock = AsyncMock()
+
+    with create_test_client(monkeypatch, service_desk_mock) as client:
+        both_response = client.patch(
+            "/tickets",
+            json={
+                "ids": [1],
+                "filters": {"statuses": ["new"]},
+                "changes": {"status": "closed"},
+            },
+        )
+        empty_filters_response = client.patch(
+            "/tickets",
+            json={"filters": {}, "changes": {"status": "closed"}},
+        )
+        no_changes_response = client.patch(
+            "/tickets",
+            json={"ids": [1], "changes": {}},
+        )
+
+    assert both_response.status_code == 422
+    assert empty_filters_response.status_code == 422
+    assert no_changes_response.status_code == 400
+    service_desk_mock.update_tickets.assert_not_awaited()
+
+
 def test_list_tickets_endpoint(monkeypatch) -> None:
     service_desk_mock = AsyncMock()
-    service_desk_mock.list_tickets.return_value = [make_ticket(1), make_ticket(2)]
+    service_desk_mock.list_tickets.return_value = TicketPage(
+        items=[make_ticket(1), make_ticket(2)],
+    )
 
     with create_test_client(monkeypatch, service_desk_mock) as client:
         response = client.get("/tickets")
 
     assert response.status_code == 200
     assert [ticket["id"] for ticket in response.json()] == [1, 2]
+    assert "x-next-cursor" not in response.headers
+    assert "serialize;dur=" in response.headers["server-timing"]
+
+
+def test_list_tickets_endpoint_matches_default_serialization(
+    monkeypatch,
+) -> None:
+    tickets = [make_ticket(1), make_ticket(2)]
+    service_desk_mock = AsyncMock()
+    service_desk_mock.list_tickets.return_value = TicketPage(items=tickets)
+    reference_app = FastAPI()
+
+    @reference_app.get("/tickets")
+    async def reference_list() -> list[Ticket]:
+        return tickets
+
+    with create_test_client(monkeypatch, service_desk_mock) as client:
+        response = client.get("/tickets")
+    with TestClient(reference_app) as reference_client:
+        reference_response = reference_client.get("/tickets")
+
+    assert response.content == reference_response.content
+    assert response.headers["content-type"] == (
+        reference_response.headers["content-type"]
+    )
+
+
+def test_list_tickets_endpoint_paginates(monkeypatch) -> None:
+    service_desk_mock = AsyncMock()
+    last_ticket = make_ticket(2)
+    next_cursor = encode_cursor(last_ticket.created_at, last_ticket.id)
+    service_desk_mock.list_tickets.return_value = TicketPage(
+        items=[make_ticket(3), last_ticket],
+        next_cursor=next_cursor,
+    )
+
+    with create_test_client(monkeypatch, service_desk_mock) as client:
+        response = client.get(
+            "/tickets",
+            params={"limit": 2, "cursor": next_cursor},
+        )
+        invalid_response = client.get(
+            "/tickets",
+            params={"cursor": "not-a-cursor"},
+        )
+        too_large_response = client.get("/tickets", params={"limit": 10_000})
+
+    assert response.status_code == 200
+    assert response.headers["x-next-cursor"] == next_cursor
+    service_desk_mock.list_tickets.assert_awaited_once_with(
+        limit=2,
+        after=(last_ticket.created_at, last_ticket.id),
+        filters=TicketFilters(),
+    )
+    assert invalid_response.status_code == 400
+    assert too_large_response.status_code == 422
+
+
+def test_list_tickets_endpoint_limits_fields(monkeypatch) -> None:
+    ticket = make_ticket(1)
+    service_desk_mock = AsyncMock()
+    service_desk_mock.list_ticket_fields.return_value = TicketFieldsPage(
+        items=[ticket.model_dump(include={"id", "title", "created_at"})],
+    )
+
+    with create_test_client(monkeypatch, service_desk_mock) as client:
+        response = client.get(
+            "/tickets",
+            params=[("fields", "title,created_at"), ("fields", "id")],
+        )
+        invalid_response = client.get(
+            "/tickets",
+            params={"fields": "title,secret"},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == [
+        ticket.model_dump(
+            mode="json",
+            include={"id", "title", "created_at"},
+        )
+    ]
+    service_desk_mock.list_ticket_fields.assert_awaited_once_with(
+        ("id", "title", "created_at"),
+        limit=50,
+        after=None,
+        filters=TicketFilters(),
+    )
+    service_desk_mock.list_tickets.assert_not_awaited()
+    assert invalid_response.status_code == 400
+    assert "secret" in invalid_response.json()["detail"]
+
+
+def test_list_tickets_endpoint_passes_filters(monkeypatch) -> None:
+    service_desk_mock = AsyncMock()
+    service_desk_mock.list_tickets.return_value = TicketPage(items=[])
+
+    with create_test_client(monkeypatch, service_desk_mock) as client:
+        response = client.get(
+            "/tickets?status=new&status=in_progress&priority=high"
+        )
+        invalid_response = client.get("/tickets?status=unknown")
+
+    assert response.status_code == 200
+    filters = service_desk_mock.list_tickets.await_args.kwargs["filters"]
+    assert filters == TicketFilters(
+        statuses=[TicketStatus.NEW, TicketStatus.IN_PROGRESS],
+        priorities=[TicketPriority.HIGH],
+    )
+    assert invalid_response.status_code == 422
+
+
+def test_ticket_stats_endpoint(monkeypatch) -> None:
+    service_desk_mock = AsyncMock()
+    service_desk_mock.get_ticket_stats.return_value = TicketStats(
+        total=1,
+        by_status={TicketStatus.NEW: 1},
+        by_priority={TicketPriority.MEDIUM: 1},
+        counts=[],
+    )
+
+    with create_test_client(monkeypatch, service_desk_mock) as client:
+        response = client.get("/tickets/stats")
+
+    assert response.status_code == 200
+    assert response.json()["by_status"] == {"new": 1}
+    service_desk_mock.get_ticket.assert_not_awaited()
+
+
+def test_search_tickets_endpoint(monkeypatch) -> None:
+    service_desk_mock = AsyncMock()
+    service_desk_mock.search_tickets.return_value = [make_ticket(4)]
+
+    with create_test_client(monkeypatch, service_desk_mock) as client:
+        response = client.get(
+            "/tickets/search",
+            params={"q": "printer", "status": "new", "limit": 5},
+        )
+        missing_query_response = client.get("/tickets/search")
+        openapi = client.get("/openapi.json").json()
+
+    assert response.status_code == 200
+    assert [ticket["id"] for ticket in response.json()] == [4]
+    service_desk_mock.search_tickets.assert_awaited_once_with(
+        filters=TicketFilters(statuses=[TicketStatus.NEW], query="printer"),
+        limit=5,
+    )
+    assert missing_query_response.status_code == 422
+    parameters = openapi["paths"]["/tickets/search"]["get"]["parameters"]
+    query_parameters = [item for item in parameters if item["name"] == "q"]
+    assert len(query_parameters) == 1
+    assert query_parameters[0]["required"] is True
+
+
+def stream_partitions(*partitions: list[Ticket]):
+    async def _stream(**_):
+        for partition in partitions:
+            yield partition
+
+    return Mock(side_effect=_stream)
+
+
+def test_export_tickets_streams_ndjson(monkeypatch) -> None:
+    service_desk_mock = AsyncMock()
+    service_desk_mock.stream_tickets = stream_partitions(
+        [make_ticket(1), make_ticket(2)],
+        [make_ticket(3)],
+    )
+
+    with create_test_client(monkeypatch, service_desk_mock) as client:
+        response = client.get("/tickets/export?status=new")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert [Ticket.model_validate_json(line).id for line in lines] == [
+        1,
+        2,
+        3,
+    ]
+    filters = service_desk_mock.stream_tickets.call_args.kwargs["filters"]
+    assert filters == TicketFilters(statuses=[TicketStatus.NEW])
+
+
+def test_export_tickets_streams_csv(monkeypatch) -> None:
+    service_desk_mock = AsyncMock()
+    service_desk_mock.stream_tickets = stream_partitions([make_ticket(7)])
+
+    with create_test_client(monkeypatch, service_desk_mock) as client:
+        response = client.get("/tickets/export", params={"format": "csv"})
+        empty_mock = AsyncMock()
+        empty_mock.stream_tickets = stream_partitions()
+        client.app.dependency_overrides[get_read_service_desk] = (
+            lambda: empty_mock
+        )
+        empty_response = client.get(
+            "/tickets/export",
+            params={"format": "csv"},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    header, row = response.text.splitlines()
+    assert header == (
+        "id,title,description,status,priority,created_at,updated_at"
+    )
+    assert row.startswith("7,ticket-7,desc,new,medium,")
+    assert empty_response.text.splitlines() == [header]
 
 
 def test_delete_ticket_endpoint_success_and_404(monkeypatch) -> None:
@@ -0,0 +1,152 @@
+import argparse
+import importlib.util
+import random
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+LOADGEN_PATH = (
+    Path(__file__).resolve().parents[4] / "tools" / "loadgen" / "loadgen.py"
+)
+
+
+def load_loadgen():
+    spec = importlib.util.spec_from_file_location("loadgen", LOADGEN_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+loadgen = load_loadgen()
+
+
+def make_args(*slo: str) -> argparse.Namespace:
+    return loadgen.parse_args(
+        ["--rate", "100"] + [f"--slo={item}" for item in slo]
+    )
+
+
+def make_run(**latencies_ms: list[int]) -> argparse.Namespace:
+    stats = {}
+    for name, values in latencies_ms.items():
+        scenario = loadgen.ScenarioStats()
+        for value in values:
+            scenario.latency.record(value * 1000)
+        stats[name] = scenario
+    return argparse.Namespace(stats=stats)
+
+
+def test_histogram_percentiles_keep_three_significant_digits() -> None:
+    histogram = loadgen.LatencyHistogram()
+    for value in range(1, 10_001):
+        histogram.record(value)
+
+    assert histogram.value_at_percentile(50) == 5000
+    assert histogram.value_at_percentile(99) == 9900
+    assert histogram.value_at_percentile(100) == 10_000
+    histogram.record(123_456)
+    assert histogram.value_at_percentile(100) == 123_456
+    assert loadgen.LatencyHistogram().value_at_percentile(99) == 0
+
+
+def test_histogram_merge_and_summary() -> None:
+    first = loadgen.LatencyHistogram()
+    second = loadgen.LatencyHistogram()
+    first.record(1000)
+    second.record(3000)
+
+    first.merge(second)
+    summary = first.summary_ms()
+
+    assert first.total_count == 2
+    assert summary["p50"] == 1.0
+    assert summary["p999"] == 3.0
+    assert summary["max"] == 3.0
+    assert summary["mean"] == 2.0
+
+
+def test_parse_mix_reads_weights() -> None:
+    assert loadgen.parse_mix("get=5, list , delete=0") == {
+        "get": 5.0,
+        "list": 1.0,
+        "delete": 0.0,
+    }
+
+
+@pytest.mark.parametrize("raw", ["search=1", "get=0,list=0", "get=x"])
+def test_parse_mix_rejects_bad_input(raw: str) -> None:
+    with pytest.raises((argparse.ArgumentTypeError, ValueError)):
+        loadgen.parse_mix(raw)
+
+
+def test_slo_parse_reads_scenario_and_metric() -> None:
+    assert loadgen.SloCheck.parse("list.p95=100") == loadgen.SloCheck(
+        metric="p95",
+        threshold=100.0,
+        scenario="list",
+    )
+    assert loadgen.SloCheck.parse("error_rate=0.01").scenario is None
+
+
+@pytest.mark.parametrize("raw", ["p98=10", "p99", "p99=", "list.p95"])
+def test_slo_parse_rejects_bad_input(raw: str) -> None:
+    with pytest.raises(argparse.ArgumentTypeError):
+        loadgen.SloCheck.parse(raw)
+
+
+def test_report_evaluates_slo_checks() -> None:
+    run = make_run(get=[10] * 99 + [900], list=[20] * 10)
+    args = make_args("p50=15", "list.p95=15", "search.p99=1")
+
+    report = loadgen.build_report(run, args, elapsed=1.0, dropped=0)
+
+    verdicts = {
+        (check["scenario"], check["metric"]): check["passed"]
+        for check in report["slo"]["checks"]
+    }
+    assert verdicts == {
+        ("overall", "p50"): True,
+        ("list", "p95"): False,
+        ("search", "p99"): False,
+    }
+    assert report["slo"]["passed"] is False
+    assert report["throughput_rps"] == 110.0
+
+
+def test_dropped_requests_count_toward_error_rate() -> None:
+    run = make_run(get=[10] * 90)
+    args = make_args("error_rate=0.05")
+
+    report = loadgen.build_report(run, args, elapsed=1.0, dropped=10)
+
+    assert report["overall"]["count"] == 90
+    assert report["overall"]["errors"] == 10
+    assert report["overall"]["error_rate"] == 0.1
+    assert report["overall"]["errors_by_kind"] == {"dropped": 10}
+    assert report["scenarios"]["get"]["error_rate"] == 0.0
+    assert report["slo"]["passed"] is False
+
+
+@pytest.mark.asyncio
+async def test_unreadable_response_counts_as_error() -> None:
+    bodies = [b"<html>bad gateway</html>", b"[]", b'{"title": "no id"}']
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(201, content=bodies.pop(0))
+
+    async with httpx.AsyncClient(
+        transport=httpx.MockTransport(handler),
+        base_url="http://test",
+    ) as client:
+        run = loadgen.LoadRun(client, {"create": 1.0}, random.Random(1))
+        run.recording = True
+        for _ in range(3):
+            await run.execute()
+
+    stats = run.stats["create"]
+    assert stats.errors == {"bad_response": 3}
+    assert stats.latency.total_count == 3
+    assert len(run.pool) == 0
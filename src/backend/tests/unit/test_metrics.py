@@ -1,6 +1,17 @@
+from unittest.mock import Mock
+
+import pytest
 from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.util import greenlet_spawn
 
+from app.db.pool import InstrumentedQueuePool, get_engine_options
+from app.db.round_trips import count_round_trips, install_round_trip_counter
+from app.db.statements import (fingerprint_statement,
+                               install_statement_metrics, normalize_statement)
 from app.service import create_app
+from app.timing import record_phase, timed_phase, track_request_timing
 
 
 def test_metrics_endpoint_returns_prometheus_metrics(monkeypatch) -> None:
@@ -28,3 +39,225 @@ def test_metrics_endpoint_returns_prometheus_metrics(monkeypatch) -> None:
     assert 'method="GET"' in metrics_response.text
     assert 'status="200"' in metrics_response.text
     assert "http_request_duration_seconds" in metrics_response.text
+
+
+def test_round_trip_counter_counts_statements_and_commits() -> None:
+    sync_engine = create_engine("sqlite://")
+    install_round_trip_counter(Mock(sync_engine=sync_engine))
+
+    with sync_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        with count_round_trips() as counter:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+            connection.commit()
+        connection.execute(text("SELECT 3"))
+
+    assert counter.count == 3
+
+
+def test_metrics_endpoint_exposes_db_round_trips(monkeypatch) -> None:
+    monkeypatch.setenv("POSTGRES_USER", "service_desk")
+    monkeypatch.setenv("POSTGRES_PASSWORD", "service_desk")
+    monkeypatch.setenv("POSTGRES_DB", "service_desk")
+
+    app = create_app()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int) -> dict[str, int]:
+        return {"id": item_id}
+
+    with TestClient(app) as client:
+        client.get("/items/1")
+        metrics_response = client.get("/metrics")
+
+    assert (
+        'db_round_trips_per_request_count{handler="/items/{item_id}",'
+        'method="GET"}'
+    ) in metrics_response.text
+
+
+def pool_metric(name: str, pool: str) -> float | None:
+    return REGISTRY.get_sample_value(name, {"pool": pool})
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_reports_checkouts_and_timeouts() -> None:
+    pool = InstrumentedQueuePool(
+        Mock,
+        pool_size=1,
+        max_overflow=1,
+        timeout=0.01,
+        logging_name="test-pool",
+    )
+    checkouts_before = (
+        pool_metric("db_pool_checkout_seconds_count", "test-pool") or 0
+    )
+
+    first = await greenlet_spawn(pool.connect)
+    second = await greenlet_spawn(pool.connect)
+    assert pool_metric(
+        "db_pool_checked_out_connections",
+        "test-pool",
+    ) == 2
+    assert pool_metric("db_pool_overflow_connections", "test-pool") == 1
+    with pytest.raises(exc.TimeoutError):
+        await greenlet_spawn(pool.connect)
+    await greenlet_spawn(second.close)
+    await greenlet_spawn(first.close)
+
+    assert pool_metric("db_pool_checked_out_connections", "test-pool") == 0
+    assert pool_metric("db_pool_size", "test-pool") == 1
+    assert pool_metric(
+        "db_pool_checkout_timeouts_total",
+        "test-pool",
+    ) == 1
+    assert pool_metric(
+        "db_pool_checkout_seconds_count",
+        "test-pool",
+    ) == checkouts_before + 3
+
+
+def test_engine_options_read_pool_settings(monkeypatch) -> None:
+    monkeypatch.setenv("DATABASE_POOL_SIZE", "20")
+    monkeypatch.setenv("DATABASE_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("DATABASE_POOL_TIMEOUT", "2.5")
+    monkeypatch.setenv("DATABASE_POOL_RECYCLE", "600")
+    monkeypatch.setenv("DATABASE_POOL_PRE_PING", "1")
+
+    options = get_engine_options("replica")
+
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_logging_name"] == "replica"
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 0
+    assert options["pool_timeout"] == 2.5
+    assert options["pool_recycle"] == 600
+    assert options["pool_pre_ping"] is True
+    assert "connect_args" not in options
+
+
+def test_engine_options_default_to_recycle_without_pre_ping(
+    monkeypatch,
+) -> None:
+    monkeypatch.delenv("DATABASE_POOL_PRE_PING", raising=False)
+    monkeypatch.delenv("DATABASE_POOL_RECYCLE", raising=False)
+
+    options = get_engine_options("primary")
+
+    assert options["pool_pre_ping"] is False
+    assert options["pool_recycle"] == 1800
+
+
+def test_engine_options_disable_statement_cache_for_pgbouncer(
+    monkeypatch,
+) -> None:
+    monkeypatch.setenv("DATABASE_PGBOUNCER", "1")
+
+    connect_args = get_engine_options("primary")["connect_args"]
+
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    name_func = connect_args["prepared_statement_name_func"]
+    assert name_func() != name_func()
+
+
+def test_normalize_statement_collapses_literals_and_lists() -> None:
+    short = normalize_statement(
+        "SELECT tickets.id FROM tickets\n"
+        "WHERE tickets.status IN ('new') AND tickets.id > $1 LIMIT 51"
+    )
+    long = normalize_statement(
+        "SELECT tickets.id FROM tickets "
+        "WHERE tickets.status IN ('new', 'in_progress') "
+        "AND tickets.id > $7 LIMIT 11"
+    )
+    rows = normalize_statement(
+        "INSERT INTO tickets (title) VALUES ($1::VARCHAR), ($2::VARCHAR)"
+    )
+
+    assert short == long
+    assert short == (
+        "SELECT tickets.id FROM tickets "
+        "WHERE tickets.status IN (...) AND tickets.id > ? LIMIT ?"
+    )
+    assert rows == "INSERT INTO tickets (title) VALUES (...), ..."
+    assert fingerprint_statement("select 1")[1] == "SELECT"
+
+
+def test_statement_metrics_record_latency_rows_and_slow_log(
+    caplog,
+) -> None:
+    sync_engine = create_engine("sqlite://")
+    install_statement_metrics(
+        Mock(sync_engine=sync_engine),
+        slow_query_ms=0,
+        explain_sample_rate=1,
+    )
+    statement = "SELECT 4242 UNION ALL SELECT 4343"
+    fingerprint, operation, _ = fingerprint_statement(statement)
+    labels = {"fingerprint": fingerprint, "operation": operation}
+    count_before = REGISTRY.get_sample_value(
+        "db_statement_duration_seconds_count",
+        labels,
+    ) or 0
+
+    with caplog.at_level("WARNING", logger="app.db.statements"):
+        with sync_engine.connect() as connection:
+            rows = connection.execute(text(statement)).all()
+            assert connection.execute(text("SELECT 1")).scalar() == 1
+
+    assert len(rows) == 2
+    assert REGISTRY.get_sample_value(
+        "db_statement_duration_seconds_count",
+        labels,
+    ) == count_before + 1
+    slow_records = [
+        record for record in caplog.records
+        if getattr(record, "fingerprint", None) == fingerprint
+    ]
+    assert slow_records
+    assert slow_records[0].statement == "SELECT ? UNION ALL SELECT ?"
+    assert any(
+        record.getMessage().startswith("EXPLAIN failed")
+        for record in caplog.records
+    )
+
+
+def test_request_timing_collects_phases() -> None:
+    record_phase("db", 1.0)
+    with track_request_timing() as timing:
+        record_phase("db", 0.002)
+        record_phase("db", 0.003)
+        with timed_phase("serialize"):
+            pass
+
+    assert timing.phases["db"] == 0.005
+    assert set(timing.phases) == {"db", "serialize"}
+    header = timing.server_timing(0.0125)
+    assert header.startswith("db;dur=5.0, serialize;dur=")
+    assert header.endswith("total;dur=12.5")
+
+
+def test_server_timing_header_and_phase_metrics(monkeypatch) -> None:
+    monkeypatch.setenv("POSTGRES_USER", "service_desk")
+    monkeypatch.setenv("POSTGRES_PASSWORD", "service_desk")
+    monkeypatch.setenv("POSTGRES_DB", "service_desk")
+
+    app = create_app()
+
+    @app.get("/timed/{item_id}")
+    async def timed(item_id: int) -> dict[str, int]:
+        record_phase("db", 0.001)
+        return {"id": item_id}
+
+    with TestClient(app) as client:
+        response = client.get("/timed/1")
+
+    assert response.headers["server-timing"].startswith("db;dur=1.0, ")
+    assert "total;dur=" in response.headers["server-timing"]
+    for phase in ("db", "other"):
+        assert REGISTRY.get_sample_value(
+            "http_request_phase_seconds_count",
+            {"handler": "/timed/{item_id}", "phase": phase},
+        ) == 1
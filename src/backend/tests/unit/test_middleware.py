@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.context import get_request_id
+from app.middleware import REQUEST_ID_HEADER, add_middleware_stack
+
+
+def stream_round_trips() -> float:
+    return REGISTRY.get_sample_value(
+        "db_round_trips_per_request_count",
+        {"method": "GET", "handler": "/stream"},
+    ) or 0.0
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    add_middleware_stack(app, "Service Desk Backend")
+
+    @app.get("/request-id")
+    async def request_id() -> dict[str, str | None]:
+        return {"request_id": get_request_id()}
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks():
+            for chunk in (b"a", b"b", b"c"):
+                yield chunk
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+def test_request_id_is_generated_and_exposed() -> None:
+    with TestClient(make_app()) as client:
+        response = client.get("/request-id")
+
+    request_id = response.headers[REQUEST_ID_HEADER]
+    assert len(request_id) == 32
+    assert response.json() == {"request_id": request_id}
+    assert get_request_id() is None
+
+
+@pytest.mark.parametrize(
+    ("incoming", "reused"),
+    [
+        ("3f2c9a1e-ingress.42", True),
+        ("bad id\twith spaces", False),
+        ("x" * 129, False),
+    ],
+)
+def test_incoming_request_id_is_validated(
+    incoming: str,
+    reused: bool,
+) -> None:
+    with TestClient(make_app()) as client:
+        response = client.get(
+            "/request-id",
+            headers={REQUEST_ID_HEADER: incoming},
+        )
+
+    assert (response.headers[REQUEST_ID_HEADER] == incoming) is reused
+    assert response.json()["request_id"] == response.headers[
+        REQUEST_ID_HEADER
+    ]
+
+
+def test_root_message_skips_router_but_keeps_headers() -> None:
+    with TestClient(make_app()) as client:
+        response = client.get("/")
+
+    assert response.status_code == 200
+    assert response.text == "Service Desk Backend"
+    assert REQUEST_ID_HEADER in response.headers
+    assert response.headers["server-timing"].startswith("total;dur=")
+
+
+@pytest.mark.asyncio
+async def test_streaming_body_passes_through_unbuffered() -> None:
+    app = make_app()
+    observed = stream_round_trips()
+    messages = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()
+
+    async def send(message) -> None:
+        messages.append(message)
+
+    await app(
+        {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/stream",
+            "raw_path": b"/stream",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [],
+            "server": ("test", 80),
+            "client": ("test", 1234),
+        },
+        receive,
+        send,
+    )
+
+    start, *body = messages
+    headers = dict(start["headers"])
+    assert b"server-timing" in headers
+    assert b"x-request-id" in headers
+    assert [message["body"] for message in body if message["body"]] == [
+        b"a",
+        b"b",
+        b"c",
+    ]
+    assert stream_round_trips() == observed + 1
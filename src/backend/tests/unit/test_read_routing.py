@@ -0,0 +1,135 @@
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+from fastapi import Response
+from sqlalchemy.exc import OperationalError
+
+from app.api.tickets import dependencies
+from app.db import session as db_session
+from app.db.replica import READ_PRIMARY_COOKIE, ReplicaMonitor
+
+pytestmark = pytest.mark.asyncio
+
+
+def make_engine(*lags: object) -> Mock:
+    connection = Mock()
+    connection.scalar = AsyncMock(side_effect=lags)
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=connection)
+    context.__aexit__ = AsyncMock(return_value=False)
+    engine = Mock()
+    engine.connect.return_value = context
+    return engine
+
+
+def make_session_factory(name: str) -> Mock:
+    session = Mock(info={}, name=name)
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=session)
+    context.__aexit__ = AsyncMock(return_value=False)
+    return Mock(return_value=context)
+
+
+async def read_session(cookies: dict[str, str] | None = None) -> Mock:
+    request = Mock(cookies=cookies or {})
+    sessions = db_session.get_read_session(request)
+    session = await anext(sessions)
+    await sessions.aclose()
+    return session
+
+
+async def test_replica_monitor_caches_check_result() -> None:
+    now = [0.0]
+    engine = make_engine(0.5, 10.0)
+    monitor = ReplicaMonitor(
+        engine,
+        max_lag=5.0,
+        check_interval=1.0,
+        clock=lambda: now[0],
+    )
+
+    assert await monitor.is_usable() is True
+    now[0] = 0.5
+    assert await monitor.is_usable() is True
+    now[0] = 1.5
+    assert await monitor.is_usable() is False
+    assert engine.connect.call_count == 2
+
+
+async def test_replica_monitor_rejects_non_streaming_replica() -> None:
+    monitor = ReplicaMonitor(make_engine(None), max_lag=5.0)
+
+    assert await monitor.is_usable() is False
+
+
+async def test_replica_monitor_reports_unavailable_replica() -> None:
+    engine = make_engine(OperationalError("SELECT 1", {}, OSError()))
+    monitor = ReplicaMonitor(engine)
+
+    assert await monitor.is_usable() is False
+
+
+async def test_read_session_uses_primary_without_replica(monkeypatch) -> None:
+    monkeypatch.setattr(
+        db_session,
+        "get_session_factory",
+        lambda: make_session_factory("primary"),
+    )
+    monkeypatch.setattr(db_session, "get_read_engine", lambda: None)
+
+    session = await read_session()
+
+    assert session.info[db_session.REPLICA_SESSION_INFO_KEY] is False
+
+
+async def test_read_session_routes_to_healthy_replica(monkeypatch) -> None:
+    monitor = Mock(is_usable=AsyncMock(return_value=True))
+    monkeypatch.setattr(
+        db_session,
+        "get_session_factory",
+        lambda: make_session_factory("primary"),
+    )
+    monkeypatch.setattr(
+        db_session,
+        "get_read_session_factory",
+        lambda: make_session_factory("replica"),
+    )
+    monkeypatch.setattr(db_session, "get_read_engine", lambda: Mock())
+    monkeypatch.setattr(db_session, "get_replica_monitor", lambda _: monitor)
+
+    replica_session = await read_session()
+    sticky_session = await read_session({READ_PRIMARY_COOKIE: "1"})
+    monitor.is_usable.return_value = False
+    lagging_session = await read_session()
+
+    assert replica_session.info[db_session.REPLICA_SESSION_INFO_KEY] is True
+    assert sticky_session.info[db_session.REPLICA_SESSION_INFO_KEY] is False
+    assert lagging_session.info[db_session.REPLICA_SESSION_INFO_KEY] is False
+    assert monitor.is_usable.await_count == 2
+
+
+async def test_read_service_desk_does_not_fill_cache_from_replica() -> None:
+    replica_session = Mock(info={db_session.REPLICA_SESSION_INFO_KEY: True})
+    primary_session = Mock(info={db_session.REPLICA_SESSION_INFO_KEY: False})
+
+    replica_service = dependencies.get_read_service_desk(replica_session)
+    primary_service = dependencies.get_read_service_desk(primary_session)
+
+    assert replica_service._fill_cache is False
+    assert primary_service._fill_cache is True
+
+
+async def test_stick_to_primary_sets_cookie_with_replica(monkeypatch) -> None:
+    monkeypatch.setenv("DATABASE_READ_STICKY_SECONDS", "7")
+    without_replica = Response()
+    with_replica = Response()
+
+    monkeypatch.setattr(dependencies, "get_read_engine", lambda: None)
+    dependencies.stick_to_primary(without_replica)
+    monkeypatch.setattr(dependencies, "get_read_engine", lambda: Mock())
+    dependencies.stick_to_primary(with_replica)
+
+    assert "set-cookie" not in without_replica.headers
+    cookie = with_replica.headers["set-cookie"]
+    assert cookie.startswith(f"{READ_PRIMARY_COOKIE}=1")
+    assert "Max-Age=7" in cookie
@@ -0,0 +1,91 @@
+import os
+
+import pytest
+
+from app import server
+from app.metrics import mark_worker_dead
+
+
+def test_cpu_limit_reads_cgroup_v2(tmp_path) -> None:
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    assert server.get_cpu_limit(tmp_path) == 1.5
+
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert server.get_cpu_limit(tmp_path) is None
+
+
+def test_cpu_limit_falls_back_to_cgroup_v1(tmp_path) -> None:
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("50000\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+    assert server.get_cpu_limit(tmp_path) == 0.5
+
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1\n")
+    assert server.get_cpu_limit(tmp_path) is None
+    assert server.get_cpu_limit(tmp_path / "missing") is None
+
+
+@pytest.mark.parametrize(
+    ("cpu_limit", "available", "workers"),
+    [
+        (0.5, 8, 1),
+        (1.0, 8, 1),
+        (1.5, 8, 2),
+        (4.0, 2, 2),
+        (None, 3, 3),
+    ],
+)
+def test_workers_follow_cpu_quota(
+    monkeypatch,
+    cpu_limit: float | None,
+    available: int,
+    workers: int,
+) -> None:
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    assert server.get_workers(cpu_limit, available) == workers
+
+
+def test_web_concurrency_overrides_cpu_quota(monkeypatch) -> None:
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    assert server.get_workers(0.5, 8) == 4
+
+
+def test_build_config_reads_recycling_settings(monkeypatch) -> None:
+    monkeypatch.setenv("UVICORN_MAX_REQUESTS", "0")
+    assert server.build_config(2).limit_max_requests is None
+
+    monkeypatch.setenv("UVICORN_MAX_REQUESTS", "10000")
+    monkeypatch.setenv("UVICORN_MAX_REQUESTS_JITTER", "500")
+    monkeypatch.setenv("UVICORN_GRACEFUL_TIMEOUT", "15")
+    config = server.build_config(2)
+
+    assert config.workers == 2
+    assert config.limit_max_requests == 10000
+    assert config.limit_max_requests_jitter == 500
+    assert config.timeout_graceful_shutdown == 15
+    assert config.loop == server.select_loop()
+    assert config.http == server.select_http()
+
+
+def test_prepare_multiproc_dir_drops_previous_files(
+    monkeypatch,
+    tmp_path,
+) -> None:
+    path = tmp_path / "metrics"
+    path.mkdir()
+    (path / "counter_1.db").write_bytes(b"stale")
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(path))
+
+    assert server.prepare_multiproc_dir() == path
+    assert list(path.iterdir()) == []
+
+
+def test_mark_worker_dead_removes_live_gauges(monkeypatch, tmp_path) -> None:
+    pid = os.getpid()
+    for name in (f"gauge_livesum_{pid}.db", f"counter_{pid}.db"):
+        (tmp_path / name).write_bytes(b"")
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    mark_worker_dead()
+
+    assert [path.name for path in tmp_path.iterdir()] == [f"counter_{pid}.db"]
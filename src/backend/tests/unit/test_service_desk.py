@@ -2,7 +2,11 @@ from datetime import datetime, timezone
 from unittest.mock import AsyncMock, Mock
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
+from app.api.tickets.cache import TicketCache
+from app.api.tickets.pagination import decode_cursor
+from app.api.tickets.schemas import TicketCreate, TicketFilters
 from app.api.tickets.service import ServiceDesk
 from app.db.models import Ticket as TicketModel
 from app.db.types import TicketPriority, TicketStatus
@@ -32,11 +36,39 @@ def service_desk(mock_session: Mock) -> ServiceDesk:
     return ServiceDesk(mock_session)
 
 
+def make_row(ticket_id: int = 1, **overrides: object) -> Mock:
+    now = datetime.now(timezone.utc)
+    values = {
+        "id": ticket_id,
+        "title": "test",
+        "description": "",
+        "status": TicketStatus.NEW,
+        "priority": TicketPriority.MEDIUM,
+        "created_at": now,
+        "updated_at": now,
+    }
+    values.update(overrides)
+    return Mock(**values)
+
+
+def compile_query(query: object) -> str:
+    return str(
+        query.compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={"render_postcompile": True},
+        )
+    )
+
+
 async def test_create_ticket_returns_id_and_timestamp(
-    service_desk: ServiceDesk,
     mock_session: Mock,
 ) -> None:
-    result = await service_desk.create_ticket(title="test")
+    result = Mock()
+    result.one.return_value = make_row(1)
+    mock_session.execute = AsyncMock(return_value=result)
+    service = ServiceDesk(mock_session)
+
+    result = await service.create_ticket(title="test")
 
     assert isinstance(result.id, int)
     assert isinstance(result.created_at, datetime)
@@ -45,11 +77,13 @@ async def test_create_ticket_returns_id_and_timestamp(
     assert result.status == TicketStatus.NEW
     assert result.priority == TicketPriority.MEDIUM
 
-    mock_session.add.assert_called_once()
-    added_ticket = mock_session.add.call_args.args[0]
-    assert isinstance(added_ticket, TicketModel)
+    mock_session.execute.assert_awaited_once()
+    sql = compile_query(mock_session.execute.await_args.args[0])
+    assert sql.startswith("INSERT INTO tickets")
+    assert "RETURNING" in sql
     mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_awaited_once_with(added_ticket)
+    mock_session.add.assert_not_called()
+    mock_session.refresh.assert_not_awaited()
 
 
 async def test_get_ticket_returns_none_when_missing(mock_session: Mock) -> None:
@@ -90,34 +124,34 @@ async def test_get_ticket_returns_ticket(mock_session: Mock) -> None:
 
 
 async def test_create_ticket_default_description(mock_session: Mock) -> None:
+    result = Mock()
+    result.one.return_value = make_row(1)
+    mock_session.execute = AsyncMock(return_value=result)
     service = ServiceDesk(mock_session)
-    result = await service.create_ticket(title="test")
 
-    mock_session.add.assert_called_once()
-    added_ticket = mock_session.add.call_args.args[0]
-    assert isinstance(added_ticket, TicketModel)
-    assert added_ticket.description == ""
-    assert added_ticket.status == TicketStatus.NEW
-    assert added_ticket.priority == TicketPriority.MEDIUM
+    await service.create_ticket(title="test")
 
+    query = mock_session.execute.await_args.args[0]
+    params = query.compile().params
+    assert params["description"] == ""
+    assert params["status"] == TicketStatus.NEW
+    assert params["priority"] == TicketPriority.MEDIUM
 
-async def test_update_ticket_updates_description(mock_session: Mock) -> None:
-    ticket_model = TicketModel()
-    ticket_model.id = 5
-    ticket_model.created_at = datetime.now(timezone.utc)
-    ticket_model.updated_at = datetime.now(timezone.utc)
-    ticket_model.title = "old"
-    ticket_model.description = "old"
-    ticket_model.status = TicketStatus.NEW
-    ticket_model.priority = TicketPriority.MEDIUM
 
+async def test_update_ticket_updates_description(mock_session: Mock) -> None:
     result = Mock()
-    result.scalar_one_or_none.return_value = ticket_model
+    result.one_or_none.return_value = make_row(
+        5,
+        title="new title",
+        description="new",
+        status=TicketStatus.DONE,
+        priority=TicketPriority.HIGH,
+    )
     mock_session.execute = AsyncMock(return_value=result)
 
     service = ServiceDesk(mock_session)
     updated = await service.update_ticket(
-        ticket_model.id,
+        5,
         description="new",
         status=TicketStatus.DONE,
         priority=TicketPriority.HIGH,
@@ -129,10 +163,63 @@ async def test_update_ticket_updates_description(mock_session: Mock) -> None:
     assert updated.title == "new title"
     assert updated.status == TicketStatus.DONE
     assert updated.priority == TicketPriority.HIGH
-    assert ticket_model.description == "new"
+    mock_session.execute.assert_awaited_once()
+    query = mock_session.execute.await_args.args[0]
+    sql = compile_query(query)
+    assert sql.startswith("UPDATE tickets SET")
+    assert "updated_at=" not in sql
+    assert "RETURNING" in sql
+    assert query.compile().params["description"] == "new"
     mock_session.commit.assert_awaited_once()
 
 
+async def test_update_ticket_returns_none_when_missing(
+    mock_session: Mock,
+) -> None:
+    result = Mock()
+    result.one_or_none.return_value = None
+    mock_session.execute = AsyncMock(return_value=result)
+
+    service = ServiceDesk(mock_session)
+    updated = await service.update_ticket(5, title="new title")
+
+    assert updated is None
+    mock_session.execute.assert_awaited_once()
+
+
+async def test_update_ticket_without_changes_skips_update(
+    mock_session: Mock,
+) -> None:
+    result = Mock()
+    result.scalar_one_or_none.return_value = None
+    mock_session.execute = AsyncMock(return_value=result)
+
+    service = ServiceDesk(mock_session)
+    updated = await service.update_ticket(5)
+
+    assert updated is None
+    query = mock_session.execute.await_args.args[0]
+    assert compile_query(query).startswith("SELECT")
+    mock_session.commit.assert_not_awaited()
+
+
+async def test_delete_ticket_uses_single_statement(mock_session: Mock) -> None:
+    result = Mock()
+    result.scalar_one_or_none.side_effect = [7, None]
+    mock_session.execute = AsyncMock(return_value=result)
+
+    service = ServiceDesk(mock_session)
+    deleted = await service.delete_ticket(7)
+    missing = await service.delete_ticket(8)
+
+    assert deleted is True
+    assert missing is False
+    assert mock_session.execute.await_count == 2
+    sql = compile_query(mock_session.execute.await_args.args[0])
+    assert sql.startswith("DELETE FROM tickets")
+    assert "RETURNING tickets.id" in sql
+
+
 async def test_list_tickets_returns_models(mock_session: Mock) -> None:
     ticket_one = TicketModel()
     ticket_one.id = 1
@@ -153,10 +240,258 @@ async def test_list_tickets_returns_models(mock_session: Mock) -> None:
     ticket_two.priority = TicketPriority.MEDIUM
 
     result = Mock()
-    result.scalars.return_value.all.return_value = [ticket_one, ticket_two]
+    result.all.return_value = [ticket_one, ticket_two]
+    mock_session.execute = AsyncMock(return_value=result)
+
+    service = ServiceDesk(mock_session)
+    page = await service.list_tickets()
+
+    assert [ticket.id for ticket in page.items] == [
+        ticket_one.id,
+        ticket_two.id,
+    ]
+    assert page.next_cursor is None
+
+
+async def test_list_tickets_returns_next_cursor(mock_session: Mock) -> None:
+    tickets = []
+    for ticket_id in (3, 2, 1):
+        ticket = TicketModel()
+        ticket.id = ticket_id
+        ticket.created_at = datetime(2026, 1, ticket_id, tzinfo=timezone.utc)
+        ticket.updated_at = ticket.created_at
+        ticket.title = f"ticket-{ticket_id}"
+        ticket.description = ""
+        ticket.status = TicketStatus.NEW
+        ticket.priority = TicketPriority.MEDIUM
+        tickets.append(ticket)
+
+    result = Mock()
+    result.all.return_value = tickets
     mock_session.execute = AsyncMock(return_value=result)
 
     service = ServiceDesk(mock_session)
-    tickets = await service.list_tickets()
+    page = await service.list_tickets(limit=2)
+
+    assert [ticket.id for ticket in page.items] == [3, 2]
+    assert page.next_cursor is not None
+    assert decode_cursor(page.next_cursor) == (tickets[1].created_at, 2)
+
+
+async def test_list_tickets_applies_filters(mock_session: Mock) -> None:
+    result = Mock()
+    result.all.return_value = []
+    mock_session.execute = AsyncMock(return_value=result)
+
+    service = ServiceDesk(mock_session)
+    await service.list_tickets(
+        filters=TicketFilters(
+            statuses=[TicketStatus.NEW, TicketStatus.IN_PROGRESS],
+            priorities=[TicketPriority.HIGH],
+        ),
+    )
+
+    query = mock_session.execute.await_args.args[0]
+    sql = str(
+        query.compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={"render_postcompile": True},
+        )
+    )
+    assert "tickets.status IN ('new', 'in_progress')" in sql
+    assert "tickets.priority IN ('high')" in sql
+
+
+async def test_list_ticket_fields_selects_only_requested_columns(
+    mock_session: Mock,
+) -> None:
+    created_at = datetime(2026, 1, 2, tzinfo=timezone.utc)
+    rows = [
+        Mock(
+            id=ticket_id,
+            created_at=created_at,
+            _mapping={
+                "id": ticket_id,
+                "title": f"ticket-{ticket_id}",
+                "created_at": created_at,
+            },
+        )
+        for ticket_id in (3, 2)
+    ]
+    result = Mock()
+    result.all.return_value = rows
+    mock_session.execute = AsyncMock(return_value=result)
+
+    service = ServiceDesk(mock_session)
+    page = await service.list_ticket_fields(("id", "title"), limit=1)
+
+    assert page.items == [{"id": 3, "title": "ticket-3"}]
+    assert decode_cursor(page.next_cursor) == (created_at, 3)
+    sql = compile_query(mock_session.execute.await_args.args[0])
+    select_list = sql.split(" FROM ")[0]
+    assert "tickets.title" in select_list
+    assert "tickets.created_at" in select_list
+    assert "description" not in select_list
+
+
+async def test_search_tickets_falls_back_to_trigram(
+    mock_session: Mock,
+) -> None:
+    result = Mock()
+    result.all.return_value = []
+    mock_session.execute = AsyncMock(return_value=result)
+
+    service = ServiceDesk(mock_session)
+    tickets = await service.search_tickets(TicketFilters(query="printr"))
+
+    assert tickets == []
+    queries = [call.args[0] for call in mock_session.execute.await_args_list]
+    sql = [str(query.compile(dialect=postgresql.dialect())) for query in queries]
+    assert "@@ websearch_to_tsquery" in sql[0]
+    assert "ts_rank" in sql[0]
+    assert "similarity(tickets.title" in sql[1]
+
+
+async def test_search_tickets_short_query_uses_trigram(
+    mock_session: Mock,
+) -> None:
+    result = Mock()
+    result.all.return_value = []
+    mock_session.execute = AsyncMock(return_value=result)
+
+    service = ServiceDesk(mock_session)
+    await service.search_tickets(TicketFilters(query="vp"))
+
+    mock_session.execute.assert_awaited_once()
+    query = mock_session.execute.await_args.args[0]
+    assert "ILIKE" in str(query.compile(dialect=postgresql.dialect()))
+
+
+async def test_create_tickets_uses_single_insert(mock_session: Mock) -> None:
+    now = datetime.now(timezone.utc)
+    rows = [
+        Mock(
+            id=ticket_id,
+            title=f"alert-{ticket_id}",
+            description="",
+            status=TicketStatus.NEW,
+            priority=TicketPriority.HIGH,
+            created_at=now,
+            updated_at=now,
+        )
+        for ticket_id in (1, 2)
+    ]
+    result = Mock()
+    result.all.return_value = rows
+    mock_session.execute = AsyncMock(return_value=result)
+
+    service = ServiceDesk(mock_session)
+    tickets = await service.create_tickets(
+        [
+            TicketCreate(title="alert-1", priority=TicketPriority.HIGH),
+            TicketCreate(title="alert-2", priority=TicketPriority.HIGH),
+        ]
+    )
+
+    assert [ticket.id for ticket in tickets] == [1, 2]
+    mock_session.execute.assert_awaited_once()
+    query, params = mock_session.execute.await_args.args
+    assert "RETURNING" in str(query.compile(dialect=postgresql.dialect()))
+    assert [item["title"] for item in params] == ["alert-1", "alert-2"]
+    mock_session.commit.assert_awaited_once()
+
+
+async def test_update_tickets_reports_missing_ids(mock_session: Mock) -> None:
+    result = Mock()
+    result.scalars.return_value.all.return_value = [1, 3]
+    mock_session.execute = AsyncMock(return_value=result)
+
+    service = ServiceDesk(mock_session)
+    outcome = await service.update_tickets(
+        {"status": TicketStatus.CLOSED},
+        ids=[1, 2, 3, 2],
+    )
+
+    assert outcome.updated == [1, 3]
+    assert outcome.not_found == [2]
+    query = mock_session.execute.await_args.args[0]
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert "updated_at=" not in sql
+    assert "tickets.id = ANY" in sql
+    assert "RETURNING tickets.id" in sql
+    mock_session.commit.assert_awaited_once()
+
+
+async def test_get_ticket_reads_through_cache(mock_session: Mock) -> None:
+    ticket_model = TicketModel()
+    ticket_model.id = 10
+    ticket_model.created_at = datetime.now(timezone.utc)
+    ticket_model.updated_at = datetime.now(timezone.utc)
+    ticket_model.title = "cached"
+    ticket_model.description = ""
+    ticket_model.status = TicketStatus.NEW
+    ticket_model.priority = TicketPriority.MEDIUM
+    select_result = Mock()
+    select_result.scalar_one_or_none.return_value = ticket_model
+    delete_result = Mock()
+    delete_result.scalar_one_or_none.return_value = ticket_model.id
+    mock_session.execute = AsyncMock(
+        side_effect=[select_result, delete_result, select_result],
+    )
+    cache = TicketCache()
+    cache.set_listening(True)
+    service = ServiceDesk(mock_session, cache=cache)
+
+    first = await service.get_ticket(10)
+    second = await service.get_ticket(10)
+    await service.delete_ticket(10)
+    await service.get_ticket(10)
+
+    assert first == second
+    assert mock_session.execute.await_count == 3
+
+
+async def test_get_ticket_stats_fills_missing_pairs(mock_session: Mock) -> None:
+    result = Mock()
+    result.all.return_value = [
+        Mock(status=TicketStatus.NEW, priority=TicketPriority.HIGH, n=3),
+        Mock(status=TicketStatus.DONE, priority=TicketPriority.LOW, n=2),
+    ]
+    mock_session.execute = AsyncMock(return_value=result)
+
+    stats = await ServiceDesk(mock_session).get_ticket_stats()
+
+    assert stats.total == 5
+    assert stats.by_status[TicketStatus.NEW] == 3
+    assert stats.by_status[TicketStatus.CLOSED] == 0
+    assert stats.by_priority[TicketPriority.LOW] == 2
+    assert len(stats.counts) == len(TicketStatus) * len(TicketPriority)
+    sql = compile_query(mock_session.execute.await_args.args[0])
+    assert "FROM ticket_counters" in sql
+
+
+async def test_get_tickets_version_reads_table_state(
+    mock_session: Mock,
+) -> None:
+    result = Mock()
+    result.one.return_value = (
+        datetime(2026, 10, 18, tzinfo=timezone.utc),
+        42,
+    )
+    mock_session.execute = AsyncMock(return_value=result)
+
+    version = await ServiceDesk(mock_session).get_tickets_version()
+
+    assert version == "1792281600000000-42"
+    sql = compile_query(mock_session.execute.await_args.args[0])
+    assert "max(tickets.updated_at)" in sql
+    assert "FROM ticket_counters" in sql
+    assert "pg_current_snapshot" not in sql
+
+
+async def test_get_tickets_version_of_empty_table(mock_session: Mock) -> None:
+    result = Mock()
+    result.one.return_value = (None, 0)
+    mock_session.execute = AsyncMock(return_value=result)
 
-    assert [ticket.id for ticket in tickets] == [ticket_one.id, ticket_two.id]
+    assert await ServiceDesk(mock_session).get_tickets_version() == "0-0"
@@ -0,0 +1,98 @@
+from datetime import datetime, timezone
+
+from app.api.tickets.cache import TicketCache
+from app.api.tickets.schemas import Ticket
+from app.db.types import TicketPriority, TicketStatus
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_ticket(ticket_id: int) -> Ticket:
+    now = datetime.now(timezone.utc)
+    return Ticket(
+        id=ticket_id,
+        title=f"ticket-{ticket_id}",
+        description="",
+        status=TicketStatus.NEW,
+        priority=TicketPriority.MEDIUM,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def listening_cache(**kwargs) -> TicketCache:
+    cache = TicketCache(**kwargs)
+    cache.set_listening(True)
+    return cache
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = listening_cache(max_size=2, ttl=60)
+    cache.set(make_ticket(1))
+    cache.set(make_ticket(2))
+
+    assert cache.get(1) is not None
+    cache.set(make_ticket(3))
+
+    assert cache.get(2) is None
+    assert cache.get(1) is not None
+    assert cache.get(3) is not None
+    assert len(cache) == 2
+
+
+def test_cache_expires_entries_after_ttl() -> None:
+    clock = FakeClock()
+    cache = listening_cache(max_size=10, ttl=5, clock=clock)
+    cache.set(make_ticket(1))
+
+    clock.now = 4.9
+    assert cache.get(1) is not None
+    clock.now = 5.0
+    assert cache.get(1) is None
+    assert len(cache) == 0
+
+
+def test_cache_skips_stale_set_after_invalidation() -> None:
+    cache = listening_cache(max_size=10, ttl=60)
+    generation = cache.generation
+
+    cache.invalidate([1])
+    cache.set(make_ticket(1), generation=generation)
+
+    assert cache.get(1) is None
+
+
+def test_cache_applies_notifications() -> None:
+    cache = listening_cache(max_size=10, ttl=60)
+    for ticket_id in (1, 2, 3):
+        cache.set(make_ticket(ticket_id))
+
+    cache.handle_notification("1,3")
+    assert cache.get(1) is None
+    assert cache.get(2) is not None
+    assert cache.get(3) is None
+
+    cache.handle_notification("*")
+    assert len(cache) == 0
+
+
+def test_cache_is_bypassed_while_listener_is_disconnected() -> None:
+    cache = TicketCache(max_size=10, ttl=60)
+    cache.set(make_ticket(1))
+    assert len(cache) == 0
+
+    cache.set_listening(True)
+    cache.set(make_ticket(1))
+    assert cache.get(1) is not None
+
+    cache.set_listening(False)
+    assert len(cache) == 0
+    cache.set(make_ticket(1))
+    assert cache.get(1) is None
+    assert len(cache) == 0
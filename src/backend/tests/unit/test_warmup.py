@@ -0,0 +1,190 @@
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.pool import NullPool, QueuePool
+
+from app.db import warmup
+from app.db.warmup import (DB_UNAVAILABLE, READY, WARMING_UP,
+                           DatabaseReadiness, get_database_readiness,
+                           run_warm_up, warm_up_pool)
+from app.routers import all_routers
+from app.service import create_app
+
+
+def make_engine(*results: object) -> Mock:
+    connection = Mock()
+    connection.execute = AsyncMock(side_effect=results)
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=connection)
+    context.__aexit__ = AsyncMock(return_value=False)
+    engine = Mock()
+    engine.connect.return_value = context
+    return engine
+
+
+def make_pool_engine(pool_size: int, *starts: object) -> Mock:
+    engine = Mock()
+    engine.pool = Mock(spec=QueuePool)
+    engine.pool.size.return_value = pool_size
+    engine.connect.return_value.start = AsyncMock(side_effect=starts)
+    return engine
+
+
+def make_connection() -> Mock:
+    connection = Mock(spec=AsyncConnection)
+    connection.close = AsyncMock()
+    return connection
+
+
+@pytest.mark.asyncio
+async def test_readiness_waits_for_warm_up_and_caches_db_check() -> None:
+    now = [0.0]
+    engine = make_engine(None, OperationalError("SELECT 1", {}, OSError()))
+    readiness = DatabaseReadiness(
+        engine,
+        check_interval=5.0,
+        clock=lambda: now[0],
+    )
+
+    assert await readiness.state() == WARMING_UP
+    readiness.mark_warmed()
+    assert await readiness.state() == READY
+    assert engine.connect.call_count == 0
+
+    now[0] = 5.0
+    assert await readiness.state() == READY
+    now[0] = 7.0
+    assert await readiness.state() == READY
+    now[0] = 10.0
+    assert await readiness.state() == DB_UNAVAILABLE
+    assert engine.connect.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_readiness_waits_for_every_worker(
+    monkeypatch,
+    tmp_path,
+) -> None:
+    monkeypatch.setattr(warmup, "_is_alive", lambda pid: pid != 999)
+    engine = make_engine(None)
+    first = DatabaseReadiness(engine, shared_dir=tmp_path, workers=2)
+    restarted = DatabaseReadiness(engine, shared_dir=tmp_path, workers=2)
+
+    first.mark_warmed()
+    (tmp_path / f"{warmup.WARMED_WORKER_PREFIX}999").touch()
+    assert await first.state() == WARMING_UP
+
+    (tmp_path / f"{warmup.WARMED_WORKER_PREFIX}1000").touch()
+    assert await first.state() == READY
+    # Под уже был готов: перезапущенный воркер не снимает его с трафика.
+    assert await restarted.state() == READY
+    assert engine.connect.call_count == 1
+
+    first.mark_stopped()
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        warmup.WARMED_POD_FILE,
+        f"{warmup.WARMED_WORKER_PREFIX}1000",
+        f"{warmup.WARMED_WORKER_PREFIX}999",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_warm_up_pool_primes_distinct_connections() -> None:
+    connections = [make_connection() for _ in range(3)]
+    engine = make_pool_engine(3, *connections)
+    prime = AsyncMock()
+
+    await warm_up_pool(engine, 10, prime)
+
+    assert engine.connect.call_count == 3
+    assert prime.await_count == 3
+    for connection in connections:
+        connection.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_pool_skips_pool_without_size() -> None:
+    engine = make_pool_engine(3)
+    engine.pool = Mock(spec=NullPool)
+
+    await warm_up_pool(engine, 10, AsyncMock())
+
+    engine.connect.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_pool_closes_connections_on_failure() -> None:
+    opened = make_connection()
+    engine = make_pool_engine(2, opened, ConnectionRefusedError())
+    prime = AsyncMock()
+
+    with pytest.raises(ConnectionRefusedError):
+        await warm_up_pool(engine, 2, prime)
+
+    prime.assert_not_awaited()
+    opened.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_run_warm_up_retries_until_database_is_up(monkeypatch) -> None:
+    attempts = AsyncMock(side_effect=[ConnectionRefusedError(), None])
+    monkeypatch.setattr(warmup, "warm_up_pool", attempts)
+    readiness = DatabaseReadiness(make_engine())
+
+    await run_warm_up(
+        readiness,
+        make_pool_engine(5),
+        AsyncMock(),
+        retry_delay=0,
+    )
+
+    assert attempts.await_count == 2
+    assert attempts.await_args.args[1] == 5
+    assert readiness.warmed
+
+
+@pytest.mark.asyncio
+async def test_run_warm_up_does_not_wait_for_replica(monkeypatch) -> None:
+    primary = make_pool_engine(5)
+    replica = make_pool_engine(5)
+    attempts = AsyncMock(side_effect=[None, ConnectionRefusedError()])
+    monkeypatch.setattr(warmup, "warm_up_pool", attempts)
+    readiness = DatabaseReadiness(make_engine())
+
+    await run_warm_up(
+        readiness,
+        primary,
+        AsyncMock(),
+        connections=2,
+        read_engine=replica,
+    )
+
+    assert [call.args[:2] for call in attempts.await_args_list] == [
+        (primary, 2),
+        (replica, 2),
+    ]
+    assert readiness.warmed
+
+
+def test_readyz_reports_warm_up_state(monkeypatch) -> None:
+    monkeypatch.setenv("POSTGRES_USER", "service_desk")
+    monkeypatch.setenv("POSTGRES_PASSWORD", "service_desk")
+    monkeypatch.setenv("POSTGRES_DB", "service_desk")
+    readiness = DatabaseReadiness(make_engine())
+    app = create_app()
+    for router in all_routers:
+        app.include_router(router)
+    app.dependency_overrides[get_database_readiness] = lambda: readiness
+
+    with TestClient(app) as client:
+        warming = client.get("/readyz")
+        readiness.mark_warmed()
+        ready = client.get("/readyz")
+
+    assert warming.status_code == 503
+    assert warming.json() == {"status": WARMING_UP}
+    assert ready.status_code == 200
+    assert ready.json() == {"status": READY}
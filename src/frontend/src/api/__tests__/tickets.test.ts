@@ -1,5 +1,5 @@
 import { describe, it, expect, vi, beforeEach } from "vitest";
-import { listTickets, getTicket, createTicket, updateTicket, deleteTicket } from "../tickets";
+import { listTickets, listTicketsPage, getTicket, createTicket, updateTicket, deleteTicket } from "../tickets";
 
 beforeEach(() => {
   vi.restoreAllMocks();
@@ -34,6 +34,35 @@ describe("tickets api (fetch)", () => {
     expect(calledUrl).not.toContain("status=undefined");
   });
 
+  it("listTicketsPage returns X-Next-Cursor as nextCursor", async () => {
+    global.fetch = vi.fn().mockResolvedValue({
+      ok: true,
+      status: 200,
+      headers: new Headers({ "X-Next-Cursor": "abc" }),
+      json: vi.fn().mockResolvedValue([{ id: 1 }]),
+    } as any);
+
+    const page = await listTicketsPage({ limit: 1 });
+
+    expect(page).toEqual({ items: [{ id: 1 }], nextCursor: "abc" });
+    expect(String((fetch as any).mock.calls[0][0])).toContain("/tickets?limit=1");
+  });
+
+  it("listTickets requests only the first page", async () => {
+    global.fetch = vi.fn().mockResolvedValue({
+      ok: true,
+      status: 200,
+      headers: new Headers({ "X-Next-Cursor": "page-2" }),
+      json: vi.fn().mockResolvedValue([{ id: 2 }]),
+    } as any);
+
+    const tickets = await listTickets({ status: "new" });
+
+    expect(tickets).toEqual([{ id: 2 }]);
+    expect(fetch).toHaveBeenCalledTimes(1);
+    expect(String((fetch as any).mock.calls[0][0])).not.toContain("cursor=");
+  });
+
   it("getTicket calls /tickets/{id}", async () => {
     mockFetch({ id: 1 });
     await getTicket(1);
@@ -1,6 +1,11 @@
 const BASE_URL = import.meta.env.VITE_API_BASE_URL ?? "";
 
-async function request<T>(url: string, options: RequestInit = {}): Promise<T> {
+export interface HttpResult<T> {
+  data: T;
+  headers: Headers;
+}
+
+async function send<T>(url: string, options: RequestInit = {}): Promise<HttpResult<T>> {
   const headers = new Headers(options.headers);
   headers.set("Content-Type", "application/json");
 
@@ -14,15 +19,22 @@ async function request<T>(url: string, options: RequestInit = {}): Promise<T> {
     throw new Error(text || response.statusText);
   }
 
+  const responseHeaders = new Headers(response.headers);
+
   if (response.status === 204) {
-    return undefined as T;
+    return { data: undefined as T, headers: responseHeaders };
   }
 
-  return response.json();
+  return { data: await response.json(), headers: responseHeaders };
+}
+
+async function request<T>(url: string, options: RequestInit = {}): Promise<T> {
+  return (await send<T>(url, options)).data;
 }
 
 export const http = {
   get: <T>(url: string) => request<T>(url),
+  getWithHeaders: <T>(url: string) => send<T>(url),
   post: <T>(url: string, body: unknown) =>
     request<T>(url, { method: "POST", body: JSON.stringify(body) }),
   put: <T>(url: string, body: unknown) =>
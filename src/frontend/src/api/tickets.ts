@@ -26,13 +26,34 @@ export interface TicketUpdate {
   priority?: TicketPriority;
 }
 
-export async function listTickets(params?: { status?: string; priority?: string }) {
+export const NEXT_CURSOR_HEADER = "X-Next-Cursor";
+
+export interface TicketFilters {
+  status?: string;
+  priority?: string;
+}
+
+export interface TicketPage {
+  items: Ticket[];
+  nextCursor: string | null;
+}
+
+export async function listTicketsPage(
+  params?: TicketFilters & { cursor?: string; limit?: number }
+): Promise<TicketPage> {
   const search = new URLSearchParams();
   if (params?.status) search.set("status", params.status);
   if (params?.priority) search.set("priority", params.priority);
+  if (params?.limit) search.set("limit", String(params.limit));
+  if (params?.cursor) search.set("cursor", params.cursor);
   const query = search.toString();
   const url = query ? `/tickets?${query}` : "/tickets";
-  return http.get<Ticket[]>(url);
+  const { data, headers } = await http.getWithHeaders<Ticket[]>(url);
+  return { items: data, nextCursor: headers.get(NEXT_CURSOR_HEADER) };
+}
+
+export async function listTickets(params?: TicketFilters) {
+  return (await listTicketsPage(params)).items;
 }
 
 export function getTicket(id: number) {
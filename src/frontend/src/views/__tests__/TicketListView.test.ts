@@ -22,7 +22,9 @@ beforeEach(() => {
   vi.restoreAllMocks();
 });
 
-function mockFetchSequence(responses: Array<{ status?: number; body?: unknown; ok?: boolean }>) {
+function mockFetchSequence(
+  responses: Array<{ status?: number; body?: unknown; ok?: boolean; headers?: Record<string, string> }>
+) {
   global.fetch = vi.fn().mockImplementation(async () => {
     const next = responses.shift() ?? { status: 200, body: [] };
     const status = next.status ?? 200;
@@ -31,6 +33,7 @@ function mockFetchSequence(responses: Array<{ status?: number; body?: unknown; o
       ok,
       status,
       statusText: "Request failed",
+      headers: new Headers(next.headers),
       json: vi.fn().mockResolvedValue(next.body),
       text: vi.fn().mockResolvedValue(typeof next.body === "string" ? next.body : JSON.stringify(next.body ?? "")),
     } as any;
@@ -49,8 +52,8 @@ describe("TicketListView", () => {
     expect(wrapper.text()).toContain("Filters: no filters");
   });
 
-  it("filters rendered tickets by status on client side", async () => {
-    mockFetchSequence([{ body: [ticket, secondTicket] }]);
+  it("passes filters to the API and reloads the list", async () => {
+    mockFetchSequence([{ body: [ticket, secondTicket] }, { body: [secondTicket] }]);
 
     const wrapper = mount(TicketListView);
     await flushPromises();
@@ -59,9 +62,70 @@ describe("TicketListView", () => {
     await statusFilter.setValue("done");
     await flushPromises();
 
-    expect(fetch).toHaveBeenCalledTimes(1);
+    expect(fetch).toHaveBeenCalledTimes(2);
+    expect(String((fetch as any).mock.calls[1][0])).toContain("/tickets?status=done");
+    expect(wrapper.text()).toContain("Printer issue");
+    expect(wrapper.text()).not.toContain("Login issue");
+    expect(wrapper.text()).toContain("Filters: status=done");
+  });
+
+  it("ignores a stale response after a quick filter change", async () => {
+    const pending: Array<(body: unknown) => void> = [];
+    global.fetch = vi.fn().mockImplementation(
+      () =>
+        new Promise((resolve) => {
+          pending.push((body) =>
+            resolve({
+              ok: true,
+              status: 200,
+              headers: new Headers(),
+              json: vi.fn().mockResolvedValue(body),
+            } as any)
+          );
+        })
+    );
+
+    const wrapper = mount(TicketListView);
+    pending[0]!([ticket, secondTicket]);
+    await flushPromises();
+
+    const statusFilter = wrapper.get("select");
+    await statusFilter.setValue("new");
+    await statusFilter.setValue("done");
+    await flushPromises();
+    expect(fetch).toHaveBeenCalledTimes(3);
+
+    pending[2]!([secondTicket]);
+    await flushPromises();
+    pending[1]!([ticket]);
+    await flushPromises();
+
     expect(wrapper.text()).toContain("Printer issue");
     expect(wrapper.text()).not.toContain("Login issue");
+    expect(wrapper.text()).toContain("Filters: status=done");
+  });
+
+  it("loads the next page on demand", async () => {
+    mockFetchSequence([
+      { body: [secondTicket], headers: { "X-Next-Cursor": "page-2" } },
+      { body: [ticket] },
+    ]);
+
+    const wrapper = mount(TicketListView);
+    await flushPromises();
+
+    expect(fetch).toHaveBeenCalledTimes(1);
+    expect(wrapper.text()).not.toContain("Login issue");
+
+    const loadMoreButton = wrapper.findAll("button").find((b) => b.text() === "Load more");
+    await loadMoreButton?.trigger("click");
+    await flushPromises();
+
+    expect(fetch).toHaveBeenCalledTimes(2);
+    expect(String((fetch as any).mock.calls[1][0])).toContain("cursor=page-2");
+    expect(wrapper.text()).toContain("Printer issue");
+    expect(wrapper.text()).toContain("Login issue");
+    expect(wrapper.findAll("button").some((b) => b.text() === "Load more")).toBe(false);
   });
 
   it("creates a ticket from modal and reloads list", async () => {
@@ -0,0 +1,619 @@
+"""Нагрузочный генератор для Service Desk API.
+
+Запуск против локального docker compose:
+
+    docker compose up -d
+    uv run --project src/backend python tools/loadgen/loadgen.py \
+        --duration 60 --concurrency 32 --output loadgen.json \
+        --slo p99=500 --slo error_rate=0.01
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+DEFAULT_BASE_URL = "http://localhost:8000"
+DEFAULT_MIX = "create=1,get=5,update=1,list=3,delete=1"
+DEFAULT_DURATION_SECONDS = 30.0
+DEFAULT_CONCURRENCY = 16
+DEFAULT_TIMEOUT_SECONDS = 10.0
+DEFAULT_SEED_TICKETS = 50
+DEFAULT_LIST_LIMIT = 50
+SIGNIFICANT_DIGITS = 3
+PERCENTILES = (50.0, 95.0, 99.0, 99.9)
+STATUSES = ("new", "in_progress", "done", "closed")
+PRIORITIES = ("low", "medium", "high", "critical")
+SLO_METRICS = ("p50", "p95", "p99", "p999", "max", "mean", "error_rate")
+
+
+class LatencyHistogram:
+    """Гистограмма задержек с фиксированной относительной точностью.
+
+    Как и в HdrHistogram, значение округляется до SIGNIFICANT_DIGITS
+    значащих цифр, поэтому память не растет с числом замеров, а
+    ошибка перцентиля не превышает 0.1%.
+    """
+
+    def __init__(self) -> None:
+        """Создает пустую гистограмму."""
+        self._counts: Counter[int] = Counter()
+        self.total_count = 0
+        self._sum = 0
+        self._max = 0
+
+    @staticmethod
+    def _bucket(value: int) -> int:
+        """Округляет значение вверх до значащих цифр."""
+        if value < 10 ** SIGNIFICANT_DIGITS:
+            return value
+        scale = 10 ** (len(str(value)) - SIGNIFICANT_DIGITS)
+        return -(-value // scale) * scale
+
+    def record(self, microseconds: int) -> None:
+        """Добавляет замер в микросекундах."""
+        value = max(microseconds, 0)
+        self._counts[self._bucket(value)] += 1
+        self.total_count += 1
+        self._sum += value
+        self._max = max(self._max, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Добавляет замеры другой гистограммы."""
+        self._counts.update(other._counts)
+        self.total_count += other.total_count
+        self._sum += other._sum
+        self._max = max(self._max, other._max)
+
+    def value_at_percentile(self, percentile: float) -> int:
+        """Возвращает значение перцентиля в микросекундах."""
+        if self.total_count == 0:
+            return 0
+        rank = max(math.ceil(percentile / 100 * self.total_count), 1)
+        seen = 0
+        for value in sorted(self._counts):
+            seen += self._counts[value]
+            if seen >= rank:
+                return min(value, self._max)
+        return self._max
+
+    def summary_ms(self) -> dict[str, float]:
+        """Сводка перцентилей, среднего и максимума в миллисекундах."""
+        summary = {
+            _percentile_name(percentile): round(
+                self.value_at_percentile(percentile) / 1000,
+                3,
+            )
+            for percentile in PERCENTILES
+        }
+        summary["max"] = round(self._max / 1000, 3)
+        summary["mean"] = round(
+            self._sum / self.total_count / 1000 if self.total_count else 0,
+            3,
+        )
+        return summary
+
+
+def _percentile_name(percentile: float) -> str:
+    """Имя перцентиля в отчете: 99.9 -> p999."""
+    return "p" + f"{percentile:g}".replace(".", "")
+
+
+@dataclass
+class ScenarioStats:
+    """Результаты одного сценария.
+
+    dropped - запросы open-loop, не отправленные из-за max_in_flight:
+    для клиента это отказ, поэтому они входят в error_rate.
+    """
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: Counter[str] = field(default_factory=Counter)
+    dropped: int = 0
+
+    @property
+    def count(self) -> int:
+        """Число выполненных запросов."""
+        return self.latency.total_count
+
+    def report(self) -> dict[str, Any]:
+        """Отчет по сценарию."""
+        errors = self.errors.copy()
+        if self.dropped:
+            errors["dropped"] += self.dropped
+        error_count = sum(errors.values())
+        attempts = self.count + self.dropped
+        return {
+            "count": self.count,
+            "errors": error_count,
+            "error_rate": round(error_count / attempts, 6)
+            if attempts else 0.0,
+            "errors_by_kind": dict(errors.most_common()),
+            "latency_ms": self.latency.summary_ms(),
+        }
+
+
+@dataclass
+class SloCheck:
+    """Порог SLO: метрика, необязательный сценарий и граница."""
+    metric: str
+    threshold: float
+    scenario: str | None = None
+
+    @classmethod
+    def parse(cls, raw: str) -> "SloCheck":
+        """Разбирает порог вида p99=250 или list.p95=100."""
+        name, _, value = raw.partition("=")
+        scenario, _, metric = name.rpartition(".")
+        if metric not in SLO_METRICS or not value:
+            raise argparse.ArgumentTypeError(
+                f"Invalid SLO {raw!r}, expected "
+                f"[scenario.]{{{','.join(SLO_METRICS)}}}=value"
+            )
+        return cls(
+            metric=metric,
+            threshold=float(value),
+            scenario=scenario or None,
+        )
+
+    def evaluate(self, report: dict[str, Any]) -> dict[str, Any]:
+        """Сравнивает порог с отчетом."""
+        section = (
+            report["overall"]
+            if self.scenario is None
+            else report["scenarios"].get(self.scenario)
+        )
+        actual = None
+        if section is not None:
+            actual = (
+                section["error_rate"]
+                if self.metric == "error_rate"
+                else section["latency_ms"][self.metric]
+            )
+        return {
+            "scenario": self.scenario or "overall",
+            "metric": self.metric,
+            "threshold": self.threshold,
+            "actual": actual,
+            "passed": actual is not None and actual <= self.threshold,
+        }
+
+
+def parse_mix(raw: str) -> dict[str, float]:
+    """Разбирает веса сценариев вида create=1,get=5."""
+    mix: dict[str, float] = {}
+    for item in raw.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(
+                f"Unknown scenario {name!r}, expected one of "
+                f"{', '.join(SCENARIOS)}"
+            )
+        mix[name] = float(weight or 1)
+    if not any(weight > 0 for weight in mix.values()):
+        raise argparse.ArgumentTypeError("Scenario mix has no weight")
+    return mix
+
+
+class TicketPool:
+    """Тикеты, созданные генератором: их читают, меняют и удаляют."""
+
+    def __init__(self, rng: random.Random) -> None:
+        """Создает пустой пул."""
+        self._rng = rng
+        self._ids: list[int] = []
+
+    def __len__(self) -> int:
+        """Число тикетов в пуле."""
+        return len(self._ids)
+
+    def add(self, ticket_id: int) -> None:
+        """Добавляет тикет в пул."""
+        self._ids.append(ticket_id)
+
+    def pick(self) -> int | None:
+        """Возвращает случайный тикет, не удаляя его."""
+        return self._rng.choice(self._ids) if self._ids else None
+
+    def take(self) -> int | None:
+        """Забирает случайный тикет из пула."""
+        if not self._ids:
+            return None
+        index = self._rng.randrange(len(self._ids))
+        self._ids[index], self._ids[-1] = self._ids[-1], self._ids[index]
+        return self._ids.pop()
+
+    def drain(self) -> list[int]:
+        """Забирает все тикеты."""
+        ids, self._ids = self._ids, []
+        return ids
+
+
+Scenario = Callable[
+    [httpx.AsyncClient, TicketPool, random.Random],
+    Awaitable[httpx.Response],
+]
+
+
+async def scenario_create(
+    client: httpx.AsyncClient,
+    pool: TicketPool,
+    rng: random.Random,
+) -> httpx.Response:
+    """POST /ticket."""
+    response = await client.post(
+        "/ticket",
+        json={
+            "title": f"loadgen {rng.randrange(1_000_000)}",
+            "description": "created by tools/loadgen",
+            "priority": rng.choice(PRIORITIES),
+        },
+    )
+    if response.is_success:
+        pool.add(response.json()["id"])
+    return response
+
+
+async def scenario_get(
+    client: httpx.AsyncClient,
+    pool: TicketPool,
+    rng: random.Random,
+) -> httpx.Response:
+    """GET /tickets/{id}."""
+    ticket_id = pool.pick()
+    if ticket_id is None:
+        return await scenario_create(client, pool, rng)
+    return await client.get(f"/tickets/{ticket_id}")
+
+
+async def scenario_update(
+    client: httpx.AsyncClient,
+    pool: TicketPool,
+    rng: random.Random,
+) -> httpx.Response:
+    """PUT /tickets/{id}."""
+    ticket_id = pool.pick()
+    if ticket_id is None:
+        return await scenario_create(client, pool, rng)
+    return await client.put(
+        f"/tickets/{ticket_id}",
+        json={"status": rng.choice(STATUSES)},
+    )
+
+
+async def scenario_list(
+    client: httpx.AsyncClient,
+    pool: TicketPool,
+    rng: random.Random,
+) -> httpx.Response:
+    """GET /tickets со случайными фильтрами."""
+    params: list[tuple[str, str | int]] = [("limit", DEFAULT_LIST_LIMIT)]
+    if rng.random() < 0.5:
+        params.append(("status", rng.choice(STATUSES)))
+    if rng.random() < 0.3:
+        params.append(("priority", rng.choice(PRIORITIES)))
+    return await client.get("/tickets", params=params)
+
+
+async def scenario_delete(
+    client: httpx.AsyncClient,
+    pool: TicketPool,
+    rng: random.Random,
+) -> httpx.Response:
+    """DELETE /tickets/{id} для тикета, созданного генератором."""
+    ticket_id = pool.take()
+    if ticket_id is None:
+        return await scenario_create(client, pool, rng)
+    return await client.delete(f"/tickets/{ticket_id}")
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "create": scenario_create,
+    "get": scenario_get,
+    "update": scenario_update,
+    "list": scenario_list,
+    "delete": scenario_delete,
+}
+
+
+class LoadRun:
+    """Один прогон нагрузки."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        mix: dict[str, float],
+        rng: random.Random,
+    ) -> None:
+        """Создает прогон с клиентом и весами сценариев."""
+        self._client = client
+        self._names = list(mix)
+        self._weights = list(mix.values())
+        self._rng = rng
+        self.pool = TicketPool(rng)
+        self.stats = {name: ScenarioStats() for name in mix}
+        self.recording = False
+
+    async def execute(self, intended_start: float | None = None) -> None:
+        """Выполняет случайный сценарий и учитывает результат.
+
+        В режиме с заданной частотой задержка считается от
+        запланированного времени старта: так очередь перед сервером
+        не прячется (coordinated omission). Тело ответа, которое
+        сценарий не смог разобрать, считается ошибкой bad_response и не
+        прерывает прогон.
+        """
+        name = self._rng.choices(self._names, self._weights)[0]
+        started = time.perf_counter() if intended_start is None else (
+            intended_start
+        )
+        kind = None
+        try:
+            response = await SCENARIOS[name](
+                self._client,
+                self.pool,
+                self._rng,
+            )
+            if response.status_code >= 400:
+                kind = f"http_{response.status_code}"
+        except httpx.TimeoutException:
+            kind = "timeout"
+        except httpx.TransportError as exc:
+            kind = type(exc).__name__
+        except (KeyError, TypeError, ValueError):
+            kind = "bad_response"
+        if not self.recording:
+            return
+        stats = self.stats[name]
+        stats.latency.record(
+            int((time.perf_counter() - started) * 1_000_000)
+        )
+        if kind is not None:
+            stats.errors[kind] += 1
+
+    async def closed_loop(self, concurrency: int, deadline: float) -> None:
+        """concurrency воркеров шлют запросы друг за другом до deadline."""
+        async def worker() -> None:
+            while time.perf_counter() < deadline:
+                await self.execute()
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    async def open_loop(
+        self,
+        rate: float,
+        deadline: float,
+        max_in_flight: int,
+    ) -> int:
+        """Запускает запросы с пуассоновским потоком частоты rate.
+
+        Возвращает число запросов, которые не были отправлены, потому
+        что в полете уже max_in_flight запросов.
+        """
+        tasks: set[asyncio.Task[None]] = set()
+        dropped = 0
+        next_start = time.perf_counter()
+        while next_start < deadline:
+            delay = next_start - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(tasks) >= max_in_flight:
+                dropped += 1
+            else:
+                task = asyncio.create_task(self.execute(next_start))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            next_start += self._rng.expovariate(rate)
+        if tasks:
+            await asyncio.gather(*tasks)
+        return dropped
+
+
+def build_report(
+    run: LoadRun,
+    args: argparse.Namespace,
+    elapsed: float,
+    dropped: int,
+) -> dict[str, Any]:
+    """Собирает JSON-отчет с перцентилями, ошибками и SLO."""
+    overall = ScenarioStats(dropped=dropped)
+    for stats in run.stats.values():
+        overall.latency.merge(stats.latency)
+        overall.errors.update(stats.errors)
+    report: dict[str, Any] = {
+        "config": {
+            "base_url": args.base_url,
+            "mode": "open" if args.rate else "closed",
+            "concurrency": args.concurrency,
+            "rate": args.rate,
+            "duration_seconds": args.duration,
+            "warmup_seconds": args.warmup,
+            "mix": args.mix,
+        },
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(overall.count / elapsed, 2)
+        if elapsed else 0.0,
+        "dropped": dropped,
+        "overall": overall.report(),
+        "scenarios": {
+            name: stats.report() for name, stats in run.stats.items()
+        },
+    }
+    checks = [check.evaluate(report) for check in args.slo]
+    report["slo"] = {
+        "checks": checks,
+        "passed": all(check["passed"] for check in checks),
+    }
+    return report
+
+
+def print_summary(report: dict[str, Any]) -> None:
+    """Печатает короткую таблицу результатов в stderr."""
+    header = f"{'scenario':<10}{'count':>8}{'err%':>8}" + "".join(
+        f"{name:>10}" for name in ("p50", "p95", "p99", "p999", "max")
+    )
+    lines = [header]
+    sections = {**report["scenarios"], "overall": report["overall"]}
+    for name, section in sections.items():
+        latency = section["latency_ms"]
+        lines.append(
+            f"{name:<10}{section['count']:>8}"
+            f"{section['error_rate'] * 100:>7.2f}%"
+            + "".join(
+                f"{latency[key]:>10.1f}"
+                for key in ("p50", "p95", "p99", "p999", "max")
+            )
+        )
+    lines.append(
+        f"throughput: {report['throughput_rps']} rps, "
+        f"dropped: {report['dropped']}"
+    )
+    for check in report["slo"]["checks"]:
+        verdict = "PASS" if check["passed"] else "FAIL"
+        lines.append(
+            f"SLO {check['scenario']}.{check['metric']} <= "
+            f"{check['threshold']}: {check['actual']} {verdict}"
+        )
+    print("\n".join(lines), file=sys.stderr)
+
+
+async def run_load(args: argparse.Namespace) -> dict[str, Any]:
+    """Выполняет прогрев, нагрузку и уборку созданных тикетов."""
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(
+        max_connections=max(args.concurrency, args.max_in_flight),
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url,
+        timeout=args.timeout,
+        limits=limits,
+    ) as client:
+        run = LoadRun(client, args.mix, rng)
+        for _ in range(args.seed_tickets):
+            await scenario_create(client, run.pool, rng)
+        if args.warmup > 0:
+            await run.closed_loop(
+                args.concurrency,
+                time.perf_counter() + args.warmup,
+            )
+        run.recording = True
+        started = time.perf_counter()
+        deadline = started + args.duration
+        dropped = 0
+        if args.rate:
+            dropped = await run.open_loop(
+                args.rate,
+                deadline,
+                args.max_in_flight,
+            )
+        else:
+            await run.closed_loop(args.concurrency, deadline)
+        elapsed = time.perf_counter() - started
+        run.recording = False
+        if args.cleanup:
+            for ticket_id in run.pool.drain():
+                await client.delete(f"/tickets/{ticket_id}")
+    return build_report(run, args, elapsed, dropped)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Разбирает аргументы командной строки."""
+    parser = argparse.ArgumentParser(
+        description="Load generator for the Service Desk API.",
+    )
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=DEFAULT_DURATION_SECONDS,
+        help="measured run length, seconds",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=float,
+        default=0.0,
+        help="unmeasured closed-loop warm-up, seconds",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="closed-loop workers (ignored with --rate)",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="open-loop Poisson arrival rate, requests per second",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=1000,
+        help="open-loop cap on concurrent requests; extra are dropped",
+    )
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=parse_mix(DEFAULT_MIX),
+        help=f"scenario weights, default {DEFAULT_MIX}",
+    )
+    parser.add_argument(
+        "--seed-tickets",
+        type=int,
+        default=DEFAULT_SEED_TICKETS,
+        help="tickets created before the run for get/update/delete",
+    )
+    parser.add_argument(
+        "--slo",
+        type=SloCheck.parse,
+        action="append",
+        default=[],
+        help="threshold like p99=250, list.p95=100 or error_rate=0.01 "
+        "(latency in ms); repeatable",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT_SECONDS,
+        help="per-request timeout, seconds",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--no-cleanup",
+        dest="cleanup",
+        action="store_false",
+        help="keep tickets created by the run",
+    )
+    parser.add_argument(
+        "--output",
+        default="-",
+        help="JSON report path, '-' for stdout",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Запускает нагрузку и возвращает 1, если SLO не выполнены."""
+    args = parse_args(argv)
+    report = asyncio.run(run_load(args))
+    print_summary(report)
+    payload = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(payload)
+    else:
+        with open(args.output, "w") as output:
+            output.write(payload + "\n")
+    return 0 if report["slo"]["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())